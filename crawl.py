@@ -10,18 +10,29 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, WebDriverException, MoveTargetOutOfBoundsException
+from selenium.common.exceptions import TimeoutException, WebDriverException, MoveTargetOutOfBoundsException, StaleElementReferenceException
 import time
 import random
+import re
 import os
 import math
+import string
+import sys
+import functools
+import itertools
 import numpy as np
+from collections import deque
 from datetime import datetime
-from urllib.parse import urlparse
+from typing import NamedTuple
+from urllib.parse import urlsplit
 from faker import Faker
 import json
+import hashlib
+import pickle
 import websocket
+import requests
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Import persona manager for persistent fingerprint rotation
 try:
@@ -283,10 +294,8 @@ def smooth_scroll(driver, amount, duration=None):
         duration = random.uniform(0.3, 0.8)
     
     try:
-        # Get a random element to scroll from (more realistic)
-        body = driver.find_element(By.TAG_NAME, 'body')
-        
-        # Break scroll into chunks for smoothness
+        # Break scroll into chunks for smoothness; the whole plan (wheel steps
+        # and pauses) goes to the browser in a single perform() call
         chunks = random.randint(5, 12)
         chunk_size = amount // chunks
         chunk_delay = duration / chunks
@@ -310,7 +319,7 @@ def smooth_scroll(driver, amount, duration=None):
         
     except Exception:
         # Fallback to JavaScript scroll
-        driver.execute_script(f"window.scrollBy(0, {amount})")
+        driver.execute_script("window.scrollBy(0, arguments[0])", amount)
 
 
 def reading_behavior(driver, duration=None):
@@ -672,13 +681,7 @@ def simulate_right_click(driver, browser_type):
                 return
             
             # Pick a random visible element
-            visible_elements = []
-            for e in elements[:30]:
-                try:
-                    if e.is_displayed() and e.is_enabled():
-                        visible_elements.append(e)
-                except:
-                    continue
+            visible_elements = filter_visible_elements(driver, elements[:30], require_enabled=True)
             
             if not visible_elements:
                 return
@@ -742,11 +745,16 @@ def simulate_keyboard_shortcuts(driver, browser_type):
             pass
 
 
+# Fixed choices for generate_fake_data, built once rather than per call
+_FAKE_DATA_LOCALES = ('en_US', 'en_GB', 'en_CA', 'fr_FR', 'de_DE', 'es_ES', 'it_IT')
+_CITY_SEARCH_TOPICS = ('weather', 'news', 'restaurants', 'hotels')
+_SEARCH_TOPICS = ('news', 'weather', 'sports', 'recipes', 'movies', 'music', 'games', 'shopping')
+_SHORT_MESSAGES = ('Hello', 'Hi', 'Thanks', 'Great site', 'Interesting', 'Love it', 'Nice', '')
+
 def generate_fake_data():
     """Generate realistic fake data for form fields using Faker"""
     # Initialize Faker with random locale for diversity
-    locales = ['en_US', 'en_GB', 'en_CA', 'fr_FR', 'de_DE', 'es_ES', 'it_IT']
-    fake = Faker(random.choice(locales))
+    fake = Faker(random.choice(_FAKE_DATA_LOCALES))
     
     # Generate realistic data
     first_name = fake.first_name()
@@ -768,9 +776,9 @@ def generate_fake_data():
         fake.word(),  # Random word
         f"how to {fake.word()}",
         f"{fake.word()} {fake.word()}",
-        f"{fake.city()} {random.choice(['weather', 'news', 'restaurants', 'hotels'])}",
+        f"{fake.city()} {random.choice(_CITY_SEARCH_TOPICS)}",
         f"best {fake.word()}",
-        random.choice(['news', 'weather', 'sports', 'recipes', 'movies', 'music', 'games', 'shopping']),
+        random.choice(_SEARCH_TOPICS),
         '',  # Empty search sometimes
     ]
     
@@ -778,7 +786,7 @@ def generate_fake_data():
     messages = [
         fake.sentence(nb_words=random.randint(3, 10)),
         fake.text(max_nb_chars=random.randint(20, 100)),
-        random.choice(['Hello', 'Hi', 'Thanks', 'Great site', 'Interesting', 'Love it', 'Nice', '']),
+        random.choice(_SHORT_MESSAGES),
     ]
     
     return {
@@ -804,6 +812,11 @@ def generate_fake_data():
     }
 
 
+# Submit button texts that are safe to click, and ones that never are
+# (logout, delete, ...); compiled once instead of an any() scan per button
+_SAFE_SUBMIT_RE = re.compile('search|find|go|submit|send|subscribe|sign up|newsletter|rechercher|envoyer', re.IGNORECASE)
+_UNSAFE_SUBMIT_RE = re.compile('delete|remove|logout|log out|signout|unsubscribe|cancel|supprimer|deconnecter', re.IGNORECASE)
+
 def simulate_typing_and_forms(driver, browser_type):
     """
     Simulate typing in forms with proper data validation
@@ -829,7 +842,7 @@ def simulate_typing_and_forms(driver, browser_type):
             'input[type="number"], input:not([type]), textarea')
         
         # Filter to visible, enabled inputs
-        visible_inputs = [inp for inp in inputs if inp.is_displayed() and inp.is_enabled()]
+        visible_inputs = filter_visible_elements(driver, inputs, require_enabled=True)
         
         if not visible_inputs:
             return False
@@ -973,25 +986,16 @@ def simulate_typing_and_forms(driver, browser_type):
                         'button[type="submit"], input[type="submit"], '
                         'button:not([type="button"]):not([type="reset"])')
                     
-                    for button in submit_buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            button_text = button.text.lower() if button.text else ''
-                            
-                            # Only click safe submit buttons (avoid logout, delete, etc.)
-                            safe_keywords = ['search', 'find', 'go', 'submit', 'send', 'subscribe', 
-                                           'sign up', 'newsletter', 'rechercher', 'envoyer']
-                            unsafe_keywords = ['delete', 'remove', 'logout', 'log out', 'signout', 
-                                             'unsubscribe', 'cancel', 'supprimer', 'deconnecter']
-                            
-                            is_safe = any(keyword in button_text for keyword in safe_keywords)
-                            is_unsafe = any(keyword in button_text for keyword in unsafe_keywords)
-                            
-                            if is_safe and not is_unsafe:
-                                time.sleep(random.uniform(0.5, 1.5))
-                                button.click()
-                                print(f'  [{browser_type}] 📨 Submitted form')
-                                time.sleep(random.uniform(1.0, 2.0))
-                                break
+                    for button in filter_visible_elements(driver, submit_buttons, require_enabled=True):
+                        button_text = button.text or ''
+                        
+                        # Only click safe submit buttons (avoid logout, delete, etc.)
+                        if _SAFE_SUBMIT_RE.search(button_text) and not _UNSAFE_SUBMIT_RE.search(button_text):
+                            time.sleep(random.uniform(0.5, 1.5))
+                            button.click()
+                            print(f'  [{browser_type}] 📨 Submitted form')
+                            time.sleep(random.uniform(1.0, 2.0))
+                            break
                 except Exception:
                     pass
             
@@ -1057,11 +1061,12 @@ def simulate_typing_and_forms(driver, browser_type):
 
 # Weighted browser selection for realistic distribution
 browsers = (
-    ['chrome'] * 40 +      # 40% - Most popular browser
-    ['firefox'] * 30 +     # 30% - Second most popular
-    ['edge'] * 20 +        # 20% - Growing market share
-    ['chromium'] * 10      # 10% - Open-source variant for extra diversity
+    'chrome',      # 40% - Most popular browser
+    'firefox',     # 30% - Second most popular
+    'edge',        # 20% - Growing market share
+    'chromium',    # 10% - Open-source variant for extra diversity
 )
+_BROWSER_CUM_WEIGHTS = (40, 70, 90, 100)
 
 # Persona rotation configuration from environment
 PERSONA_ROTATION_STRATEGY = os.getenv('PERSONA_ROTATION_STRATEGY', 'weighted')
@@ -1073,14 +1078,12 @@ persona_manager = PersonaManager() if PERSONA_MANAGER_AVAILABLE else None
 
 def load_websites(file_path='/app/websites.txt'):
     """Load websites from a text file, ignoring comments and empty lines"""
-    websites = []
     try:
+        # One read, then splitting and stripping in C rather than a per-line loop
         with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if line and not line.startswith('#'):
-                    websites.append(line)
+            lines = map(str.strip, f.read().splitlines())
+            # Skip empty lines and comments
+            websites = [line for line in lines if line and not line.startswith('#')]
         
         print(f'✓ Loaded {len(websites)} websites from {file_path}')
         return websites
@@ -1100,14 +1103,167 @@ def load_websites(file_path='/app/websites.txt'):
 # Load websites at startup
 sites = load_websites()
 
+@functools.lru_cache(maxsize=1024)
 def get_domain(url):
-    """Extract domain from URL"""
+    """Extract domain from URL (cached: start URLs and nav links repeat)"""
     try:
-        parsed = urlparse(url)
-        return parsed.netloc.lower()
-    except:
+        # urlsplit: same netloc as urlparse without the ;params scan
+        return urlsplit(url).netloc.lower()
+    except Exception:
+        # Not a bare except: a KeyboardInterrupt must not be cached as ''
         return ''
 
+# Second-level suffixes under which sites register one label deeper
+# (bbc.co.uk, not co.uk). Not the full public suffix list: covers the
+# common ccTLD cases without a tldextract dependency
+_MULTI_PART_SUFFIXES = frozenset({
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'me.uk', 'ltd.uk', 'plc.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au',
+    'co.jp', 'ne.jp', 'or.jp', 'ac.jp', 'co.kr', 'or.kr',
+    'co.nz', 'org.nz', 'co.za', 'co.in', 'net.in', 'org.in', 'co.il',
+    'com.br', 'com.cn', 'com.mx', 'com.tr', 'com.ar', 'com.sg', 'com.hk',
+    'com.tw', 'com.my', 'com.ua', 'com.pl', 'com.es', 'com.co', 'com.pe',
+})
+
+@functools.lru_cache(maxsize=4096)
+def get_registered_domain(domain):
+    """
+    Registered domain (eTLD+1) of a host, e.g. 'news.bbc.co.uk' -> 'bbc.co.uk'
+    
+    Args:
+        domain: Host as returned by get_domain (may include a port)
+    
+    Returns:
+        str: Registered domain, or the host itself for IPs and bare names
+    """
+    host = domain.rsplit(':', 1)[0] if domain.count(':') == 1 else domain
+    labels = host.rstrip('.').split('.')
+    if len(labels) <= 2 or labels[-1].isdigit():
+        return host
+    depth = 3 if '.'.join(labels[-2:]) in _MULTI_PART_SUFFIXES else 2
+    return '.'.join(labels[-depth:])
+
+def _randomize_q(base):
+    """Add small random variation to quality value (±0.05)"""
+    variation = random.uniform(-0.05, 0.05)
+    return max(0.1, min(1.0, base + variation))  # Keep between 0.1 and 1.0
+
+def _build_lang_string(langs_with_q):
+    """Build language string with randomized q-values"""
+    parts = []
+    for i, (lang, base_q) in enumerate(langs_with_q):
+        if i == 0:
+            # First language typically has no q-value (implicit 1.0)
+            # But sometimes it does - 30% chance
+            if random.random() < 0.3:
+                q = _randomize_q(0.98)
+                parts.append(f'{lang};q={q:.1f}')
+            else:
+                parts.append(lang)
+        else:
+            q = _randomize_q(base_q)
+            parts.append(f'{lang};q={q:.1f}')
+    return ','.join(parts)
+
+# French variants (80% weight) - defined as (language, base_quality)
+_FRENCH_LANGUAGE_TEMPLATES = (
+    # France
+    (('fr-FR', 1.0), ('fr', 0.9), ('en', 0.8)),
+    (('fr-FR', 1.0), ('fr', 0.9), ('en-US', 0.8), ('en', 0.7)),
+    (('fr', 1.0), ('fr-FR', 0.95), ('en', 0.8)),
+    (('fr-FR', 1.0), ('en', 0.7)),
+    # Belgium
+    (('fr-BE', 1.0), ('fr', 0.9), ('nl', 0.8), ('en', 0.7)),
+    (('fr-BE', 1.0), ('fr', 0.9), ('nl-BE', 0.85), ('nl', 0.8), ('en', 0.7)),
+    # Switzerland
+    (('fr-CH', 1.0), ('fr', 0.9), ('de', 0.8), ('it', 0.7), ('en', 0.6)),
+    (('fr-CH', 1.0), ('fr', 0.95), ('de-CH', 0.85), ('de', 0.8), ('en', 0.6)),
+    # Canada
+    (('fr-CA', 1.0), ('fr', 0.9), ('en-CA', 0.8), ('en', 0.7)),
+    (('fr-CA', 1.0), ('fr', 0.95), ('en', 0.75)),
+    (('fr', 1.0), ('fr-CA', 0.95), ('en-CA', 0.8), ('en-US', 0.75), ('en', 0.7)),
+    # Luxembourg
+    (('fr-LU', 1.0), ('fr', 0.9), ('de', 0.85), ('en', 0.7)),
+    (('fr-LU', 1.0), ('fr', 0.95), ('de-LU', 0.9), ('de', 0.85), ('en', 0.7)),
+    # Monaco
+    (('fr-MC', 1.0), ('fr', 0.9), ('it', 0.8), ('en', 0.7)),
+    (('fr-MC', 1.0), ('fr', 0.95), ('en', 0.75)),
+)
+
+# Other European languages (20% weight)
+_OTHER_LANGUAGE_TEMPLATES = (
+    # Germany
+    (('de-DE', 1.0), ('de', 0.9), ('en', 0.8)),
+    (('de-DE', 1.0), ('de', 0.9), ('en-US', 0.8), ('en', 0.7)),
+    (('de', 1.0), ('de-DE', 0.95), ('en', 0.8)),
+    # Austria
+    (('de-AT', 1.0), ('de', 0.9), ('en', 0.8)),
+    (('de-AT', 1.0), ('de', 0.95), ('en-GB', 0.8), ('en', 0.75)),
+    # Switzerland (German)
+    (('de-CH', 1.0), ('de', 0.9), ('fr', 0.8), ('it', 0.7), ('en', 0.6)),
+    (('de-CH', 1.0), ('de', 0.95), ('fr-CH', 0.85), ('fr', 0.8), ('en', 0.6)),
+    # Spain
+    (('es-ES', 1.0), ('es', 0.9), ('ca', 0.8), ('en', 0.7)),
+    (('es-ES', 1.0), ('es', 0.95), ('en', 0.8)),
+    (('es', 1.0), ('es-ES', 0.95), ('en-US', 0.8), ('en', 0.75)),
+    # Italy
+    (('it-IT', 1.0), ('it', 0.9), ('en', 0.8)),
+    (('it', 1.0), ('it-IT', 0.95), ('en-US', 0.8), ('en', 0.75)),
+    # Switzerland (Italian)
+    (('it-CH', 1.0), ('it', 0.9), ('de', 0.8), ('fr', 0.7), ('en', 0.6)),
+    # Portugal
+    (('pt-PT', 1.0), ('pt', 0.9), ('en', 0.8)),
+    (('pt', 1.0), ('pt-PT', 0.95), ('en-GB', 0.8), ('en', 0.75)),
+    # Netherlands
+    (('nl-NL', 1.0), ('nl', 0.9), ('en', 0.85)),
+    (('nl', 1.0), ('nl-NL', 0.95), ('en-US', 0.85), ('en', 0.8)),
+    # Belgium (Flemish)
+    (('nl-BE', 1.0), ('nl', 0.9), ('fr', 0.8), ('en', 0.7)),
+    (('nl-BE', 1.0), ('nl', 0.95), ('fr-BE', 0.85), ('fr', 0.8), ('en', 0.7)),
+    # Poland
+    (('pl-PL', 1.0), ('pl', 0.9), ('en', 0.8)),
+    (('pl', 1.0), ('pl-PL', 0.95), ('en-US', 0.8), ('en', 0.75)),
+    # Sweden
+    (('sv-SE', 1.0), ('sv', 0.9), ('en', 0.85)),
+    (('sv', 1.0), ('sv-SE', 0.95), ('en-GB', 0.85), ('en', 0.8)),
+    # Denmark
+    (('da-DK', 1.0), ('da', 0.9), ('en', 0.85)),
+    (('da', 1.0), ('da-DK', 0.95), ('en-US', 0.85), ('en', 0.8)),
+    # Norway
+    (('no-NO', 1.0), ('no', 0.9), ('nb', 0.85), ('en', 0.8)),
+    (('nb-NO', 1.0), ('nb', 0.95), ('no', 0.9), ('en', 0.8)),
+    # Finland
+    (('fi-FI', 1.0), ('fi', 0.9), ('sv', 0.8), ('en', 0.75)),
+    (('fi', 1.0), ('fi-FI', 0.95), ('sv-FI', 0.85), ('sv', 0.8), ('en', 0.7)),
+    # Czech Republic
+    (('cs-CZ', 1.0), ('cs', 0.9), ('en', 0.8)),
+    (('cs', 1.0), ('cs-CZ', 0.95), ('sk', 0.85), ('en', 0.8)),
+    # Hungary
+    (('hu-HU', 1.0), ('hu', 0.9), ('en', 0.8)),
+    (('hu', 1.0), ('hu-HU', 0.95), ('en-US', 0.8), ('en', 0.75)),
+    # Romania
+    (('ro-RO', 1.0), ('ro', 0.9), ('en', 0.8)),
+    (('ro', 1.0), ('ro-RO', 0.95), ('en-GB', 0.8), ('en', 0.75)),
+    # Greece
+    (('el-GR', 1.0), ('el', 0.9), ('en', 0.8)),
+    (('el', 1.0), ('el-GR', 0.95), ('en-US', 0.8), ('en', 0.75)),
+    # Slovakia
+    (('sk-SK', 1.0), ('sk', 0.9), ('cs', 0.85), ('en', 0.75)),
+    (('sk', 1.0), ('sk-SK', 0.95), ('cs', 0.85), ('en', 0.8)),
+    # Bulgaria
+    (('bg-BG', 1.0), ('bg', 0.9), ('en', 0.8)),
+    # Croatia
+    (('hr-HR', 1.0), ('hr', 0.9), ('en', 0.8)),
+    # Slovenia
+    (('sl-SI', 1.0), ('sl', 0.9), ('en', 0.8)),
+    # Estonia
+    (('et-EE', 1.0), ('et', 0.9), ('en', 0.85)),
+    # Latvia
+    (('lv-LV', 1.0), ('lv', 0.9), ('en', 0.85)),
+    # Lithuania
+    (('lt-LT', 1.0), ('lt', 0.9), ('en', 0.85)),
+)
+
 def generate_random_language():
     """
     Generate random European language with 80% French variants
@@ -1119,135 +1275,48 @@ def generate_random_language():
     
     Randomizing q-values makes fingerprinting harder and mimics natural browser variations.
     """
-    
-    def randomize_q(base):
-        """Add small random variation to quality value (±0.05)"""
-        variation = random.uniform(-0.05, 0.05)
-        return max(0.1, min(1.0, base + variation))  # Keep between 0.1 and 1.0
-    
-    def build_lang_string(langs_with_q):
-        """Build language string with randomized q-values"""
-        parts = []
-        for i, (lang, base_q) in enumerate(langs_with_q):
-            if i == 0:
-                # First language typically has no q-value (implicit 1.0)
-                # But sometimes it does - 30% chance
-                if random.random() < 0.3:
-                    q = randomize_q(0.98)
-                    parts.append(f'{lang};q={q:.1f}')
-                else:
-                    parts.append(lang)
-            else:
-                q = randomize_q(base_q)
-                parts.append(f'{lang};q={q:.1f}')
-        return ','.join(parts)
-    
-    # French variants (80% weight) - defined as (language, base_quality)
-    french_language_templates = [
-        # France
-        [('fr-FR', 1.0), ('fr', 0.9), ('en', 0.8)],
-        [('fr-FR', 1.0), ('fr', 0.9), ('en-US', 0.8), ('en', 0.7)],
-        [('fr', 1.0), ('fr-FR', 0.95), ('en', 0.8)],
-        [('fr-FR', 1.0), ('en', 0.7)],
-        # Belgium
-        [('fr-BE', 1.0), ('fr', 0.9), ('nl', 0.8), ('en', 0.7)],
-        [('fr-BE', 1.0), ('fr', 0.9), ('nl-BE', 0.85), ('nl', 0.8), ('en', 0.7)],
-        # Switzerland
-        [('fr-CH', 1.0), ('fr', 0.9), ('de', 0.8), ('it', 0.7), ('en', 0.6)],
-        [('fr-CH', 1.0), ('fr', 0.95), ('de-CH', 0.85), ('de', 0.8), ('en', 0.6)],
-        # Canada
-        [('fr-CA', 1.0), ('fr', 0.9), ('en-CA', 0.8), ('en', 0.7)],
-        [('fr-CA', 1.0), ('fr', 0.95), ('en', 0.75)],
-        [('fr', 1.0), ('fr-CA', 0.95), ('en-CA', 0.8), ('en-US', 0.75), ('en', 0.7)],
-        # Luxembourg
-        [('fr-LU', 1.0), ('fr', 0.9), ('de', 0.85), ('en', 0.7)],
-        [('fr-LU', 1.0), ('fr', 0.95), ('de-LU', 0.9), ('de', 0.85), ('en', 0.7)],
-        # Monaco
-        [('fr-MC', 1.0), ('fr', 0.9), ('it', 0.8), ('en', 0.7)],
-        [('fr-MC', 1.0), ('fr', 0.95), ('en', 0.75)],
-    ]
-    
-    # Other European languages (20% weight)
-    other_language_templates = [
-        # Germany
-        [('de-DE', 1.0), ('de', 0.9), ('en', 0.8)],
-        [('de-DE', 1.0), ('de', 0.9), ('en-US', 0.8), ('en', 0.7)],
-        [('de', 1.0), ('de-DE', 0.95), ('en', 0.8)],
-        # Austria
-        [('de-AT', 1.0), ('de', 0.9), ('en', 0.8)],
-        [('de-AT', 1.0), ('de', 0.95), ('en-GB', 0.8), ('en', 0.75)],
-        # Switzerland (German)
-        [('de-CH', 1.0), ('de', 0.9), ('fr', 0.8), ('it', 0.7), ('en', 0.6)],
-        [('de-CH', 1.0), ('de', 0.95), ('fr-CH', 0.85), ('fr', 0.8), ('en', 0.6)],
-        # Spain
-        [('es-ES', 1.0), ('es', 0.9), ('ca', 0.8), ('en', 0.7)],
-        [('es-ES', 1.0), ('es', 0.95), ('en', 0.8)],
-        [('es', 1.0), ('es-ES', 0.95), ('en-US', 0.8), ('en', 0.75)],
-        # Italy
-        [('it-IT', 1.0), ('it', 0.9), ('en', 0.8)],
-        [('it', 1.0), ('it-IT', 0.95), ('en-US', 0.8), ('en', 0.75)],
-        # Switzerland (Italian)
-        [('it-CH', 1.0), ('it', 0.9), ('de', 0.8), ('fr', 0.7), ('en', 0.6)],
-        # Portugal
-        [('pt-PT', 1.0), ('pt', 0.9), ('en', 0.8)],
-        [('pt', 1.0), ('pt-PT', 0.95), ('en-GB', 0.8), ('en', 0.75)],
-        # Netherlands
-        [('nl-NL', 1.0), ('nl', 0.9), ('en', 0.85)],
-        [('nl', 1.0), ('nl-NL', 0.95), ('en-US', 0.85), ('en', 0.8)],
-        # Belgium (Flemish)
-        [('nl-BE', 1.0), ('nl', 0.9), ('fr', 0.8), ('en', 0.7)],
-        [('nl-BE', 1.0), ('nl', 0.95), ('fr-BE', 0.85), ('fr', 0.8), ('en', 0.7)],
-        # Poland
-        [('pl-PL', 1.0), ('pl', 0.9), ('en', 0.8)],
-        [('pl', 1.0), ('pl-PL', 0.95), ('en-US', 0.8), ('en', 0.75)],
-        # Sweden
-        [('sv-SE', 1.0), ('sv', 0.9), ('en', 0.85)],
-        [('sv', 1.0), ('sv-SE', 0.95), ('en-GB', 0.85), ('en', 0.8)],
-        # Denmark
-        [('da-DK', 1.0), ('da', 0.9), ('en', 0.85)],
-        [('da', 1.0), ('da-DK', 0.95), ('en-US', 0.85), ('en', 0.8)],
-        # Norway
-        [('no-NO', 1.0), ('no', 0.9), ('nb', 0.85), ('en', 0.8)],
-        [('nb-NO', 1.0), ('nb', 0.95), ('no', 0.9), ('en', 0.8)],
-        # Finland
-        [('fi-FI', 1.0), ('fi', 0.9), ('sv', 0.8), ('en', 0.75)],
-        [('fi', 1.0), ('fi-FI', 0.95), ('sv-FI', 0.85), ('sv', 0.8), ('en', 0.7)],
-        # Czech Republic
-        [('cs-CZ', 1.0), ('cs', 0.9), ('en', 0.8)],
-        [('cs', 1.0), ('cs-CZ', 0.95), ('sk', 0.85), ('en', 0.8)],
-        # Hungary
-        [('hu-HU', 1.0), ('hu', 0.9), ('en', 0.8)],
-        [('hu', 1.0), ('hu-HU', 0.95), ('en-US', 0.8), ('en', 0.75)],
-        # Romania
-        [('ro-RO', 1.0), ('ro', 0.9), ('en', 0.8)],
-        [('ro', 1.0), ('ro-RO', 0.95), ('en-GB', 0.8), ('en', 0.75)],
-        # Greece
-        [('el-GR', 1.0), ('el', 0.9), ('en', 0.8)],
-        [('el', 1.0), ('el-GR', 0.95), ('en-US', 0.8), ('en', 0.75)],
-        # Slovakia
-        [('sk-SK', 1.0), ('sk', 0.9), ('cs', 0.85), ('en', 0.75)],
-        [('sk', 1.0), ('sk-SK', 0.95), ('cs', 0.85), ('en', 0.8)],
-        # Bulgaria
-        [('bg-BG', 1.0), ('bg', 0.9), ('en', 0.8)],
-        # Croatia
-        [('hr-HR', 1.0), ('hr', 0.9), ('en', 0.8)],
-        # Slovenia
-        [('sl-SI', 1.0), ('sl', 0.9), ('en', 0.8)],
-        # Estonia
-        [('et-EE', 1.0), ('et', 0.9), ('en', 0.85)],
-        # Latvia
-        [('lv-LV', 1.0), ('lv', 0.9), ('en', 0.85)],
-        # Lithuania
-        [('lt-LT', 1.0), ('lt', 0.9), ('en', 0.85)],
-    ]
-    
     # 80% French, 20% other European
     if random.random() < 0.8:
-        template = random.choice(french_language_templates)
+        template = random.choice(_FRENCH_LANGUAGE_TEMPLATES)
     else:
-        template = random.choice(other_language_templates)
+        template = random.choice(_OTHER_LANGUAGE_TEMPLATES)
     
-    return build_lang_string(template)
+    # Only a handful of distinct strings come out of each template, intern
+    # them so pooled fingerprints share one copy
+    return sys.intern(_build_lang_string(template))
+
+# Realistic hardware combinations
+# Format: (cores, ram_gb, touch_points, weight)
+_HARDWARE_CONFIGS = (
+    # Budget laptops
+    (2, 4, 0, 10),
+    (4, 4, 0, 15),
+    (4, 8, 0, 20),
+    
+    # Mid-range laptops/desktops
+    (4, 8, 0, 20),
+    (6, 8, 0, 12),
+    (8, 8, 0, 15),
+    (8, 16, 0, 15),
+    
+    # High-end desktops
+    (12, 16, 0, 8),
+    (16, 16, 0, 5),
+    (16, 32, 0, 3),
+    (24, 32, 0, 2),
+    (32, 64, 0, 1),
+    
+    # Touch-enabled devices (laptops/2-in-1s)
+    (4, 8, 10, 5),
+    (4, 8, 5, 3),
+    (8, 16, 10, 3),
+    (8, 16, 5, 2),
+    
+    # Tablets
+    (4, 4, 10, 2),
+    (8, 8, 10, 2),
+)
+_HARDWARE_WEIGHTS = tuple(w for _, _, _, w in _HARDWARE_CONFIGS)
 
 def generate_random_hardware():
     """
@@ -1258,60 +1327,35 @@ def generate_random_hardware():
     - deviceMemory: RAM in GB
     - maxTouchPoints: touch capability
     """
-    
-    # Realistic hardware combinations
-    # Format: (cores, ram_gb, touch_points, weight)
-    hardware_configs = [
-        # Budget laptops
-        (2, 4, 0, 10),
-        (4, 4, 0, 15),
-        (4, 8, 0, 20),
-        
-        # Mid-range laptops/desktops
-        (4, 8, 0, 20),
-        (6, 8, 0, 12),
-        (8, 8, 0, 15),
-        (8, 16, 0, 15),
-        
-        # High-end desktops
-        (12, 16, 0, 8),
-        (16, 16, 0, 5),
-        (16, 32, 0, 3),
-        (24, 32, 0, 2),
-        (32, 64, 0, 1),
-        
-        # Touch-enabled devices (laptops/2-in-1s)
-        (4, 8, 10, 5),
-        (4, 8, 5, 3),
-        (8, 16, 10, 3),
-        (8, 16, 5, 2),
-        
-        # Tablets
-        (4, 4, 10, 2),
-        (8, 8, 10, 2),
-    ]
-    
     # Weighted random selection
-    total_weight = sum(w for _, _, _, w in hardware_configs)
-    rand_val = random.uniform(0, total_weight)
-    cumulative = 0
-    
-    for cores, ram, touch, weight in hardware_configs:
-        cumulative += weight
-        if rand_val <= cumulative:
-            return {
-                'hardwareConcurrency': cores,
-                'deviceMemory': ram,
-                'maxTouchPoints': touch
-            }
-    
-    # Fallback
+    cores, ram, touch, _ = random.choices(_HARDWARE_CONFIGS, weights=_HARDWARE_WEIGHTS)[0]
     return {
-        'hardwareConcurrency': 8,
-        'deviceMemory': 8,
-        'maxTouchPoints': 0
+        'hardwareConcurrency': cores,
+        'deviceMemory': ram,
+        'maxTouchPoints': touch
     }
 
+# Realistic connection types with typical characteristics
+# Format: (type, rtt_range, downlink_range, weight)
+_CONNECTION_CONFIGS = (
+    # 4G (most common)
+    ('4g', (50, 150), (5, 20), 45),
+    ('4g', (40, 100), (10, 30), 25),
+    
+    # WiFi (fast)
+    ('4g', (20, 50), (20, 100), 15),
+    
+    # 3G (older networks)
+    ('3g', (200, 400), (1, 5), 5),
+    
+    # 5G (newer devices)
+    ('4g', (10, 40), (30, 150), 8),
+    
+    # Slow connections
+    ('3g', (300, 600), (0.5, 2), 2),
+)
+_CONNECTION_WEIGHTS = tuple(w for _, _, _, w in _CONNECTION_CONFIGS)
+
 def generate_random_connection():
     """
     Generate random network connection properties for Network Information API
@@ -1322,54 +1366,48 @@ def generate_random_connection():
     - downlink: download speed in Mbps
     - saveData: data saver mode
     """
-    
-    # Realistic connection types with typical characteristics
-    # Format: (type, rtt_range, downlink_range, weight)
-    connection_configs = [
-        # 4G (most common)
-        ('4g', (50, 150), (5, 20), 45),
-        ('4g', (40, 100), (10, 30), 25),
-        
-        # WiFi (fast)
-        ('4g', (20, 50), (20, 100), 15),
-        
-        # 3G (older networks)
-        ('3g', (200, 400), (1, 5), 5),
-        
-        # 5G (newer devices)
-        ('4g', (10, 40), (30, 150), 8),
-        
-        # Slow connections
-        ('3g', (300, 600), (0.5, 2), 2),
-    ]
-    
     # Weighted random selection
-    total_weight = sum(w for _, _, _, w in connection_configs)
-    rand_val = random.uniform(0, total_weight)
-    cumulative = 0
-    
-    for conn_type, rtt_range, downlink_range, weight in connection_configs:
-        cumulative += weight
-        if rand_val <= cumulative:
-            rtt = random.randint(rtt_range[0], rtt_range[1])
-            downlink = round(random.uniform(downlink_range[0], downlink_range[1]), 1)
-            save_data = random.random() < 0.1  # 10% enable data saver
-            
-            return {
-                'effectiveType': conn_type,
-                'rtt': rtt,
-                'downlink': downlink,
-                'saveData': save_data
-            }
+    conn_type, rtt_range, downlink_range, _ = random.choices(_CONNECTION_CONFIGS, weights=_CONNECTION_WEIGHTS)[0]
+    rtt = random.randint(rtt_range[0], rtt_range[1])
+    downlink = round(random.uniform(downlink_range[0], downlink_range[1]), 1)
+    save_data = random.random() < 0.1  # 10% enable data saver
     
-    # Fallback
     return {
-        'effectiveType': '4g',
-        'rtt': 100,
-        'downlink': 10.0,
-        'saveData': False
+        'effectiveType': conn_type,
+        'rtt': rtt,
+        'downlink': downlink,
+        'saveData': save_data
     }
 
+# Map languages to common timezone offsets (in minutes)
+# European timezones (-60 to +180 minutes)
+_TIMEZONE_MAP = {
+    'fr': (-60, 60, 120),  # France (CET/CEST)
+    'de': (60, 120),  # Germany (CET/CEST)
+    'it': (60, 120),  # Italy
+    'es': (60, 120),  # Spain
+    'pt': (0, 60),  # Portugal
+    'nl': (60, 120),  # Netherlands
+    'be': (60, 120),  # Belgium
+    'pl': (60, 120),  # Poland
+    'en': (0, 60, -300, -360, -480, 600),  # UK, US East, US Central, US West, Australia
+    'ru': (180, 240, 300),  # Russia (multiple zones)
+    'ar': (180,),  # Arabic countries
+    'zh': (480,),  # China
+    'ja': (540,),  # Japan
+    'ko': (540,),  # Korea
+}
+
+# Default to Central European Time
+_DEFAULT_TIMEZONES = (60, 120)
+
+@functools.lru_cache(maxsize=64)
+def _timezone_options(language):
+    """Candidate timezone offsets for an Accept-Language string (pure, so cached)"""
+    # Parse language code (e.g., "fr-FR" -> "fr")
+    lang_code = language.split('-')[0].split(',')[0].lower()
+    return _TIMEZONE_MAP.get(lang_code, _DEFAULT_TIMEZONES)
+
 def get_timezone_for_language(language):
     """
     Map language/region to realistic timezone offset
@@ -1377,34 +1415,42 @@ def get_timezone_for_language(language):
     
     Returns timezone offset in minutes (negative is west of UTC)
     """
-    # Parse language code (e.g., "fr-FR" -> "fr")
-    lang_code = language.split('-')[0].split(',')[0].lower()
-    
-    # Map languages to common timezone offsets (in minutes)
-    # European timezones (-60 to +180 minutes)
-    timezone_map = {
-        'fr': [-60, 60, 120],  # France (CET/CEST)
-        'de': [60, 120],  # Germany (CET/CEST)
-        'it': [60, 120],  # Italy
-        'es': [60, 120],  # Spain
-        'pt': [0, 60],  # Portugal
-        'nl': [60, 120],  # Netherlands
-        'be': [60, 120],  # Belgium
-        'pl': [60, 120],  # Poland
-        'en': [0, 60, -300, -360, -480, 600],  # UK, US East, US Central, US West, Australia
-        'ru': [180, 240, 300],  # Russia (multiple zones)
-        'ar': [180],  # Arabic countries
-        'zh': [480],  # China
-        'ja': [540],  # Japan
-        'ko': [540],  # Korea
-    }
-    
-    if lang_code in timezone_map:
-        return random.choice(timezone_map[lang_code])
-    
-    # Default to Central European Time
-    return random.choice([60, 120])
+    return random.choice(_timezone_options(language))
+
 
+# Major cities by timezone offset (minutes from UTC)
+_TIMEZONE_CITY_COORDS = {
+    -480: (37.7749, -122.4194),   # San Francisco (PST)
+    -420: (33.4484, -112.0740),   # Phoenix (MST)
+    -360: (41.8781, -87.6298),    # Chicago (CST)
+    -300: (40.7128, -74.0060),    # New York (EST)
+    -240: (10.4806, -66.9036),    # Caracas
+    -180: (-23.5505, -46.6333),   # São Paulo
+    0: (51.5074, -0.1278),        # London (GMT)
+    60: (48.8566, 2.3522),        # Paris (CET)
+    120: (52.5200, 13.4050),      # Berlin (CEST)
+    180: (55.7558, 37.6173),      # Moscow
+    240: (25.2048, 55.2708),      # Dubai
+    300: (28.6139, 77.2090),      # Delhi
+    330: (19.0760, 72.8777),      # Mumbai
+    360: (23.8103, 90.4125),      # Dhaka
+    420: (13.7563, 100.5018),     # Bangkok
+    480: (39.9042, 116.4074),     # Beijing
+    540: (35.6762, 139.6503),     # Tokyo
+    600: (37.5665, 126.9780),     # Seoul / Sydney area
+    660: (-33.8688, 151.2093),    # Sydney
+    720: (-36.8485, 174.7633),    # Auckland
+}
+
+@functools.lru_cache(maxsize=64)
+def _city_coords_for_timezone(timezone_offset):
+    """Coordinates of the listed city closest to a timezone offset (pure, so cached)"""
+    # Get closest timezone
+    if timezone_offset in _TIMEZONE_CITY_COORDS:
+        return _TIMEZONE_CITY_COORDS[timezone_offset]
+    # Find nearest timezone
+    nearest_offset = min(_TIMEZONE_CITY_COORDS, key=lambda x: abs(x - timezone_offset))
+    return _TIMEZONE_CITY_COORDS[nearest_offset]
 
 def get_coords_for_timezone(timezone_offset):
     """
@@ -1417,38 +1463,7 @@ def get_coords_for_timezone(timezone_offset):
     Returns:
         tuple: (latitude, longitude) with slight randomization
     """
-    # Major cities by timezone offset (minutes from UTC)
-    timezone_to_city_coords = {
-        -480: (37.7749, -122.4194),   # San Francisco (PST)
-        -420: (33.4484, -112.0740),   # Phoenix (MST)
-        -360: (41.8781, -87.6298),    # Chicago (CST)
-        -300: (40.7128, -74.0060),    # New York (EST)
-        -240: (10.4806, -66.9036),    # Caracas
-        -180: (-23.5505, -46.6333),   # São Paulo
-        0: (51.5074, -0.1278),        # London (GMT)
-        60: (48.8566, 2.3522),        # Paris (CET)
-        120: (52.5200, 13.4050),      # Berlin (CEST)
-        180: (55.7558, 37.6173),      # Moscow
-        240: (25.2048, 55.2708),      # Dubai
-        300: (28.6139, 77.2090),      # Delhi
-        330: (19.0760, 72.8777),      # Mumbai
-        360: (23.8103, 90.4125),      # Dhaka
-        420: (13.7563, 100.5018),     # Bangkok
-        480: (39.9042, 116.4074),     # Beijing
-        540: (35.6762, 139.6503),     # Tokyo
-        600: (37.5665, 126.9780),     # Seoul / Sydney area
-        660: (-33.8688, 151.2093),    # Sydney
-        720: (-36.8485, 174.7633),    # Auckland
-    }
-    
-    # Get closest timezone
-    if timezone_offset in timezone_to_city_coords:
-        base_lat, base_lng = timezone_to_city_coords[timezone_offset]
-    else:
-        # Find nearest timezone
-        nearest_offset = min(timezone_to_city_coords.keys(), 
-                           key=lambda x: abs(x - timezone_offset))
-        base_lat, base_lng = timezone_to_city_coords[nearest_offset]
+    base_lat, base_lng = _city_coords_for_timezone(timezone_offset)
     
     # Add ±0.5km noise to coordinates
     lat_noise = (random.random() - 0.5) * 0.01  # ~0.5km
@@ -1464,7 +1479,7 @@ def generate_random_battery():
     Returns a dict with realistic battery properties
     """
     # Realistic battery scenarios
-    charging = random.choice([True, False, False, False])  # 25% charging
+    charging = random.random() < 0.25  # 25% charging
     
     if charging:
         level = random.uniform(0.2, 0.95)  # Charging devices typically not full
@@ -1482,261 +1497,378 @@ def generate_random_battery():
         'level': round(level, 2)
     }
 
+# Massively expanded camera configurations
+_CAMERAS = (
+    # Webcams
+    ('videoinput', 'HD WebCam (05ac:8514)'),
+    ('videoinput', 'FaceTime HD Camera'),
+    ('videoinput', 'Integrated Camera (04f2:b604)'),
+    ('videoinput', 'USB2.0 HD UVC WebCam'),
+    ('videoinput', 'Logitech HD Webcam C525'),
+    ('videoinput', 'Logitech HD Pro Webcam C920'),
+    ('videoinput', 'Logitech Webcam C930e'),
+    ('videoinput', 'Logitech BRIO Ultra HD'),
+    ('videoinput', 'Logitech StreamCam'),
+    ('videoinput', 'Microsoft LifeCam HD-3000'),
+    ('videoinput', 'Microsoft LifeCam Studio'),
+    ('videoinput', 'Microsoft LifeCam Cinema'),
+    ('videoinput', 'Razer Kiyo'),
+    ('videoinput', 'Razer Kiyo Pro'),
+    ('videoinput', 'Creative Live! Cam Sync HD'),
+    ('videoinput', 'HD Pro Webcam C920'),
+    ('videoinput', 'HD Webcam C615'),
+    ('videoinput', 'USB Camera (046d:0825)'),
+    ('videoinput', 'HP HD Camera'),
+    ('videoinput', 'HP Wide Vision HD Camera'),
+    ('videoinput', 'HP TrueVision HD Camera'),
+    ('videoinput', 'Dell UltraSharp Webcam'),
+    ('videoinput', 'Lenovo Integrated Camera'),
+    ('videoinput', 'ThinkPad Integrated Camera'),
+    ('videoinput', 'ASUS USB2.0 WebCam'),
+    ('videoinput', 'Acer Crystal Eye webcam'),
+    ('videoinput', 'Sony Visual Communication Camera'),
+    ('videoinput', 'Elgato Facecam'),
+    ('videoinput', 'AVerMedia Live Streamer CAM 313'),
+    ('videoinput', 'Canon EOS Webcam Utility'),
+    ('videoinput', 'Panasonic HD Camera'),
+)
+
+# Headsets that enumerate both as an input and an output device
+_SHARED_HEADSET_LABELS = (
+    'AirPods Pro',
+    'Sony WH-1000XM4',
+)
+
+# Massively expanded microphone configurations
+_MICROPHONES = (
+    ('audioinput', 'Microphone (Realtek High Definition Audio)'),
+    ('audioinput', 'Microphone (Realtek(R) Audio)'),
+    ('audioinput', 'Built-in Microphone'),
+    ('audioinput', 'Internal Microphone (Built-in)'),
+    ('audioinput', 'Microphone Array (Intel Smart Sound Technology)'),
+    ('audioinput', 'Microphone Array (Intel SST)'),
+    ('audioinput', 'Microphone Array (Realtek Audio)'),
+    ('audioinput', 'Microphone (NVIDIA High Definition Audio)'),
+    ('audioinput', 'Microphone (USB Audio Device)'),
+    ('audioinput', 'Blue Yeti Microphone'),
+    ('audioinput', 'Blue Snowball'),
+    ('audioinput', 'HyperX QuadCast'),
+    ('audioinput', 'Razer Seiren Mini'),
+    ('audioinput', 'Audio-Technica AT2020USB+'),
+    ('audioinput', 'Rode NT-USB Mini'),
+    ('audioinput', 'Shure MV7'),
+    ('audioinput', 'Elgato Wave:3'),
+    ('audioinput', 'SteelSeries Arctis Pro'),
+    ('audioinput', 'Logitech USB Headset'),
+    ('audioinput', 'Jabra Evolve 75'),
+    ('audioinput', 'Plantronics Blackwire 5220'),
+    ('audioinput', 'Sennheiser SC 60'),
+    ('audioinput', 'AirPods (2nd generation)'),
+    ('audioinput', 'Bose QuietComfort 35'),
+    ('audioinput', 'Default - Microphone (Conexant ISST Audio)'),
+    ('audioinput', 'Front Microphone (IDT High Definition Audio CODEC)'),
+) + tuple(('audioinput', label) for label in _SHARED_HEADSET_LABELS)
+
+# Massively expanded speaker configurations
+_SPEAKERS = (
+    ('audiooutput', 'Speakers (Realtek High Definition Audio)'),
+    ('audiooutput', 'Speakers (Realtek(R) Audio)'),
+    ('audiooutput', 'Built-in Output'),
+    ('audiooutput', 'Built-in Speakers'),
+    ('audiooutput', 'Speakers / Headphones (Realtek Audio)'),
+    ('audiooutput', 'Speakers (NVIDIA High Definition Audio)'),
+    ('audiooutput', 'Speakers (Intel Display Audio)'),
+    ('audiooutput', 'Speakers (AMD High Definition Audio)'),
+    ('audiooutput', 'Headphones (USB Audio Device)'),
+    ('audiooutput', 'Logitech G Pro X Gaming Headset'),
+    ('audiooutput', 'SteelSeries Arctis 7'),
+    ('audiooutput', 'HyperX Cloud II'),
+    ('audiooutput', 'Razer Kraken'),
+    ('audiooutput', 'Corsair VOID RGB Elite'),
+    ('audiooutput', 'Sennheiser GSP 600'),
+    ('audiooutput', 'Audio-Technica ATH-M50x'),
+    ('audiooutput', 'Bose QuietComfort 35 II'),
+    ('audiooutput', 'AirPods Max'),
+    ('audiooutput', 'Beats Studio3 Wireless'),
+    ('audiooutput', 'JBL Quantum 800'),
+    ('audiooutput', 'Astro A50'),
+    ('audiooutput', 'Turtle Beach Stealth 700'),
+    ('audiooutput', 'Samsung Galaxy Buds Pro'),
+    ('audiooutput', 'Jabra Elite 85h'),
+    ('audiooutput', 'LG TONE Free'),
+    ('audiooutput', 'Default - Speakers (IDT High Definition Audio CODEC)'),
+    ('audiooutput', 'Speakers (Conexant ISST Audio)'),
+) + tuple(('audiooutput', label) for label in _SHARED_HEADSET_LABELS)
+
+# Device count distributions (cumulative weights over _DEVICE_COUNTS)
+_DEVICE_COUNTS = (1, 2, 3)
+_CAMERA_COUNT_CUM_WEIGHTS = (5, 6, 6)   # 5:1:0
+_MIC_COUNT_CUM_WEIGHTS = (4, 6, 7)      # 4:2:1
+_SPEAKER_COUNT_CUM_WEIGHTS = (3, 5, 6)  # 3:2:1
+
 def generate_random_media_devices():
     """
     Generate random media devices list for realistic fingerprinting
     
     Returns a list of realistic media device configurations
     """
-    devices = []
-    
-    # Massively expanded camera configurations
-    cameras = [
-        # Webcams
-        {'kind': 'videoinput', 'label': 'HD WebCam (05ac:8514)', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'FaceTime HD Camera', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Integrated Camera (04f2:b604)', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'USB2.0 HD UVC WebCam', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Logitech HD Webcam C525', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Logitech HD Pro Webcam C920', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Logitech Webcam C930e', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Logitech BRIO Ultra HD', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Logitech StreamCam', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Microsoft LifeCam HD-3000', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Microsoft LifeCam Studio', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Microsoft LifeCam Cinema', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Razer Kiyo', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Razer Kiyo Pro', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Creative Live! Cam Sync HD', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'HD Pro Webcam C920', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'HD Webcam C615', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'USB Camera (046d:0825)', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'HP HD Camera', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'HP Wide Vision HD Camera', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'HP TrueVision HD Camera', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Dell UltraSharp Webcam', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Lenovo Integrated Camera', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'ThinkPad Integrated Camera', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'ASUS USB2.0 WebCam', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Acer Crystal Eye webcam', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Sony Visual Communication Camera', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Elgato Facecam', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'AVerMedia Live Streamer CAM 313', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Canon EOS Webcam Utility', 'deviceId': ''},
-        {'kind': 'videoinput', 'label': 'Panasonic HD Camera', 'deviceId': ''},
-    ]
-    
-    # Massively expanded microphone configurations
-    microphones = [
-        {'kind': 'audioinput', 'label': 'Microphone (Realtek High Definition Audio)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Microphone (Realtek(R) Audio)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Built-in Microphone', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Internal Microphone (Built-in)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Microphone Array (Intel Smart Sound Technology)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Microphone Array (Intel SST)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Microphone Array (Realtek Audio)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Microphone (NVIDIA High Definition Audio)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Microphone (USB Audio Device)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Blue Yeti Microphone', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Blue Snowball', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'HyperX QuadCast', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Razer Seiren Mini', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Audio-Technica AT2020USB+', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Rode NT-USB Mini', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Shure MV7', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Elgato Wave:3', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'SteelSeries Arctis Pro', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Logitech USB Headset', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Jabra Evolve 75', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Plantronics Blackwire 5220', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Sennheiser SC 60', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'AirPods Pro', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'AirPods (2nd generation)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Sony WH-1000XM4', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Bose QuietComfort 35', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Default - Microphone (Conexant ISST Audio)', 'deviceId': ''},
-        {'kind': 'audioinput', 'label': 'Front Microphone (IDT High Definition Audio CODEC)', 'deviceId': ''},
-    ]
-    
-    # Massively expanded speaker configurations  
-    speakers = [
-        {'kind': 'audiooutput', 'label': 'Speakers (Realtek High Definition Audio)', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Speakers (Realtek(R) Audio)', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Built-in Output', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Built-in Speakers', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Speakers / Headphones (Realtek Audio)', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Speakers (NVIDIA High Definition Audio)', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Speakers (Intel Display Audio)', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Speakers (AMD High Definition Audio)', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Headphones (USB Audio Device)', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Logitech G Pro X Gaming Headset', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'SteelSeries Arctis 7', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'HyperX Cloud II', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Razer Kraken', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Corsair VOID RGB Elite', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Sennheiser GSP 600', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Audio-Technica ATH-M50x', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Sony WH-1000XM4', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Bose QuietComfort 35 II', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'AirPods Pro', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'AirPods Max', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Beats Studio3 Wireless', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'JBL Quantum 800', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Astro A50', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Turtle Beach Stealth 700', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Samsung Galaxy Buds Pro', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Jabra Elite 85h', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'LG TONE Free', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Default - Speakers (IDT High Definition Audio CODEC)', 'deviceId': ''},
-        {'kind': 'audiooutput', 'label': 'Speakers (Conexant ISST Audio)', 'deviceId': ''},
-    ]
-    
     # Most devices have at least 1 camera, 1 mic, 1 speaker
     # Some have multiple, some laptops without camera
     has_camera = random.random() > 0.1  # 90% have camera
-    num_mics = random.choice([1, 1, 1, 1, 2, 2, 3])  # Mostly 1, sometimes 2-3
-    num_speakers = random.choice([1, 1, 1, 2, 2, 3])  # Mostly 1, sometimes 2-3
-    
-    if has_camera:
-        num_cameras = random.choice([1, 1, 1, 1, 1, 2])  # Mostly 1, rarely 2
-        for _ in range(num_cameras):
-            camera = random.choice(cameras).copy()
-            camera['deviceId'] = ''.join(random.choices('0123456789abcdef', k=64))
-            devices.append(camera)
-    
-    for _ in range(num_mics):
-        mic = random.choice(microphones).copy()
-        mic['deviceId'] = ''.join(random.choices('0123456789abcdef', k=64))
-        devices.append(mic)
-    
-    for _ in range(num_speakers):
-        speaker = random.choice(speakers).copy()
-        speaker['deviceId'] = ''.join(random.choices('0123456789abcdef', k=64))
-        devices.append(speaker)
+    num_cameras = random.choices(_DEVICE_COUNTS, cum_weights=_CAMERA_COUNT_CUM_WEIGHTS)[0] if has_camera else 0  # Mostly 1, rarely 2
+    num_mics = random.choices(_DEVICE_COUNTS, cum_weights=_MIC_COUNT_CUM_WEIGHTS)[0]  # Mostly 1, sometimes 2-3
+    num_speakers = random.choices(_DEVICE_COUNTS, cum_weights=_SPEAKER_COUNT_CUM_WEIGHTS)[0]  # Mostly 1, sometimes 2-3
+    
+    # Draw every device template in one go (cameras, then mics, then speakers)
+    chosen = (random.choices(_CAMERAS, k=num_cameras)
+              + random.choices(_MICROPHONES, k=num_mics)
+              + random.choices(_SPEAKERS, k=num_speakers))
+    
+    # One urandom read for every deviceId (32 bytes -> 64 hex chars each)
+    ids = os.urandom(32 * len(chosen)).hex()
+    devices = [
+        {'kind': kind, 'label': label, 'deviceId': ids[i * 64:(i + 1) * 64]}
+        for i, (kind, label) in enumerate(chosen)
+    ]
     
     return devices
 
+# Massively expanded font list with hundreds of options
+_ALL_FONTS = (
+    # Windows common
+    'Arial', 'Arial Black', 'Arial Narrow', 'Calibri', 'Cambria', 'Cambria Math',
+    'Candara', 'Comic Sans MS', 'Consolas', 'Constantia', 'Corbel', 'Courier New',
+    'Ebrima', 'Franklin Gothic Medium', 'Georgia', 'Impact', 'Lucida Console', 
+    'Lucida Sans Unicode', 'Microsoft Sans Serif', 'MS Gothic', 'MS PGothic', 
+    'MS UI Gothic', 'Palatino Linotype', 'Segoe Print', 'Segoe Script', 'Segoe UI', 
+    'Segoe UI Black', 'Segoe UI Historic', 'Segoe UI Emoji', 'Segoe UI Symbol',
+    'Tahoma', 'Times New Roman', 'Trebuchet MS', 'Verdana', 'Webdings', 'Wingdings',
+    'Sylfaen', 'Symbol', 'Marlett', 'Microsoft YaHei', 'Microsoft JhengHei',
+    'Malgun Gothic', 'Leelawadee UI', 'Javanese Text', 'Myanmar Text', 'Nirmala UI',
+    'Gadugi', 'MV Boli', 'Mongolian Baiti', 'Microsoft PhagsPa', 'Microsoft Tai Le',
+    'Microsoft Himalaya', 'Microsoft New Tai Lue', 'Microsoft Yi Baiti', 'Sitka',
+    'Bahnschrift', 'Yu Gothic', 'Yu Gothic UI', 'Yu Mincho', 'HoloLens MDL2 Assets',
+    'Ink Free', 'Gabriola', 'Centaur', 'Century', 'Rockwell', 'Bookman Old Style',
+    'Bradley Hand ITC', 'Californian FB', 'Castellar', 'Chiller', 'Colonna MT',
+    'Cooper Black', 'Copperplate Gothic', 'Curlz MT', 'Edwardian Script ITC',
+    'Engravers MT', 'Felix Titling', 'Forte', 'French Script MT', 'Freestyle Script',
+    'Garamond', 'Gigi', 'Gill Sans MT', 'Gloucester MT', 'Goudy Old Style',
+    'Goudy Stout', 'Haettenschweiler', 'Harlow Solid Italic', 'Harrington',
+    'High Tower Text', 'Imprint MT Shadow', 'Jokerman', 'Juice ITC', 'Kristen ITC',
+    'Kunstler Script', 'Wide Latin', 'Lucida Bright', 'Lucida Calligraphy',
+    'Lucida Fax', 'Lucida Handwriting', 'Lucida Sans', 'Lucida Sans Typewriter',
+    'Magneto', 'Maiandra GD', 'Matura MT Script Capitals', 'Mistral', 'Modern No. 20',
+    'Monotype Corsiva', 'Niagara Engraved', 'Niagara Solid', 'OCR A Extended',
+    'Old English Text MT', 'Onyx', 'Palace Script MT', 'Papyrus', 'Parchment',
+    'Perpetua', 'Perpetua Titling MT', 'Playbill', 'Poor Richard', 'Pristina',
+    'Rage Italic', 'Ravie', 'Rockwell Extra Bold', 'Script MT Bold', 'Showcard Gothic',
+    'Snap ITC', 'Stencil', 'Tempus Sans ITC', 'Tw Cen MT', 'Viner Hand ITC',
+    'Vivaldi', 'Vladimir Script',
+    
+    # macOS common
+    'American Typewriter', 'Andale Mono', 'Apple Chancery', 'Apple Color Emoji',
+    'Apple SD Gothic Neo', 'Apple Symbols', 'AppleGothic', 'AppleMyungjo',
+    'Arial Hebrew', 'Arial Rounded MT Bold', 'Arial Unicode MS', 'Avenir', 
+    'Avenir Next', 'Avenir Next Condensed', 'Baskerville', 'Big Caslon', 
+    'Bodoni 72', 'Bodoni 72 Oldstyle', 'Bodoni 72 Smallcaps', 'Bodoni Ornaments',
+    'Bradley Hand', 'Brush Script MT', 'Chalkboard', 'Chalkboard SE', 'Chalkduster',
+    'Charter', 'Cochin', 'Comic Sans MS', 'Copperplate', 'Courier', 'Courier New',
+    'Damascus', 'Devanagari MT', 'Devanagari Sangam MN', 'Didot', 'DIN Alternate',
+    'DIN Condensed', 'Euphemia UCAS', 'Futura', 'Galvji', 'Geeza Pro', 'Geneva',
+    'Georgia', 'Gill Sans', 'Gujarati MT', 'Gujarati Sangam MN', 'Gurmukhi MN',
+    'Gurmukhi MT', 'Gurmukhi Sangam MN', 'Heiti SC', 'Heiti TC', 'Helvetica',
+    'Helvetica Neue', 'Herculanum', 'Hiragino Maru Gothic Pro', 'Hiragino Mincho ProN',
+    'Hiragino Sans', 'Hiragino Sans GB', 'Hoefler Text', 'Impact', 'Iowan Old Style',
+    'Kailasa', 'Kannada MN', 'Kannada Sangam MN', 'Kefa', 'Khmer MN', 'Khmer Sangam MN',
+    'Kohinoor Bangla', 'Kohinoor Devanagari', 'Kohinoor Gujarati', 'Kohinoor Telugu',
+    'Kokonor', 'Krungthep', 'KufiStandardGK', 'Lao MN', 'Lao Sangam MN', 'Lucida Grande',
+    'Luminari', 'Malayalam MN', 'Malayalam Sangam MN', 'Marion', 'Marker Felt',
+    'Menlo', 'Microsoft Sans Serif', 'Mishafi', 'Monaco', 'Mshtakan', 'Muna',
+    'Myanmar MN', 'Myanmar Sangam MN', 'Nadeem', 'New Peninim MT', 'Noteworthy',
+    'Noto Nastaliq Urdu', 'Optima', 'Oriya MN', 'Oriya Sangam MN', 'Palatino',
+    'Papyrus', 'Party LET', 'Phosphate', 'PingFang HK', 'PingFang SC', 'PingFang TC',
+    'Plantagenet Cherokee', 'PT Mono', 'PT Sans', 'PT Sans Caption', 'PT Sans Narrow',
+    'PT Serif', 'PT Serif Caption', 'Raanana', 'Rockwell', 'Sana', 'Sathu', 'Savoye LET',
+    'Seravek', 'Shree Devanagari 714', 'SignPainter', 'Silom', 'Sinhala MN',
+    'Sinhala Sangam MN', 'Skia', 'Snell Roundhand', 'Songti SC', 'Songti TC',
+    'STFangsong', 'STHeiti', 'STIX Two Math', 'STIX Two Text', 'STIXGeneral',
+    'STIXIntegralsD', 'STIXIntegralsSm', 'STIXIntegralsUp', 'STIXIntegralsUpD',
+    'STIXIntegralsUpSm', 'STIXNonUnicode', 'STIXSizeFiveSym', 'STIXSizeFourSym',
+    'STIXSizeOneSym', 'STIXSizeThreeSym', 'STIXSizeTwoSym', 'STIXVariants', 'STKaiti',
+    'STSong', 'Sukhumvit Set', 'Superclarendon', 'Symbol', 'Tahoma', 'Tamil MN',
+    'Tamil Sangam MN', 'Telugu MN', 'Telugu Sangam MN', 'Thonburi', 'Times',
+    'Times New Roman', 'Trattatello', 'Trebuchet MS', 'Verdana', 'Waseem', 'Webdings',
+    'Wingdings', 'Wingdings 2', 'Wingdings 3', 'Zapf Dingbats', 'Zapfino',
+    'SF Pro Display', 'SF Pro Text', 'SF Pro Rounded', 'SF Mono', 'SF Compact Display',
+    'SF Compact Text', 'SF Compact Rounded', 'New York', 'New York Small', 'New York Medium',
+    'New York Large', 'New York Extra Large', '.AppleSystemUIFont',
+    
+    # Linux common
+    'DejaVu Sans', 'DejaVu Sans Mono', 'DejaVu Serif', 'DejaVu Sans Condensed',
+    'DejaVu Serif Condensed', 'DejaVu Math TeX Gyre', 'Droid Sans', 'Droid Sans Mono',
+    'Droid Serif', 'FreeSans', 'FreeSerif', 'FreeMono', 'Liberation Sans', 
+    'Liberation Sans Narrow', 'Liberation Serif', 'Liberation Mono', 'Nimbus Mono PS',
+    'Nimbus Roman', 'Nimbus Sans', 'Nimbus Sans Narrow', 'Noto Sans', 'Noto Sans CJK',
+    'Noto Sans Mono', 'Noto Serif', 'Noto Serif CJK', 'Noto Color Emoji', 'Noto Emoji',
+    'Noto Sans Arabic', 'Noto Sans Armenian', 'Noto Sans Bengali', 'Noto Sans Cherokee',
+    'Noto Sans Devanagari', 'Noto Sans Ethiopic', 'Noto Sans Georgian', 'Noto Sans Gujarati',
+    'Noto Sans Gurmukhi', 'Noto Sans Hebrew', 'Noto Sans JP', 'Noto Sans KR',
+    'Noto Sans Kannada', 'Noto Sans Khmer', 'Noto Sans Lao', 'Noto Sans Malayalam',
+    'Noto Sans Myanmar', 'Noto Sans Oriya', 'Noto Sans SC', 'Noto Sans Sinhala',
+    'Noto Sans Symbols', 'Noto Sans Tamil', 'Noto Sans TC', 'Noto Sans Telugu',
+    'Noto Sans Thai', 'Noto Sans Tibetan', 'Ubuntu', 'Ubuntu Condensed', 'Ubuntu Mono',
+    'Cantarell', 'C059', 'P052', 'Z003', 'URW Gothic', 'URW Bookman', 'URW Palladio',
+    'Standard Symbols PS', 'D050000L', 'Lohit Devanagari', 'Lohit Gujarati',
+    'Lohit Tamil', 'Gargi', 'Lohit Bengali', 'Tlwg Mono', 'Waree', 'Sawasdee',
+    'Kacst', 'Umpush', 'Norasi', 'Purisa', 'Saab', 'OpenSymbol', 'Bitstream Charter',
+    'Century Schoolbook L', 'Courier 10 Pitch', 'Dingbats', 'Carlito', 'Caladea',
+    'Chilanka', 'Dyuthi', 'Karumbi', 'Keraleeyam', 'Manjari', 'Meera', 'Rachana',
+    'Suruma', 'Uroob', 'Abyssinica SIL', 'Padauk', 'Pothana2000', 'Vemana2000',
+    'Gubbi', 'Navilu', 'Sahadeva', 'Tibetan Machine Uni', 'Khmer OS', 'Phetsarath OT',
+    'Saysettha OT', 'Loma', 'Tlwg Typewriter', 'Tlwg Typist', 'Tlwg Typo',
+    
+    # Google Fonts (commonly embedded)
+    'Roboto', 'Roboto Condensed', 'Roboto Mono', 'Roboto Slab', 'Open Sans',
+    'Open Sans Condensed', 'Lato', 'Montserrat', 'Source Sans Pro', 'Raleway',
+    'PT Sans', 'PT Serif', 'Ubuntu', 'Merriweather', 'Playfair Display', 'Nunito',
+    'Noto Sans', 'Noto Serif', 'Poppins', 'Oswald', 'Slabo 27px', 'Slabo 13px',
+    'Fira Sans', 'Fira Sans Condensed', 'Crimson Text', 'Mukta', 'Titillium Web',
+    'Hind', 'Rubik', 'Work Sans', 'Karla', 'Oxygen', 'Inconsolata', 'Nunito Sans',
+    'Quicksand', 'Yanone Kaffeesatz', 'Arimo', 'Cabin', 'Varela Round', 'Bitter',
+    'Heebo', 'Source Code Pro', 'Fjalla One', 'Dosis', 'Dancing Script', 'Lobster',
+    'Anton', 'Barlow', 'Barlow Condensed', 'Prompt', 'Comfortaa', 'Abel', 'Archivo',
+    'Play', 'Exo 2', 'Josefin Sans', 'Questrial', 'Abril Fatface', 'Cairo', 'Signika',
+    'Maven Pro', 'Libre Franklin', 'Arvo', 'Catamaran', 'Zilla Slab', 'IBM Plex Sans',
+    'IBM Plex Serif', 'IBM Plex Mono', 'Shadows Into Light', 'Pacifico', 'Amatic SC',
+    'Indie Flower', 'Permanent Marker', 'Righteous', 'Fredoka One', 'Bebas Neue',
+    'Alfa Slab One', 'Archivo Black', 'Cinzel', 'Satisfy', 'Cookie', 'Great Vibes',
+    'Architects Daughter', 'Sacramento', 'Courgette', 'Kaushan Script', 'Caveat',
+)
+
+# Each session exposes 55-98% of the font list
+_FONT_MIN = int(len(_ALL_FONTS) * 0.55)
+_FONT_MAX = int(len(_ALL_FONTS) * 0.98)
+
 def generate_random_fonts():
     """
     Generate a random subset of fonts for font fingerprinting
     
     Returns a list of font names
     """
-    # Massively expanded font list with hundreds of options
-    all_fonts = [
-        # Windows common
-        'Arial', 'Arial Black', 'Arial Narrow', 'Calibri', 'Cambria', 'Cambria Math',
-        'Candara', 'Comic Sans MS', 'Consolas', 'Constantia', 'Corbel', 'Courier New',
-        'Ebrima', 'Franklin Gothic Medium', 'Georgia', 'Impact', 'Lucida Console', 
-        'Lucida Sans Unicode', 'Microsoft Sans Serif', 'MS Gothic', 'MS PGothic', 
-        'MS UI Gothic', 'Palatino Linotype', 'Segoe Print', 'Segoe Script', 'Segoe UI', 
-        'Segoe UI Black', 'Segoe UI Historic', 'Segoe UI Emoji', 'Segoe UI Symbol',
-        'Tahoma', 'Times New Roman', 'Trebuchet MS', 'Verdana', 'Webdings', 'Wingdings',
-        'Sylfaen', 'Symbol', 'Marlett', 'Microsoft YaHei', 'Microsoft JhengHei',
-        'Malgun Gothic', 'Leelawadee UI', 'Javanese Text', 'Myanmar Text', 'Nirmala UI',
-        'Gadugi', 'MV Boli', 'Mongolian Baiti', 'Microsoft PhagsPa', 'Microsoft Tai Le',
-        'Microsoft Himalaya', 'Microsoft New Tai Lue', 'Microsoft Yi Baiti', 'Sitka',
-        'Bahnschrift', 'Yu Gothic', 'Yu Gothic UI', 'Yu Mincho', 'HoloLens MDL2 Assets',
-        'Ink Free', 'Gabriola', 'Centaur', 'Century', 'Rockwell', 'Bookman Old Style',
-        'Bradley Hand ITC', 'Californian FB', 'Castellar', 'Chiller', 'Colonna MT',
-        'Cooper Black', 'Copperplate Gothic', 'Curlz MT', 'Edwardian Script ITC',
-        'Engravers MT', 'Felix Titling', 'Forte', 'French Script MT', 'Freestyle Script',
-        'Garamond', 'Gigi', 'Gill Sans MT', 'Gloucester MT', 'Goudy Old Style',
-        'Goudy Stout', 'Haettenschweiler', 'Harlow Solid Italic', 'Harrington',
-        'High Tower Text', 'Imprint MT Shadow', 'Jokerman', 'Juice ITC', 'Kristen ITC',
-        'Kunstler Script', 'Wide Latin', 'Lucida Bright', 'Lucida Calligraphy',
-        'Lucida Fax', 'Lucida Handwriting', 'Lucida Sans', 'Lucida Sans Typewriter',
-        'Magneto', 'Maiandra GD', 'Matura MT Script Capitals', 'Mistral', 'Modern No. 20',
-        'Monotype Corsiva', 'Niagara Engraved', 'Niagara Solid', 'OCR A Extended',
-        'Old English Text MT', 'Onyx', 'Palace Script MT', 'Papyrus', 'Parchment',
-        'Perpetua', 'Perpetua Titling MT', 'Playbill', 'Poor Richard', 'Pristina',
-        'Rage Italic', 'Ravie', 'Rockwell Extra Bold', 'Script MT Bold', 'Showcard Gothic',
-        'Snap ITC', 'Stencil', 'Tempus Sans ITC', 'Tw Cen MT', 'Viner Hand ITC',
-        'Vivaldi', 'Vladimir Script',
-        
-        # macOS common
-        'American Typewriter', 'Andale Mono', 'Apple Chancery', 'Apple Color Emoji',
-        'Apple SD Gothic Neo', 'Apple Symbols', 'AppleGothic', 'AppleMyungjo',
-        'Arial Hebrew', 'Arial Rounded MT Bold', 'Arial Unicode MS', 'Avenir', 
-        'Avenir Next', 'Avenir Next Condensed', 'Baskerville', 'Big Caslon', 
-        'Bodoni 72', 'Bodoni 72 Oldstyle', 'Bodoni 72 Smallcaps', 'Bodoni Ornaments',
-        'Bradley Hand', 'Brush Script MT', 'Chalkboard', 'Chalkboard SE', 'Chalkduster',
-        'Charter', 'Cochin', 'Comic Sans MS', 'Copperplate', 'Courier', 'Courier New',
-        'Damascus', 'Devanagari MT', 'Devanagari Sangam MN', 'Didot', 'DIN Alternate',
-        'DIN Condensed', 'Euphemia UCAS', 'Futura', 'Galvji', 'Geeza Pro', 'Geneva',
-        'Georgia', 'Gill Sans', 'Gujarati MT', 'Gujarati Sangam MN', 'Gurmukhi MN',
-        'Gurmukhi MT', 'Gurmukhi Sangam MN', 'Heiti SC', 'Heiti TC', 'Helvetica',
-        'Helvetica Neue', 'Herculanum', 'Hiragino Maru Gothic Pro', 'Hiragino Mincho ProN',
-        'Hiragino Sans', 'Hiragino Sans GB', 'Hoefler Text', 'Impact', 'Iowan Old Style',
-        'Kailasa', 'Kannada MN', 'Kannada Sangam MN', 'Kefa', 'Khmer MN', 'Khmer Sangam MN',
-        'Kohinoor Bangla', 'Kohinoor Devanagari', 'Kohinoor Gujarati', 'Kohinoor Telugu',
-        'Kokonor', 'Krungthep', 'KufiStandardGK', 'Lao MN', 'Lao Sangam MN', 'Lucida Grande',
-        'Luminari', 'Malayalam MN', 'Malayalam Sangam MN', 'Marion', 'Marker Felt',
-        'Menlo', 'Microsoft Sans Serif', 'Mishafi', 'Monaco', 'Mshtakan', 'Muna',
-        'Myanmar MN', 'Myanmar Sangam MN', 'Nadeem', 'New Peninim MT', 'Noteworthy',
-        'Noto Nastaliq Urdu', 'Optima', 'Oriya MN', 'Oriya Sangam MN', 'Palatino',
-        'Papyrus', 'Party LET', 'Phosphate', 'PingFang HK', 'PingFang SC', 'PingFang TC',
-        'Plantagenet Cherokee', 'PT Mono', 'PT Sans', 'PT Sans Caption', 'PT Sans Narrow',
-        'PT Serif', 'PT Serif Caption', 'Raanana', 'Rockwell', 'Sana', 'Sathu', 'Savoye LET',
-        'Seravek', 'Shree Devanagari 714', 'SignPainter', 'Silom', 'Sinhala MN',
-        'Sinhala Sangam MN', 'Skia', 'Snell Roundhand', 'Songti SC', 'Songti TC',
-        'STFangsong', 'STHeiti', 'STIX Two Math', 'STIX Two Text', 'STIXGeneral',
-        'STIXIntegralsD', 'STIXIntegralsSm', 'STIXIntegralsUp', 'STIXIntegralsUpD',
-        'STIXIntegralsUpSm', 'STIXNonUnicode', 'STIXSizeFiveSym', 'STIXSizeFourSym',
-        'STIXSizeOneSym', 'STIXSizeThreeSym', 'STIXSizeTwoSym', 'STIXVariants', 'STKaiti',
-        'STSong', 'Sukhumvit Set', 'Superclarendon', 'Symbol', 'Tahoma', 'Tamil MN',
-        'Tamil Sangam MN', 'Telugu MN', 'Telugu Sangam MN', 'Thonburi', 'Times',
-        'Times New Roman', 'Trattatello', 'Trebuchet MS', 'Verdana', 'Waseem', 'Webdings',
-        'Wingdings', 'Wingdings 2', 'Wingdings 3', 'Zapf Dingbats', 'Zapfino',
-        'SF Pro Display', 'SF Pro Text', 'SF Pro Rounded', 'SF Mono', 'SF Compact Display',
-        'SF Compact Text', 'SF Compact Rounded', 'New York', 'New York Small', 'New York Medium',
-        'New York Large', 'New York Extra Large', '.AppleSystemUIFont',
-        
-        # Linux common
-        'DejaVu Sans', 'DejaVu Sans Mono', 'DejaVu Serif', 'DejaVu Sans Condensed',
-        'DejaVu Serif Condensed', 'DejaVu Math TeX Gyre', 'Droid Sans', 'Droid Sans Mono',
-        'Droid Serif', 'FreeSans', 'FreeSerif', 'FreeMono', 'Liberation Sans', 
-        'Liberation Sans Narrow', 'Liberation Serif', 'Liberation Mono', 'Nimbus Mono PS',
-        'Nimbus Roman', 'Nimbus Sans', 'Nimbus Sans Narrow', 'Noto Sans', 'Noto Sans CJK',
-        'Noto Sans Mono', 'Noto Serif', 'Noto Serif CJK', 'Noto Color Emoji', 'Noto Emoji',
-        'Noto Sans Arabic', 'Noto Sans Armenian', 'Noto Sans Bengali', 'Noto Sans Cherokee',
-        'Noto Sans Devanagari', 'Noto Sans Ethiopic', 'Noto Sans Georgian', 'Noto Sans Gujarati',
-        'Noto Sans Gurmukhi', 'Noto Sans Hebrew', 'Noto Sans JP', 'Noto Sans KR',
-        'Noto Sans Kannada', 'Noto Sans Khmer', 'Noto Sans Lao', 'Noto Sans Malayalam',
-        'Noto Sans Myanmar', 'Noto Sans Oriya', 'Noto Sans SC', 'Noto Sans Sinhala',
-        'Noto Sans Symbols', 'Noto Sans Tamil', 'Noto Sans TC', 'Noto Sans Telugu',
-        'Noto Sans Thai', 'Noto Sans Tibetan', 'Ubuntu', 'Ubuntu Condensed', 'Ubuntu Mono',
-        'Cantarell', 'C059', 'P052', 'Z003', 'URW Gothic', 'URW Bookman', 'URW Palladio',
-        'Standard Symbols PS', 'D050000L', 'Lohit Devanagari', 'Lohit Gujarati',
-        'Lohit Tamil', 'Gargi', 'Lohit Bengali', 'Tlwg Mono', 'Waree', 'Sawasdee',
-        'Kacst', 'Umpush', 'Norasi', 'Purisa', 'Saab', 'OpenSymbol', 'Bitstream Charter',
-        'Century Schoolbook L', 'Courier 10 Pitch', 'Dingbats', 'Carlito', 'Caladea',
-        'Chilanka', 'Dyuthi', 'Karumbi', 'Keraleeyam', 'Manjari', 'Meera', 'Rachana',
-        'Suruma', 'Uroob', 'Abyssinica SIL', 'Padauk', 'Pothana2000', 'Vemana2000',
-        'Gubbi', 'Navilu', 'Sahadeva', 'Tibetan Machine Uni', 'Khmer OS', 'Phetsarath OT',
-        'Saysettha OT', 'Loma', 'Tlwg Typewriter', 'Tlwg Typist', 'Tlwg Typo',
-        
-        # Google Fonts (commonly embedded)
-        'Roboto', 'Roboto Condensed', 'Roboto Mono', 'Roboto Slab', 'Open Sans',
-        'Open Sans Condensed', 'Lato', 'Montserrat', 'Source Sans Pro', 'Raleway',
-        'PT Sans', 'PT Serif', 'Ubuntu', 'Merriweather', 'Playfair Display', 'Nunito',
-        'Noto Sans', 'Noto Serif', 'Poppins', 'Oswald', 'Slabo 27px', 'Slabo 13px',
-        'Fira Sans', 'Fira Sans Condensed', 'Crimson Text', 'Mukta', 'Titillium Web',
-        'Hind', 'Rubik', 'Work Sans', 'Karla', 'Oxygen', 'Inconsolata', 'Nunito Sans',
-        'Quicksand', 'Yanone Kaffeesatz', 'Arimo', 'Cabin', 'Varela Round', 'Bitter',
-        'Heebo', 'Source Code Pro', 'Fjalla One', 'Dosis', 'Dancing Script', 'Lobster',
-        'Anton', 'Barlow', 'Barlow Condensed', 'Prompt', 'Comfortaa', 'Abel', 'Archivo',
-        'Play', 'Exo 2', 'Josefin Sans', 'Questrial', 'Abril Fatface', 'Cairo', 'Signika',
-        'Maven Pro', 'Libre Franklin', 'Arvo', 'Catamaran', 'Zilla Slab', 'IBM Plex Sans',
-        'IBM Plex Serif', 'IBM Plex Mono', 'Shadows Into Light', 'Pacifico', 'Amatic SC',
-        'Indie Flower', 'Permanent Marker', 'Righteous', 'Fredoka One', 'Bebas Neue',
-        'Alfa Slab One', 'Archivo Black', 'Cinzel', 'Satisfy', 'Cookie', 'Great Vibes',
-        'Architects Daughter', 'Sacramento', 'Courgette', 'Kaushan Script', 'Caveat',
+    # Randomly include 55-98% of fonts (simulating different OS/installations/embeddings)
+    num_fonts = random.randint(_FONT_MIN, _FONT_MAX)
+    return random.sample(_ALL_FONTS, num_fonts)
+
+def generate_random_fonts_batch(n):
+    """
+    Generate n independent font subsets at once (used when filling fingerprint pools)
+    
+    Args:
+        n: Number of font lists to generate
+    
+    Returns:
+        List of n font-name lists, same distribution as generate_random_fonts()
+    """
+    if n <= 0:
+        return []
+    rng = np.random.default_rng()
+    # argsort of uniform keys gives n independent random permutations in one call
+    orders = np.argsort(rng.random((n, len(_ALL_FONTS))), axis=1)
+    counts = rng.integers(_FONT_MIN, _FONT_MAX + 1, size=n)
+    return [
+        [_ALL_FONTS[i] for i in order[:count].tolist()]
+        for order, count in zip(orders, counts)
     ]
+
+# PDF plugin variations (CRITICAL fingerprinting vector - always present but highly varied)
+# Format: (name, filename options, description options, ((mime type, suffixes), ...))
+_PDF_PLUGIN_SPECS = (
+    # Chrome variations
+    ('Chrome PDF Plugin', ('internal-pdf-viewer',), ('Portable Document Format',),
+     (('application/x-google-chrome-pdf', 'pdf'),)),
+    ('Chrome PDF Viewer', ('mhjfbmdgcfjbbpaeojofohoefgiehjai',), ('', 'Portable Document Format', 'PDF Viewer'),
+     (('application/pdf', 'pdf'),)),
+    ('Chromium PDF Viewer', ('internal-pdf-viewer',), ('Portable Document Format',),
+     (('application/pdf', 'pdf'),)),
+    # Edge variations
+    ('Microsoft Edge PDF Viewer', ('edge-pdf-viewer',), ('Portable Document Format',),
+     (('application/pdf', 'pdf'),)),
+    # Firefox variations
+    ('PDF.js', ('pdf.js',), ('Portable Document Format',),
+     (('application/pdf', 'pdf'),)),
+)
+
+# Additional plugin types (present on some systems)
+_OPTIONAL_PLUGIN_SPECS = (
+    # Native Client (Chrome)
+    ('Native Client', ('internal-nacl-plugin',), ('Native Client Executable',),
+     (('application/x-nacl', ''), ('application/x-pnacl', ''))),
+    # Widevine (DRM - very common)
+    ('Widevine Content Decryption Module', ('widevinecdmadapter.dll', 'widevinecdm', 'libwidevinecdm.so'),
+     ('Enables Widevine licenses for playback of HTML audio/video content.',),
+     (('application/x-ppapi-widevine-cdm', ''),)),
+    # Shockwave Flash (legacy, but still on some systems)
+    ('Shockwave Flash', ('pepflashplayer.dll', 'libpepflashplayer.so', 'PepperFlashPlayer.plugin'), ('Shockwave Flash',),
+     (('application/x-shockwave-flash', 'swf'),)),
+    # Java (legacy)
+    ('Java Deployment Toolkit', ('npdeployJava1.dll', 'libnpjp2.so'),
+     ('Java Deployment Toolkit', 'NPRuntime Script Plug-in Library for Java'),
+     (('application/java-deployment-toolkit', ''),)),
+    # Chrome Remote Desktop
+    ('Chrome Remote Desktop Viewer', ('remoting-host',), ('Chrome Remote Desktop',),
+     (('application/vnd.chromium.remoting-viewer', ''),)),
+    # Microsoft Silverlight (legacy)
+    ('Silverlight Plug-In', ('npctrl.dll', 'libSilverlight.so'), ('Silverlight Plug-In',),
+     (('application/x-silverlight', 'xap'),)),
+)
+
+def _build_plugin_template(name, filenames, descriptions, mime_types):
+    """
+    Serialize one plugin spec to a JSON object template
     
-    # Randomly include 55-98% of fonts (simulating different OS/installations/embeddings)
-    num_fonts = random.randint(int(len(all_fonts) * 0.55), int(len(all_fonts) * 0.98))
-    return random.sample(all_fonts, num_fonts)
+    Fields with a single option are filled in at import. Only fields with several
+    options are left as $filename / $description holes, so a call only draws
+    for the plugins it actually selected and the fields that actually vary.
+    
+    Returns:
+        (template, varying) where varying is ((field, JSON-escaped options), ...).
+        template is the final JSON string when nothing varies, else a string.Template.
+    """
+    plugin = {
+        str(j): {'type': mime_type, 'suffixes': suffixes, 'description': '$description'}
+        for j, (mime_type, suffixes) in enumerate(mime_types)
+    }
+    plugin.update(description='$description', filename='$filename', length=len(mime_types), name=name)
+    template = string.Template(json.dumps(plugin, separators=(',', ':')))
+    
+    options = {
+        'filename': tuple(json.dumps(f)[1:-1] for f in filenames),
+        'description': tuple(json.dumps(d)[1:-1] for d in descriptions),
+    }
+    fixed = {field: values[0] for field, values in options.items() if len(values) == 1}
+    varying = tuple((field, values) for field, values in options.items() if len(values) > 1)
+    if not varying:
+        return template.substitute(fixed), varying
+    return string.Template(template.safe_substitute(fixed)), varying
+
+_PDF_PLUGINS = {spec[0]: _build_plugin_template(*spec) for spec in _PDF_PLUGIN_SPECS}
+_OPTIONAL_PLUGINS = tuple(_build_plugin_template(*spec) for spec in _OPTIONAL_PLUGIN_SPECS)
+
+# Browser-specific PDF plugin candidates
+_PDF_CANDIDATES = {
+    # Firefox primarily uses PDF.js
+    'firefox': tuple(t for name, t in _PDF_PLUGINS.items() if 'PDF.js' in name or 'Firefox' in name),
+    # Edge has its own PDF viewer and Chrome-based ones
+    'edge': tuple(t for name, t in _PDF_PLUGINS.items() if 'Edge' in name or 'Chrome' in name),
+    # Chromium uses open-source PDF viewers
+    'chromium': tuple(t for name, t in _PDF_PLUGINS.items() if 'Chromium' in name or 'Chrome PDF Plugin' in name),
+    # Chrome has various PDF plugins
+    'chrome': tuple(t for name, t in _PDF_PLUGINS.items() if 'Chrome' in name),
+}
+
+# Optional plugin count distribution (0:3, 1:2, 2:1, 3:1)
+_OPTIONAL_PLUGIN_COUNTS = (0, 1, 2, 3)
+_OPTIONAL_PLUGIN_COUNT_CUM_WEIGHTS = (3, 5, 6, 7)
 
 def generate_random_plugins(browser_type='chrome'):
     """
@@ -1745,7 +1877,7 @@ def generate_random_plugins(browser_type='chrome'):
     Args:
         browser_type: Browser type (chrome/firefox/edge/chromium) for realistic plugin lists
     
-    Returns a JavaScript-ready string representation of plugins array
+    Returns a JSON string of the plugins array (also a valid JavaScript literal)
     PDF plugins are heavily randomized as they're major fingerprinting vectors
     
     30% chance of no plugins (privacy-conscious users)
@@ -1757,159 +1889,46 @@ def generate_random_plugins(browser_type='chrome'):
     if random.random() < 0.3:
         return '[]'
     
-    plugins = []
-    
-    # PDF Plugin variations (CRITICAL fingerprinting vector - always present but highly varied)
-    pdf_plugins = [
-        # Chrome variations
-        {
-            'name': 'Chrome PDF Plugin',
-            'filename': 'internal-pdf-viewer',
-            'description': 'Portable Document Format',
-            'version': random.choice(['1.0', '1.1', '1.15', '2.0', '2.1']),
-            'mimeTypes': [{'type': 'application/x-google-chrome-pdf', 'suffixes': 'pdf'}]
-        },
-        {
-            'name': 'Chrome PDF Viewer',
-            'filename': f'mhjfbmdgcfjbbpaeojofohoefgiehjai',
-            'description': random.choice(['', 'Portable Document Format', 'PDF Viewer']),
-            'version': random.choice(['1.0', '1.2', '1.5', '2.0']),
-            'mimeTypes': [{'type': 'application/pdf', 'suffixes': 'pdf'}]
-        },
-        {
-            'name': 'Chromium PDF Viewer',
-            'filename': 'internal-pdf-viewer',
-            'description': 'Portable Document Format',
-            'version': random.choice(['1.0', '1.1', '2.0']),
-            'mimeTypes': [{'type': 'application/pdf', 'suffixes': 'pdf'}]
-        },
-        # Edge variations  
-        {
-            'name': 'Microsoft Edge PDF Viewer',
-            'filename': 'edge-pdf-viewer',
-            'description': 'Portable Document Format',
-            'version': random.choice(['1.0', '1.1', '1.2']),
-            'mimeTypes': [{'type': 'application/pdf', 'suffixes': 'pdf'}]
-        },
-        # Firefox variations
-        {
-            'name': 'PDF.js',
-            'filename': 'pdf.js',
-            'description': 'Portable Document Format',
-            'version': random.choice(['2.14.305', '2.16.105', '3.0.279', '3.1.81', '3.2.146', '3.3.122', '3.4.120']),
-            'mimeTypes': [{'type': 'application/pdf', 'suffixes': 'pdf'}]
-        },
-    ]
-    
-    # Browser-specific PDF plugin selection
-    if browser_type == 'firefox':
-        # Firefox primarily uses PDF.js
-        pdf_candidates = [p for p in pdf_plugins if 'PDF.js' in p['name'] or 'Firefox' in p['name']]
-        if not pdf_candidates:
-            pdf_candidates = [pdf_plugins[4]]  # PDF.js
-    elif browser_type == 'edge':
-        # Edge has its own PDF viewer and Chrome-based ones
-        pdf_candidates = [p for p in pdf_plugins if 'Edge' in p['name'] or 'Chrome' in p['name']]
-    elif browser_type == 'chromium':
-        # Chromium uses open-source PDF viewers
-        pdf_candidates = [p for p in pdf_plugins if 'Chromium' in p['name'] or 'Chrome PDF Plugin' in p['name']]
-    else:  # chrome
-        # Chrome has various PDF plugins
-        pdf_candidates = [p for p in pdf_plugins if 'Chrome' in p['name']]
+    pdf_candidates = _PDF_CANDIDATES.get(browser_type, _PDF_CANDIDATES['chrome'])
     
     # Add 1-2 PDF plugins (or 0 if 50% partial plugin mode)
     pdf_chance = random.random()
     if pdf_chance < 0.2:  # 20% - full plugins
-        num_pdf = random.choice([1, 2])
+        num_pdf = random.choice((1, 2))
     elif pdf_chance < 0.7:  # 50% - partial plugins (1 or 0)
-        num_pdf = random.choice([0, 1, 1])
+        num_pdf = random.choice((0, 1, 1))
     else:  # 30% already handled above (no plugins at all)
         num_pdf = 1
     
-    for _ in range(num_pdf):
-        if pdf_candidates:
-            plugins.append(random.choice(pdf_candidates))
-    
-    # Additional plugin types (present on some systems)
-    optional_plugins = [
-        # Native Client (Chrome)
-        {
-            'name': 'Native Client',
-            'filename': 'internal-nacl-plugin',
-            'description': 'Native Client Executable',
-            'version': random.choice(['1.0', '1.0.0', '']),
-            'mimeTypes': [
-                {'type': 'application/x-nacl', 'suffixes': ''},
-                {'type': 'application/x-pnacl', 'suffixes': ''}
-            ]
-        },
-        # Widevine (DRM - very common)
-        {
-            'name': 'Widevine Content Decryption Module',
-            'filename': random.choice(['widevinecdmadapter.dll', 'widevinecdm', 'libwidevinecdm.so']),
-            'description': 'Enables Widevine licenses for playback of HTML audio/video content.',
-            'version': random.choice(['4.10.2209.1', '4.10.2391.0', '4.10.2440.0', '4.10.2449.0', '4.10.2557.0']),
-            'mimeTypes': [{'type': 'application/x-ppapi-widevine-cdm', 'suffixes': ''}]
-        },
-        # Shockwave Flash (legacy, but still on some systems)
-        {
-            'name': 'Shockwave Flash',
-            'filename': random.choice(['pepflashplayer.dll', 'libpepflashplayer.so', 'PepperFlashPlayer.plugin']),
-            'description': 'Shockwave Flash',
-            'version': random.choice(['32.0.0.465', '32.0.0.453', '32.0.0.445', '32.0.0.438', '32.0.0.371']),
-            'mimeTypes': [{'type': 'application/x-shockwave-flash', 'suffixes': 'swf'}]
-        },
-        # Java (legacy)
-        {
-            'name': 'Java Deployment Toolkit',
-            'filename': random.choice(['npdeployJava1.dll', 'libnpjp2.so']),
-            'description': random.choice(['Java Deployment Toolkit', 'NPRuntime Script Plug-in Library for Java']),
-            'version': random.choice(['11.0.1', '11.0.2', '11.0.11', '1.8.0_311', '1.8.0_301']),
-            'mimeTypes': [{'type': 'application/java-deployment-toolkit', 'suffixes': ''}]
-        },
-        # Chrome Remote Desktop
-        {
-            'name': 'Chrome Remote Desktop Viewer',
-            'filename': 'remoting-host',
-            'description': 'Chrome Remote Desktop',
-            'version': random.choice(['1.0', '2.0', '']),
-            'mimeTypes': [{'type': 'application/vnd.chromium.remoting-viewer', 'suffixes': ''}]
-        },
-        # Microsoft Silverlight (legacy)
-        {
-            'name': 'Silverlight Plug-In',
-            'filename': random.choice(['npctrl.dll', 'libSilverlight.so']),
-            'description': 'Silverlight Plug-In',
-            'version': random.choice(['5.1.50918.0', '5.1.50907.0', '5.1.50901.0']),
-            'mimeTypes': [{'type': 'application/x-silverlight', 'suffixes': 'xap'}]
-        },
-    ]
+    plugins = [random.choice(pdf_candidates) for _ in range(num_pdf)]
     
     # Randomly add 0-3 optional plugins
-    num_optional = random.choice([0, 0, 0, 1, 1, 2, 3])
+    num_optional = random.choices(_OPTIONAL_PLUGIN_COUNTS, cum_weights=_OPTIONAL_PLUGIN_COUNT_CUM_WEIGHTS)[0]
     if num_optional > 0:
-        selected = random.sample(optional_plugins, min(num_optional, len(optional_plugins)))
-        plugins.extend(selected)
-    
-    # Build JavaScript array representation
-    js_plugins = []
-    for i, plugin in enumerate(plugins):
-        mime_objs = []
-        for j, mime in enumerate(plugin['mimeTypes']):
-            mime_objs.append(f"{j}: {{type: '{mime['type']}', suffixes: '{mime['suffixes']}', description: '{plugin['description']}'}}") 
-        
-        mime_str = ', '.join(mime_objs)
-        
-        js_plugin = f'''{{
-            {mime_str},
-            description: '{plugin['description']}',
-            filename: '{plugin['filename']}',
-            length: {len(plugin['mimeTypes'])},
-            name: '{plugin['name']}'
-        }}'''
-        js_plugins.append(js_plugin)
-    
-    return '[' + ','.join(js_plugins) + ']'
+        plugins.extend(random.sample(_OPTIONAL_PLUGINS, num_optional))
+    
+    # Build the JSON array from the pre-serialized templates, resolving the
+    # randomized fields of the selected plugins only
+    return '[' + ','.join(
+        template.substitute({field: random.choice(values) for field, values in varying}) if varying else template
+        for template, varying in plugins
+    ) + ']'
+
+# Local IP count distribution (cumulative weights over _DEVICE_COUNTS, 3:2:1)
+_LOCAL_IP_COUNT_CUM_WEIGHTS = (3, 5, 6)
+
+# Common private IP ranges (one generator per pattern, created once)
+_LOCAL_IP_PATTERNS = (
+    # 192.168.x.x (most common home networks)
+    lambda: f"192.168.{random.randint(0, 255)}.{random.randint(2, 254)}",
+    lambda: f"192.168.1.{random.randint(2, 254)}",
+    lambda: f"192.168.0.{random.randint(2, 254)}",
+    # 10.x.x.x (large networks, VPNs)
+    lambda: f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(2, 254)}",
+    lambda: f"10.0.{random.randint(0, 255)}.{random.randint(2, 254)}",
+    # 172.16-31.x.x (corporate networks)
+    lambda: f"172.{random.randint(16, 31)}.{random.randint(0, 255)}.{random.randint(2, 254)}",
+)
 
 def generate_random_webrtc():
     """
@@ -1917,24 +1936,11 @@ def generate_random_webrtc():
     
     Returns a dict with realistic local IPs
     """
-    # Common private IP ranges
-    ip_patterns = [
-        # 192.168.x.x (most common home networks)
-        lambda: f"192.168.{random.randint(0, 255)}.{random.randint(2, 254)}",
-        lambda: f"192.168.1.{random.randint(2, 254)}",
-        lambda: f"192.168.0.{random.randint(2, 254)}",
-        # 10.x.x.x (large networks, VPNs)
-        lambda: f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(2, 254)}",
-        lambda: f"10.0.{random.randint(0, 255)}.{random.randint(2, 254)}",
-        # 172.16-31.x.x (corporate networks)
-        lambda: f"172.{random.randint(16, 31)}.{random.randint(0, 255)}.{random.randint(2, 254)}",
-    ]
-    
     # Generate 1-3 local IPs (most devices have 1-2)
-    num_ips = random.choice([1, 1, 1, 2, 2, 3])
+    num_ips = random.choices(_DEVICE_COUNTS, cum_weights=_LOCAL_IP_COUNT_CUM_WEIGHTS)[0]
     local_ips = []
     for _ in range(num_ips):
-        ip_gen = random.choice(ip_patterns)
+        ip_gen = random.choice(_LOCAL_IP_PATTERNS)
         local_ips.append(ip_gen())
     
     # IPv6 addresses (some systems have these)
@@ -1949,274 +1955,269 @@ def generate_random_webrtc():
         'publicIP': f"{random.randint(1, 223)}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
     }
 
-def generate_random_gpu():
+class GPUFingerprint(NamedTuple):
+    """WebGL vendor/renderer pair reported by the spoofed GPU"""
+    vendor: str
+    renderer: str
+    isMultiGPU: bool
+
+
+# Massively expanded GPU configurations (vendor, renderer, is_discrete, weight)
+_GPU_CONFIGS = (
+    # Intel integrated graphics (most common) - HIGH WEIGHT
+    ("Intel Inc.", "Intel Iris OpenGL Engine", False, 15),
+    ("Intel Inc.", "Intel(R) UHD Graphics 630", False, 20),
+    ("Intel Inc.", "Intel(R) UHD Graphics 620", False, 18),
+    ("Intel Inc.", "Intel(R) HD Graphics 620", False, 15),
+    ("Intel Inc.", "Intel(R) HD Graphics 630", False, 12),
+    ("Intel Inc.", "Intel(R) HD Graphics 530", False, 10),
+    ("Intel Inc.", "Intel(R) HD Graphics 520", False, 8),
+    ("Intel Inc.", "Intel(R) Iris(R) Plus Graphics 640", False, 8),
+    ("Intel Inc.", "Intel(R) Iris(R) Plus Graphics 655", False, 8),
+    ("Intel Inc.", "Intel(R) Iris(R) Xe Graphics", False, 12),
+    ("Intel Inc.", "Intel(R) UHD Graphics 770", False, 10),
+    ("Intel Inc.", "Intel(R) UHD Graphics 730", False, 8),
+    ("Intel Inc.", "Intel(R) Arc(TM) A770 Graphics", False, 3),
+    ("Intel Inc.", "Intel(R) Arc(TM) A750 Graphics", False, 2),
+    ("Intel Inc.", "Mesa Intel(R) UHD Graphics 620 (KBL GT2)", False, 8),
+    ("Intel Inc.", "Mesa Intel(R) HD Graphics 630 (KBL GT2)", False, 8),
+    ("Intel Inc.", "Mesa Intel(R) UHD Graphics (CML GT2)", False, 6),
+    ("Intel", "Intel(R) HD Graphics 4000", False, 5),
+    ("Intel", "Intel(R) HD Graphics 5500", False, 6),
+    ("Intel", "Intel(R) HD Graphics 4600", False, 5),
+    ("Intel", "Intel(R) HD Graphics 3000", False, 3),
+    ("Intel", "Intel(R) Iris(TM) Graphics 5100", False, 4),
+    ("Intel", "Intel(R) Iris(TM) Graphics 6100", False, 4),
+    
+    # NVIDIA (gaming/professional) - MEDIUM-HIGH WEIGHT
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 1650/PCIe/SSE2", True, 12),
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 1050/PCIe/SSE2", True, 10),
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 1050 Ti/PCIe/SSE2", True, 10),
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 1060/PCIe/SSE2", True, 12),
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 1660/PCIe/SSE2", True, 10),
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 1660 Ti/PCIe/SSE2", True, 12),
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 1660 SUPER/PCIe/SSE2", True, 8),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 2060/PCIe/SSE2", True, 10),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 2070/PCIe/SSE2", True, 8),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 2080/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 3050/PCIe/SSE2", True, 10),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 3060/PCIe/SSE2", True, 12),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 3060 Ti/PCIe/SSE2", True, 10),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 3070/PCIe/SSE2", True, 10),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 3070 Ti/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 3080/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 4060/PCIe/SSE2", True, 8),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 4060 Ti/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 4070/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 4080/PCIe/SSE2", True, 4),
+    ("NVIDIA Corporation", "NVIDIA GeForce RTX 4090/PCIe/SSE2", True, 3),
+    ("NVIDIA Corporation", "GeForce GTX 960/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "GeForce GTX 970/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "GeForce GTX 980/PCIe/SSE2", True, 4),
+    ("NVIDIA Corporation", "GeForce GTX 1070/PCIe/SSE2", True, 8),
+    ("NVIDIA Corporation", "GeForce GTX 1080/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "GeForce GTX 1080 Ti/PCIe/SSE2", True, 5),
+    ("NVIDIA Corporation", "GeForce MX150/PCIe/SSE2", True, 8),
+    ("NVIDIA Corporation", "GeForce MX250/PCIe/SSE2", True, 8),
+    ("NVIDIA Corporation", "GeForce MX350/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "GeForce MX450/PCIe/SSE2", True, 6),
+    ("NVIDIA Corporation", "GeForce GT 1030/PCIe/SSE2", True, 5),
+    ("NVIDIA Corporation", "GeForce GT 730/PCIe/SSE2", True, 4),
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 750 Ti/PCIe/SSE2", True, 4),
+    ("NVIDIA Corporation", "NVIDIA GeForce GTX 950/PCIe/SSE2", True, 4),
+    ("NVIDIA Corporation", "NVIDIA T400/PCIe/SSE2", True, 3),
+    ("NVIDIA Corporation", "NVIDIA T1000/PCIe/SSE2", True, 3),
+    ("NVIDIA Corporation", "Quadro P1000/PCIe/SSE2", True, 3),
+    ("NVIDIA Corporation", "Quadro P2000/PCIe/SSE2", True, 2),
+    
+    # AMD Radeon - MEDIUM WEIGHT
+    ("AMD", "AMD Radeon(TM) Graphics", False, 15),
+    ("AMD", "AMD Radeon(TM) Vega 8 Graphics", False, 12),
+    ("AMD", "AMD Radeon(TM) Vega 10 Graphics", False, 10),
+    ("AMD", "AMD Radeon(TM) Vega 11 Graphics", False, 8),
+    ("AMD", "AMD Radeon(TM) RX Vega 10 Graphics", False, 8),
+    ("AMD", "AMD Radeon RX 580 Series", True, 10),
+    ("AMD", "AMD Radeon RX 570 Series", True, 8),
+    ("AMD", "AMD Radeon RX 5500 XT", True, 8),
+    ("AMD", "AMD Radeon RX 5600 XT", True, 8),
+    ("AMD", "AMD Radeon RX 5700", True, 8),
+    ("AMD", "AMD Radeon RX 5700 XT", True, 8),
+    ("AMD", "AMD Radeon RX 6600", True, 8),
+    ("AMD", "AMD Radeon RX 6600 XT", True, 8),
+    ("AMD", "AMD Radeon RX 6700 XT", True, 8),
+    ("AMD", "AMD Radeon RX 6800", True, 6),
+    ("AMD", "AMD Radeon RX 6800 XT", True, 5),
+    ("AMD", "AMD Radeon RX 6900 XT", True, 4),
+    ("AMD", "AMD Radeon RX 7600", True, 6),
+    ("AMD", "AMD Radeon RX 7700 XT", True, 5),
+    ("AMD", "AMD Radeon RX 7800 XT", True, 4),
+    ("AMD", "AMD Radeon RX 7900 XT", True, 3),
+    ("AMD", "AMD Radeon RX 7900 XTX", True, 3),
+    ("AMD", "AMD Radeon RX 480", True, 6),
+    ("AMD", "AMD Radeon RX 470", True, 5),
+    ("AMD", "AMD Radeon(TM) 780M", False, 6),
+    ("AMD", "AMD Radeon(TM) 680M", False, 5),
+    ("AMD", "AMD Radeon(TM) 660M", False, 5),
+    ("ATI Technologies Inc.", "AMD Radeon HD 7900 Series", True, 3),
+    ("ATI Technologies Inc.", "AMD Radeon R9 200 Series", True, 3),
+    ("ATI Technologies Inc.", "AMD Radeon R9 380 Series", True, 3),
+    ("ATI Technologies Inc.", "AMD Radeon HD 7700 Series", True, 2),
+    
+    # Apple Silicon (Mac) - MEDIUM WEIGHT
+    ("Apple", "Apple M1", False, 12),
+    ("Apple", "Apple M2", False, 10),
+    ("Apple", "Apple M3", False, 8),
+    ("Apple", "Apple M1 Pro", False, 8),
+    ("Apple", "Apple M1 Max", False, 6),
+    ("Apple", "Apple M1 Ultra", False, 3),
+    ("Apple", "Apple M2 Pro", False, 6),
+    ("Apple", "Apple M2 Max", False, 5),
+    ("Apple", "Apple M2 Ultra", False, 2),
+    ("Apple", "Apple M3 Pro", False, 5),
+    ("Apple", "Apple M3 Max", False, 4),
+    ("Apple", "AMD Radeon Pro 5500M", True, 4),
+    ("Apple", "AMD Radeon Pro 560X", True, 3),
+    ("Apple", "AMD Radeon Pro 5300M", True, 3),
+    ("Apple", "AMD Radeon Pro 5600M", True, 3),
+    ("Apple", "AMD Radeon Pro Vega 20", True, 2),
+    
+    # Generic/ANGLE (Chrome on Windows) - HIGH WEIGHT
+    ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) UHD Graphics 630 Direct3D11 vs_5_0 ps_5_0)", False, 15),
+    ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) HD Graphics 620 Direct3D11 vs_5_0 ps_5_0)", False, 12),
+    ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) UHD Graphics 620 Direct3D11 vs_5_0 ps_5_0)", False, 12),
+    ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) Iris(R) Xe Graphics Direct3D11 vs_5_0 ps_5_0)", False, 10),
+    ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce GTX 1660 Ti Direct3D11 vs_5_0 ps_5_0)", True, 10),
+    ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce RTX 3060 Direct3D11 vs_5_0 ps_5_0)", True, 10),
+    ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce RTX 3070 Direct3D11 vs_5_0 ps_5_0)", True, 8),
+    ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce GTX 1650 Direct3D11 vs_5_0 ps_5_0)", True, 10),
+    ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce GTX 1050 Ti Direct3D11 vs_5_0 ps_5_0)", True, 8),
+    ("Google Inc. (AMD)", "ANGLE (AMD, AMD Radeon(TM) Graphics Direct3D11 vs_5_0 ps_5_0)", False, 12),
+    ("Google Inc. (AMD)", "ANGLE (AMD, AMD Radeon RX 580 Series Direct3D11 vs_5_0 ps_5_0)", True, 8),
+    ("Google Inc. (AMD)", "ANGLE (AMD, AMD Radeon RX 6700 XT Direct3D11 vs_5_0 ps_5_0)", True, 6),
+    
+    # Mesa (Linux) - MEDIUM WEIGHT
+    ("Mesa/X.org", "Mesa DRI Intel(R) HD Graphics 620 (KBL GT2)", False, 8),
+    ("Mesa/X.org", "Mesa DRI Intel(R) UHD Graphics 630 (KBL GT2)", False, 8),
+    ("Mesa/X.org", "Mesa DRI Intel(R) Iris(R) Xe Graphics (TGL GT2)", False, 6),
+    ("X.Org", "AMD Radeon RX 580 Series (polaris10, LLVM 15.0.0, DRM 3.42, 5.15.0)", True, 6),
+    ("X.Org", "AMD Radeon RX 5700 (navi10, LLVM 15.0.0, DRM 3.42, 5.15.0)", True, 5),
+    ("X.Org", "AMD Radeon RX 6700 XT (navi22, LLVM 15.0.0, DRM 3.42, 5.15.0)", True, 4),
+    ("Mesa", "Mesa Intel(R) UHD Graphics (CML GT2)", False, 6),
+    ("Mesa", "Mesa Intel(R) Graphics (RPL-S)", False, 5),
+    ("nouveau", "NV138", True, 3),
+    ("nouveau", "NV137", True, 2),
+    
+    # Qualcomm (mobile/ARM laptops) - LOW WEIGHT
+    ("Qualcomm", "Adreno (TM) 640", False, 3),
+    ("Qualcomm", "Adreno (TM) 650", False, 3),
+    ("Qualcomm", "Adreno (TM) 730", False, 4),
+    ("Qualcomm", "Adreno (TM) 740", False, 3),
+    ("Qualcomm", "Adreno (TM) 680", False, 3),
+)
+
+_GPU_CHOICES = tuple((vendor, renderer, is_discrete) for vendor, renderer, is_discrete, _ in _GPU_CONFIGS)
+_GPU_CUM_WEIGHTS = tuple(itertools.accumulate(weight for *_, weight in _GPU_CONFIGS))
+
+def generate_random_gpu(_choices=random.choices, _random=random.random):
     """
     Generate random GPU vendor and renderer strings for WebGL fingerprinting
     Supports multi-GPU configurations (integrated + discrete)
     
-    Returns a dict with:
+    Returns a GPUFingerprint with:
     - vendor: GPU vendor string (parameter 37445)
     - renderer: GPU renderer string (parameter 37446)
     - isMultiGPU: whether this is a multi-GPU system
     """
-    
-    # Massively expanded GPU configurations (vendor, renderer, is_discrete, weight)
-    gpu_configs = [
-        # Intel integrated graphics (most common) - HIGH WEIGHT
-        ("Intel Inc.", "Intel Iris OpenGL Engine", False, 15),
-        ("Intel Inc.", "Intel(R) UHD Graphics 630", False, 20),
-        ("Intel Inc.", "Intel(R) UHD Graphics 620", False, 18),
-        ("Intel Inc.", "Intel(R) HD Graphics 620", False, 15),
-        ("Intel Inc.", "Intel(R) HD Graphics 630", False, 12),
-        ("Intel Inc.", "Intel(R) HD Graphics 530", False, 10),
-        ("Intel Inc.", "Intel(R) HD Graphics 520", False, 8),
-        ("Intel Inc.", "Intel(R) Iris(R) Plus Graphics 640", False, 8),
-        ("Intel Inc.", "Intel(R) Iris(R) Plus Graphics 655", False, 8),
-        ("Intel Inc.", "Intel(R) Iris(R) Xe Graphics", False, 12),
-        ("Intel Inc.", "Intel(R) UHD Graphics 770", False, 10),
-        ("Intel Inc.", "Intel(R) UHD Graphics 730", False, 8),
-        ("Intel Inc.", "Intel(R) Arc(TM) A770 Graphics", False, 3),
-        ("Intel Inc.", "Intel(R) Arc(TM) A750 Graphics", False, 2),
-        ("Intel Inc.", "Mesa Intel(R) UHD Graphics 620 (KBL GT2)", False, 8),
-        ("Intel Inc.", "Mesa Intel(R) HD Graphics 630 (KBL GT2)", False, 8),
-        ("Intel Inc.", "Mesa Intel(R) UHD Graphics (CML GT2)", False, 6),
-        ("Intel", "Intel(R) HD Graphics 4000", False, 5),
-        ("Intel", "Intel(R) HD Graphics 5500", False, 6),
-        ("Intel", "Intel(R) HD Graphics 4600", False, 5),
-        ("Intel", "Intel(R) HD Graphics 3000", False, 3),
-        ("Intel", "Intel(R) Iris(TM) Graphics 5100", False, 4),
-        ("Intel", "Intel(R) Iris(TM) Graphics 6100", False, 4),
-        
-        # NVIDIA (gaming/professional) - MEDIUM-HIGH WEIGHT
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 1650/PCIe/SSE2", True, 12),
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 1050/PCIe/SSE2", True, 10),
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 1050 Ti/PCIe/SSE2", True, 10),
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 1060/PCIe/SSE2", True, 12),
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 1660/PCIe/SSE2", True, 10),
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 1660 Ti/PCIe/SSE2", True, 12),
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 1660 SUPER/PCIe/SSE2", True, 8),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 2060/PCIe/SSE2", True, 10),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 2070/PCIe/SSE2", True, 8),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 2080/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 3050/PCIe/SSE2", True, 10),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 3060/PCIe/SSE2", True, 12),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 3060 Ti/PCIe/SSE2", True, 10),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 3070/PCIe/SSE2", True, 10),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 3070 Ti/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 3080/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 4060/PCIe/SSE2", True, 8),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 4060 Ti/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 4070/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 4080/PCIe/SSE2", True, 4),
-        ("NVIDIA Corporation", "NVIDIA GeForce RTX 4090/PCIe/SSE2", True, 3),
-        ("NVIDIA Corporation", "GeForce GTX 960/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "GeForce GTX 970/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "GeForce GTX 980/PCIe/SSE2", True, 4),
-        ("NVIDIA Corporation", "GeForce GTX 1070/PCIe/SSE2", True, 8),
-        ("NVIDIA Corporation", "GeForce GTX 1080/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "GeForce GTX 1080 Ti/PCIe/SSE2", True, 5),
-        ("NVIDIA Corporation", "GeForce MX150/PCIe/SSE2", True, 8),
-        ("NVIDIA Corporation", "GeForce MX250/PCIe/SSE2", True, 8),
-        ("NVIDIA Corporation", "GeForce MX350/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "GeForce MX450/PCIe/SSE2", True, 6),
-        ("NVIDIA Corporation", "GeForce GT 1030/PCIe/SSE2", True, 5),
-        ("NVIDIA Corporation", "GeForce GT 730/PCIe/SSE2", True, 4),
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 750 Ti/PCIe/SSE2", True, 4),
-        ("NVIDIA Corporation", "NVIDIA GeForce GTX 950/PCIe/SSE2", True, 4),
-        ("NVIDIA Corporation", "NVIDIA T400/PCIe/SSE2", True, 3),
-        ("NVIDIA Corporation", "NVIDIA T1000/PCIe/SSE2", True, 3),
-        ("NVIDIA Corporation", "Quadro P1000/PCIe/SSE2", True, 3),
-        ("NVIDIA Corporation", "Quadro P2000/PCIe/SSE2", True, 2),
-        
-        # AMD Radeon - MEDIUM WEIGHT
-        ("AMD", "AMD Radeon(TM) Graphics", False, 15),
-        ("AMD", "AMD Radeon(TM) Vega 8 Graphics", False, 12),
-        ("AMD", "AMD Radeon(TM) Vega 10 Graphics", False, 10),
-        ("AMD", "AMD Radeon(TM) Vega 11 Graphics", False, 8),
-        ("AMD", "AMD Radeon(TM) RX Vega 10 Graphics", False, 8),
-        ("AMD", "AMD Radeon RX 580 Series", True, 10),
-        ("AMD", "AMD Radeon RX 570 Series", True, 8),
-        ("AMD", "AMD Radeon RX 5500 XT", True, 8),
-        ("AMD", "AMD Radeon RX 5600 XT", True, 8),
-        ("AMD", "AMD Radeon RX 5700", True, 8),
-        ("AMD", "AMD Radeon RX 5700 XT", True, 8),
-        ("AMD", "AMD Radeon RX 6600", True, 8),
-        ("AMD", "AMD Radeon RX 6600 XT", True, 8),
-        ("AMD", "AMD Radeon RX 6700 XT", True, 8),
-        ("AMD", "AMD Radeon RX 6800", True, 6),
-        ("AMD", "AMD Radeon RX 6800 XT", True, 5),
-        ("AMD", "AMD Radeon RX 6900 XT", True, 4),
-        ("AMD", "AMD Radeon RX 7600", True, 6),
-        ("AMD", "AMD Radeon RX 7700 XT", True, 5),
-        ("AMD", "AMD Radeon RX 7800 XT", True, 4),
-        ("AMD", "AMD Radeon RX 7900 XT", True, 3),
-        ("AMD", "AMD Radeon RX 7900 XTX", True, 3),
-        ("AMD", "AMD Radeon RX 480", True, 6),
-        ("AMD", "AMD Radeon RX 470", True, 5),
-        ("AMD", "AMD Radeon(TM) 780M", False, 6),
-        ("AMD", "AMD Radeon(TM) 680M", False, 5),
-        ("AMD", "AMD Radeon(TM) 660M", False, 5),
-        ("ATI Technologies Inc.", "AMD Radeon HD 7900 Series", True, 3),
-        ("ATI Technologies Inc.", "AMD Radeon R9 200 Series", True, 3),
-        ("ATI Technologies Inc.", "AMD Radeon R9 380 Series", True, 3),
-        ("ATI Technologies Inc.", "AMD Radeon HD 7700 Series", True, 2),
-        
-        # Apple Silicon (Mac) - MEDIUM WEIGHT
-        ("Apple", "Apple M1", False, 12),
-        ("Apple", "Apple M2", False, 10),
-        ("Apple", "Apple M3", False, 8),
-        ("Apple", "Apple M1 Pro", False, 8),
-        ("Apple", "Apple M1 Max", False, 6),
-        ("Apple", "Apple M1 Ultra", False, 3),
-        ("Apple", "Apple M2 Pro", False, 6),
-        ("Apple", "Apple M2 Max", False, 5),
-        ("Apple", "Apple M2 Ultra", False, 2),
-        ("Apple", "Apple M3 Pro", False, 5),
-        ("Apple", "Apple M3 Max", False, 4),
-        ("Apple", "AMD Radeon Pro 5500M", True, 4),
-        ("Apple", "AMD Radeon Pro 560X", True, 3),
-        ("Apple", "AMD Radeon Pro 5300M", True, 3),
-        ("Apple", "AMD Radeon Pro 5600M", True, 3),
-        ("Apple", "AMD Radeon Pro Vega 20", True, 2),
-        
-        # Generic/ANGLE (Chrome on Windows) - HIGH WEIGHT
-        ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) UHD Graphics 630 Direct3D11 vs_5_0 ps_5_0)", False, 15),
-        ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) HD Graphics 620 Direct3D11 vs_5_0 ps_5_0)", False, 12),
-        ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) UHD Graphics 620 Direct3D11 vs_5_0 ps_5_0)", False, 12),
-        ("Google Inc. (Intel)", "ANGLE (Intel, Intel(R) Iris(R) Xe Graphics Direct3D11 vs_5_0 ps_5_0)", False, 10),
-        ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce GTX 1660 Ti Direct3D11 vs_5_0 ps_5_0)", True, 10),
-        ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce RTX 3060 Direct3D11 vs_5_0 ps_5_0)", True, 10),
-        ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce RTX 3070 Direct3D11 vs_5_0 ps_5_0)", True, 8),
-        ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce GTX 1650 Direct3D11 vs_5_0 ps_5_0)", True, 10),
-        ("Google Inc. (NVIDIA)", "ANGLE (NVIDIA, NVIDIA GeForce GTX 1050 Ti Direct3D11 vs_5_0 ps_5_0)", True, 8),
-        ("Google Inc. (AMD)", "ANGLE (AMD, AMD Radeon(TM) Graphics Direct3D11 vs_5_0 ps_5_0)", False, 12),
-        ("Google Inc. (AMD)", "ANGLE (AMD, AMD Radeon RX 580 Series Direct3D11 vs_5_0 ps_5_0)", True, 8),
-        ("Google Inc. (AMD)", "ANGLE (AMD, AMD Radeon RX 6700 XT Direct3D11 vs_5_0 ps_5_0)", True, 6),
-        
-        # Mesa (Linux) - MEDIUM WEIGHT
-        ("Mesa/X.org", "Mesa DRI Intel(R) HD Graphics 620 (KBL GT2)", False, 8),
-        ("Mesa/X.org", "Mesa DRI Intel(R) UHD Graphics 630 (KBL GT2)", False, 8),
-        ("Mesa/X.org", "Mesa DRI Intel(R) Iris(R) Xe Graphics (TGL GT2)", False, 6),
-        ("X.Org", "AMD Radeon RX 580 Series (polaris10, LLVM 15.0.0, DRM 3.42, 5.15.0)", True, 6),
-        ("X.Org", "AMD Radeon RX 5700 (navi10, LLVM 15.0.0, DRM 3.42, 5.15.0)", True, 5),
-        ("X.Org", "AMD Radeon RX 6700 XT (navi22, LLVM 15.0.0, DRM 3.42, 5.15.0)", True, 4),
-        ("Mesa", "Mesa Intel(R) UHD Graphics (CML GT2)", False, 6),
-        ("Mesa", "Mesa Intel(R) Graphics (RPL-S)", False, 5),
-        ("nouveau", "NV138", True, 3),
-        ("nouveau", "NV137", True, 2),
-        
-        # Qualcomm (mobile/ARM laptops) - LOW WEIGHT
-        ("Qualcomm", "Adreno (TM) 640", False, 3),
-        ("Qualcomm", "Adreno (TM) 650", False, 3),
-        ("Qualcomm", "Adreno (TM) 730", False, 4),
-        ("Qualcomm", "Adreno (TM) 740", False, 3),
-        ("Qualcomm", "Adreno (TM) 680", False, 3),
-    ]
-    
     # Weighted random selection for primary GPU
-    total_weight = sum(w for _, _, _, w in gpu_configs)
-    rand_val = random.uniform(0, total_weight)
-    cumulative = 0
-    
-    for vendor, renderer, is_discrete, weight in gpu_configs:
-        cumulative += weight
-        if rand_val <= cumulative:
-            primary_vendor = vendor
-            primary_renderer = renderer
-            primary_is_discrete = is_discrete
-            break
+    vendor, renderer, is_discrete = _choices(_GPU_CHOICES, cum_weights=_GPU_CUM_WEIGHTS)[0]
     
-    # Multi-GPU: If discrete GPU selected, maybe add integrated GPU (30% chance)
-    # This simulates laptop/desktop with both integrated + discrete graphics
-    is_multi_gpu = False
-    if primary_is_discrete and random.random() < 0.3:
-        is_multi_gpu = True
-        # Add an integrated GPU to the mix
-        integrated_gpus = [gpu for gpu in gpu_configs if not gpu[2]]  # Filter integrated only
-        if integrated_gpus:
-            total_int_weight = sum(w for _, _, _, w in integrated_gpus)
-            rand_int = random.uniform(0, total_int_weight)
-            cumulative = 0
-            for vendor, renderer, _, weight in integrated_gpus:
-                cumulative += weight
-                if rand_int <= cumulative:
-                    # Return the discrete as primary (what WebGL typically reports)
-                    # but note it's multi-GPU in metadata
-                    break
+    # Multi-GPU: a discrete GPU sometimes sits next to an integrated one (30% chance).
+    # WebGL still reports the discrete GPU, only the metadata changes
+    is_multi_gpu = is_discrete and _random() < 0.3
     
-    return {
-        'vendor': primary_vendor,
-        'renderer': primary_renderer,
-        'isMultiGPU': is_multi_gpu
-    }
+    return GPUFingerprint(vendor, renderer, is_multi_gpu)
+
+class ScreenFingerprint(NamedTuple):
+    """Screen properties exposed through window.screen and devicePixelRatio"""
+    width: int
+    height: int
+    availWidth: int
+    availHeight: int
+    colorDepth: int
+    pixelDepth: int
+    devicePixelRatio: float
+    orientation: str
+
+
+# Common real-world screen resolutions
+# Format: (width, height, devicePixelRatio, weight)
+_RESOLUTIONS = (
+    # Standard HD monitors (most common)
+    (1920, 1080, 1, 25),     # Full HD - very common
+    (1366, 768, 1, 15),      # Laptop standard
+    (1536, 864, 1, 10),      # 16:9 laptop
+    (1440, 900, 1, 8),       # 16:10 laptop
+    (1600, 900, 1, 7),       # HD+ laptop
+    (1280, 1024, 1, 5),      # Old 5:4 monitor
+    (1280, 800, 1, 5),       # Old laptop
+    (1680, 1050, 1, 5),      # WSXGA+
+    
+    # 2K/QHD monitors
+    (2560, 1440, 1, 8),      # 2K monitor
+    (2560, 1080, 1, 3),      # Ultrawide
+    (3440, 1440, 1, 2),      # Ultrawide QHD
+    
+    # 4K monitors
+    (3840, 2160, 1, 4),      # 4K monitor
+    (3840, 2160, 1.5, 2),    # 4K with scaling
+    
+    # High-DPI laptops (Mac-style retina)
+    (1920, 1080, 1.25, 3),   # Small high-DPI
+    (1920, 1080, 1.5, 3),    # Medium high-DPI
+    (2560, 1440, 1.5, 2),    # Retina-style
+    (2560, 1600, 2, 2),      # MacBook Pro 13"
+    (2880, 1800, 2, 2),      # MacBook Pro 15"
+    (3024, 1964, 2, 1),      # MacBook Pro 14" (M1)
+    (3456, 2234, 2, 1),      # MacBook Pro 16" (M1)
+    
+    # Less common but real
+    (1280, 720, 1, 3),       # HD Ready
+    (2048, 1152, 1, 2),      # Uncommon but exists
+    (2560, 1600, 1, 2),      # 16:10 2K
+    (1920, 1200, 1, 4),      # WUXGA (16:10)
+)
+_RES_CHOICES = tuple((w, h, dpr) for w, h, dpr, _ in _RESOLUTIONS)
+_RES_WEIGHTS = tuple(weight for *_, weight in _RESOLUTIONS)
+
+# Taskbar typically takes 40-72 pixels on Windows, 25-50 on Mac, sometimes fullscreen (0)
+_TASKBAR_HEIGHTS = (0, 30, 40, 48, 50, 60, 72)
+# Color depth - 24 is most common
+_COLOR_DEPTHS = (24, 24, 24, 24, 32, 32, 30)
 
-def generate_random_screen():
+# Column arrays and normalized probabilities for batch generation
+_RES_WIDTHS = np.array([w for w, _, _ in _RES_CHOICES])
+_RES_HEIGHTS = np.array([h for _, h, _ in _RES_CHOICES])
+_RES_DPRS = np.array([dpr for _, _, dpr in _RES_CHOICES], dtype=float)
+_RES_P = np.array(_RES_WEIGHTS, dtype=float) / sum(_RES_WEIGHTS)
+
+def generate_random_screen(_choice=random.choice, _randint=random.randint, _choices=random.choices, _uniform=random.uniform):
     """
     Generate random screen resolution and properties for anti-fingerprinting
     
-    Returns a dict with:
+    Returns a ScreenFingerprint with:
     - width, height: total screen dimensions
     - availWidth, availHeight: available space (minus taskbar)
     - colorDepth: bits per pixel
     - pixelDepth: same as colorDepth usually
     - devicePixelRatio: scaling factor for high-DPI displays
     """
-    
-    # Common real-world screen resolutions
-    # Format: (width, height, devicePixelRatio, weight)
-    resolutions = [
-        # Standard HD monitors (most common)
-        (1920, 1080, 1, 25),     # Full HD - very common
-        (1366, 768, 1, 15),      # Laptop standard
-        (1536, 864, 1, 10),      # 16:9 laptop
-        (1440, 900, 1, 8),       # 16:10 laptop
-        (1600, 900, 1, 7),       # HD+ laptop
-        (1280, 1024, 1, 5),      # Old 5:4 monitor
-        (1280, 800, 1, 5),       # Old laptop
-        (1680, 1050, 1, 5),      # WSXGA+
-        
-        # 2K/QHD monitors
-        (2560, 1440, 1, 8),      # 2K monitor
-        (2560, 1080, 1, 3),      # Ultrawide
-        (3440, 1440, 1, 2),      # Ultrawide QHD
-        
-        # 4K monitors
-        (3840, 2160, 1, 4),      # 4K monitor
-        (3840, 2160, 1.5, 2),    # 4K with scaling
-        
-        # High-DPI laptops (Mac-style retina)
-        (1920, 1080, 1.25, 3),   # Small high-DPI
-        (1920, 1080, 1.5, 3),    # Medium high-DPI
-        (2560, 1440, 1.5, 2),    # Retina-style
-        (2560, 1600, 2, 2),      # MacBook Pro 13"
-        (2880, 1800, 2, 2),      # MacBook Pro 15"
-        (3024, 1964, 2, 1),      # MacBook Pro 14" (M1)
-        (3456, 2234, 2, 1),      # MacBook Pro 16" (M1)
-        
-        # Less common but real
-        (1280, 720, 1, 3),       # HD Ready
-        (2048, 1152, 1, 2),      # Uncommon but exists
-        (2560, 1600, 1, 2),      # 16:10 2K
-        (1920, 1200, 1, 4),      # WUXGA (16:10)
-    ]
-    
     # Weighted random selection
-    total_weight = sum(w for _, _, _, w in resolutions)
-    rand_val = random.uniform(0, total_weight)
-    cumulative = 0
-    
-    for width, height, dpr, weight in resolutions:
-        cumulative += weight
-        if rand_val <= cumulative:
-            chosen_width = width
-            chosen_height = height
-            device_pixel_ratio = dpr
-            break
+    chosen_width, chosen_height, device_pixel_ratio = _choices(_RES_CHOICES, weights=_RES_WEIGHTS)[0]
     
     # Add small random variations to make each session unique
     # ±2% variation in resolution
-    width_variation = random.randint(-int(chosen_width * 0.02), int(chosen_width * 0.02))
-    height_variation = random.randint(-int(chosen_height * 0.02), int(chosen_height * 0.02))
+    width_variation = _randint(-int(chosen_width * 0.02), int(chosen_width * 0.02))
+    height_variation = _randint(-int(chosen_height * 0.02), int(chosen_height * 0.02))
     
     screen_width = chosen_width + width_variation
     screen_height = chosen_height + height_variation
@@ -2226,391 +2227,631 @@ def generate_random_screen():
     screen_height = max(screen_height, 768)
     
     # Calculate available dimensions (minus taskbar/dock)
-    # Taskbar typically takes 40-72 pixels on Windows, 25-50 on Mac
-    taskbar_height = random.choice([0, 30, 40, 48, 50, 60, 72])  # Sometimes fullscreen (0)
+    taskbar_height = _choice(_TASKBAR_HEIGHTS)
     avail_width = screen_width
     avail_height = screen_height - taskbar_height
     
     # Color depth - most common values
-    color_depth = random.choice([24, 24, 24, 24, 32, 32, 30])  # 24 is most common
+    color_depth = _choice(_COLOR_DEPTHS)
     pixel_depth = color_depth  # Usually the same
     
     # Randomize devicePixelRatio slightly for high-DPI displays
     if device_pixel_ratio > 1:
         # Add small variation (±0.05)
-        dpr_variation = random.uniform(-0.05, 0.05)
+        dpr_variation = _uniform(-0.05, 0.05)
         device_pixel_ratio = round(device_pixel_ratio + dpr_variation, 2)
         device_pixel_ratio = max(1.0, min(3.0, device_pixel_ratio))
     
-    return {
-        'width': screen_width,
-        'height': screen_height,
-        'availWidth': avail_width,
-        'availHeight': avail_height,
-        'colorDepth': color_depth,
-        'pixelDepth': pixel_depth,
-        'devicePixelRatio': device_pixel_ratio,
-        'orientation': 'landscape-primary'  # Most common
-    }
+    return ScreenFingerprint(
+        width=screen_width,
+        height=screen_height,
+        availWidth=avail_width,
+        availHeight=avail_height,
+        colorDepth=color_depth,
+        pixelDepth=pixel_depth,
+        devicePixelRatio=device_pixel_ratio,
+        orientation='landscape-primary'  # Most common
+    )
 
-def generate_random_user_agent():
-    """Generate a random realistic user agent by combining different components"""
-    
-    # MASSIVELY EXPANDED Platform/OS options - Desktop, Mobile, Tablet, Legacy
-    platforms = [
-        # Modern Windows (heavily weighted)
-        "Windows NT 10.0; Win64; x64",
-        "Windows NT 10.0; Win64; x64",
-        "Windows NT 10.0; Win64; x64",
-        "Windows NT 11.0; Win64; x64",
-        "Windows NT 11.0; Win64; x64",
-        "Windows NT 10.0; WOW64",
-        "Windows NT 10.0; Win64; x64; rv:109.0",
-        "Windows NT 10.0; Win64; x64; rv:115.0",
-        "Windows NT 6.1; Win64; x64",  # Windows 7
-        "Windows NT 6.3; Win64; x64",  # Windows 8.1
-        "Windows NT 6.2; Win64; x64",  # Windows 8
-        "Windows NT 6.1; WOW64",  # Windows 7 32-bit on 64-bit
-        "Windows NT 6.3; WOW64",
-        "Windows NT 5.1",  # Windows XP
-        "Windows NT 6.0",  # Windows Vista
-        "Windows NT 10.0; ARM64",
-        
-        # macOS (massively expanded)
-        "Macintosh; Intel Mac OS X 10_15_7",
-        "Macintosh; Intel Mac OS X 10_15_7",
-        "Macintosh; Intel Mac OS X 11_6_0",
-        "Macintosh; Intel Mac OS X 11_7_0",
-        "Macintosh; Intel Mac OS X 12_0_1",
-        "Macintosh; Intel Mac OS X 12_1_0",
-        "Macintosh; Intel Mac OS X 12_2_1",
-        "Macintosh; Intel Mac OS X 12_3_1",
-        "Macintosh; Intel Mac OS X 12_4",
-        "Macintosh; Intel Mac OS X 12_5_1",
-        "Macintosh; Intel Mac OS X 12_6_0",
-        "Macintosh; Intel Mac OS X 12_6_7",
-        "Macintosh; Intel Mac OS X 13_0_0",
-        "Macintosh; Intel Mac OS X 13_0_1",
-        "Macintosh; Intel Mac OS X 13_1",
-        "Macintosh; Intel Mac OS X 13_2_1",
-        "Macintosh; Intel Mac OS X 13_3_1",
-        "Macintosh; Intel Mac OS X 13_4_1",
-        "Macintosh; Intel Mac OS X 13_5_2",
-        "Macintosh; Intel Mac OS X 13_6_0",
-        "Macintosh; Intel Mac OS X 14_0",
-        "Macintosh; Intel Mac OS X 14_1_1",
-        "Macintosh; Intel Mac OS X 14_2_1",
-        "Macintosh; Intel Mac OS X 14_3_0",
-        "Macintosh; Intel Mac OS X 14_4_0",
-        "Macintosh; Intel Mac OS X 10_14_6",  # Mojave
-        "Macintosh; Intel Mac OS X 10_13_6",  # High Sierra
-        "Macintosh; Intel Mac OS X 10_12_6",  # Sierra
-        "Macintosh; Apple M1 Mac OS X 13_2_1",  # Apple Silicon
-        "Macintosh; Apple M2 Mac OS X 14_1_1",  # Apple Silicon M2
-        
-        # Linux (massively expanded)
-        "X11; Linux x86_64",
-        "X11; Linux x86_64",
-        "X11; Ubuntu; Linux x86_64",
-        "X11; Ubuntu; Linux x86_64",
-        "X11; Fedora; Linux x86_64",
-        "X11; Debian; Linux x86_64",
-        "X11; Arch Linux; Linux x86_64",
-        "X11; Manjaro; Linux x86_64",
-        "X11; Linux x86_64; rv:109.0",
-        "X11; Linux i686",
-        "X11; CrOS x86_64 14541.0.0",  # ChromeOS
-        "X11; CrOS x86_64 15117.0.0",
-        "X11; CrOS aarch64 15183.0.0",
-        "X11; Linux aarch64",
-        
-        # Android smartphones (massively expanded)
-        "Linux; Android 14; SM-S928B",  # Samsung Galaxy S24 Ultra
-        "Linux; Android 14; SM-S926B",  # Samsung Galaxy S24+
-        "Linux; Android 14; SM-S921B",  # Samsung Galaxy S24
-        "Linux; Android 13; SM-S918B",  # Samsung Galaxy S23 Ultra
-        "Linux; Android 13; SM-S916B",  # Samsung Galaxy S23+
-        "Linux; Android 13; SM-S911B",  # Samsung Galaxy S23
-        "Linux; Android 13; SM-G998B",  # Samsung Galaxy S21 Ultra
-        "Linux; Android 12; SM-G991B",  # Samsung Galaxy S21
-        "Linux; Android 13; Pixel 8 Pro",
-        "Linux; Android 13; Pixel 8",
-        "Linux; Android 13; Pixel 7 Pro",
-        "Linux; Android 13; Pixel 7",
-        "Linux; Android 12; Pixel 6 Pro",
-        "Linux; Android 12; Pixel 6",
-        "Linux; Android 11; Pixel 5",
-        "Linux; Android 11; Pixel 4a",
-        "Linux; Android 10; Pixel 3 XL",
-        "Linux; Android 13; SM-A536B",  # Samsung Galaxy A53
-        "Linux; Android 12; SM-A525F",  # Samsung Galaxy A52
-        "Linux; Android 13; SM-A546B",  # Samsung Galaxy A54
-        "Linux; Android 13; SM-A146B",  # Samsung Galaxy A14
-        "Linux; Android 11; SM-G973F",  # Samsung Galaxy S10
-        "Linux; Android 10; SM-G960F",  # Samsung Galaxy S9
-        "Linux; Android 13; OnePlus KB2003",  # OnePlus 11
-        "Linux; Android 13; OnePlus CPH2449",  # OnePlus 11R
-        "Linux; Android 12; OnePlus LE2123",  # OnePlus 9 Pro
-        "Linux; Android 11; OnePlus IN2023",  # OnePlus 8T
-        "Linux; Android 11; ONEPLUS A6013",  # OnePlus 6T
-        "Linux; Android 13; 2201123G",  # Xiaomi 12
-        "Linux; Android 13; 2211133G",  # Xiaomi 12T
-        "Linux; Android 13; 23049PCD8G",  # Xiaomi 13
-        "Linux; Android 12; M2102J20SG",  # Xiaomi Mi 11
-        "Linux; Android 11; Mi 10T Pro",
-        "Linux; Android 10; Mi 9",
-        "Linux; Android 13; Redmi Note 12 Pro",
-        "Linux; Android 12; Redmi Note 11 Pro",
-        "Linux; Android 13; Moto G Power (2023)",
-        "Linux; Android 12; Moto G Stylus 5G",
-        "Linux; Android 11; Nokia 8.3 5G",
-        "Linux; Android 13; ASUS_AI2302",  # ASUS ROG Phone 7
-        "Linux; Android 12; ASUS_I006D",  # ASUS Zenfone 9
-        "Linux; Android 13; V2231A",  # Vivo X90 Pro
-        "Linux; Android 13; V2227A",  # Vivo Y56 5G
-        "Linux; Android 13; RMX3501",  # Realme GT 2 Pro
-        "Linux; Android 12; RMX3371",  # Realme 9 Pro+
-        "Linux; Android 13; Infinix X6833B",  # Infinix Note 30
-        
-        # Android tablets (massively expanded)
-        "Linux; Android 13; SM-X906B",  # Samsung Galaxy Tab S9 Ultra
-        "Linux; Android 13; SM-X916B",  # Samsung Galaxy Tab S9+
-        "Linux; Android 13; SM-X916C",  # Samsung Galaxy Tab S9
-        "Linux; Android 12; SM-X906C",  # Samsung Galaxy Tab S8 Ultra
-        "Linux; Android 12; SM-X906B",  # Samsung Galaxy Tab S8+
-        "Linux; Android 11; SM-T870",  # Samsung Galaxy Tab S7
-        "Linux; Android 13; Lenovo TB-X606F",  # Lenovo Tab P11
-        "Linux; Android 12; Lenovo TB-J606F",  # Lenovo Tab M10
-        "Linux; Android 13; Lenovo TB-Q706F",  # Lenovo Tab P12 Pro
-        "Linux; Android 13; XiaoMi Pad 6",
-        "Linux; Android 12; XiaoMi Pad 5 Pro",
-        "Linux; Android 13; Pixel Tablet",
-        
-        # iOS (iPhone) - massively expanded
-        "iPhone; CPU iPhone OS 17_3_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 17_2_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 17_1_2 like Mac OS X",
-        "iPhone; CPU iPhone OS 17_1_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 17_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 17_0_3 like Mac OS X",
-        "iPhone; CPU iPhone OS 17_0_2 like Mac OS X",
-        "iPhone; CPU iPhone OS 17_0_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 17_0 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_7_2 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_6_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_6 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_5_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_5 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_4_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_4 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_3_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_3 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_2 like Mac OS X",
-        "iPhone; CPU iPhone OS 16_1_2 like Mac OS X",
-        "iPhone; CPU iPhone OS 15_7_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 15_7 like Mac OS X",
-        "iPhone; CPU iPhone OS 15_6_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 15_6 like Mac OS X",
-        "iPhone; CPU iPhone OS 15_5 like Mac OS X",
-        "iPhone; CPU iPhone OS 14_8_1 like Mac OS X",
-        "iPhone; CPU iPhone OS 14_8 like Mac OS X",
-        
-        # iOS (iPad) - massively expanded
-        "iPad; CPU OS 17_3_1 like Mac OS X",
-        "iPad; CPU OS 17_2_1 like Mac OS X",
-        "iPad; CPU OS 17_1_2 like Mac OS X",
-        "iPad; CPU OS 17_1_1 like Mac OS X",
-        "iPad; CPU OS 17_1 like Mac OS X",
-        "iPad; CPU OS 17_0_3 like Mac OS X",
-        "iPad; CPU OS 16_7_2 like Mac OS X",
-        "iPad; CPU OS 16_6_1 like Mac OS X",
-        "iPad; CPU OS 16_6 like Mac OS X",
-        "iPad; CPU OS 16_5_1 like Mac OS X",
-        "iPad; CPU OS 16_5 like Mac OS X",
-        "iPad; CPU OS 16_4_1 like Mac OS X",
-        "iPad; CPU OS 15_7_1 like Mac OS X",
-        "iPad; CPU OS 15_7 like Mac OS X",
-        "iPad; CPU OS 14_8_1 like Mac OS X",
-        "iPad; CPU OS 14_8 like Mac OS X",
-    ]
-    
-    # MASSIVELY EXPANDED WebKit/AppleWebKit versions
-    webkit_versions = [
-        "537.36", "537.36", "537.36",  # Most common
-        "537.35", "537.34", "537.33", "537.32", "537.31", "537.30",
-        "605.1.15", "605.1.16", "605.1.17", "605.1.18", "605.1.19", "605.1.20",
-        "604.1.38", "604.1.39", "604.1.40", "604.1.41", "604.1.42",
-        "604.5.6", "604.5.7", "604.5.8", "604.5.9",
-        "605.1.33", "605.1.34", "605.1.35",
-        "606.1.36", "606.1.37", "606.1.38", "606.1.39",
-        "607.1.40", "607.1.41", "607.1.42", "607.1.43",
-        "608.1.49", "608.1.50", "608.1.51", "608.1.52",
-        "609.1.20", "609.1.21", "609.1.22", "609.1.23",
-        "610.1.25", "610.1.26", "610.1.27", "610.1.28",
-        "611.1.30", "611.1.31", "611.1.32",
-        "612.1.29", "612.1.30", "612.1.31",
-        "613.1.17", "613.1.18", "613.1.19",
-        "614.1.26", "614.1.27", "614.1.28",
-        "615.1.26", "615.1.27", "615.1.28", "615.1.29",
-        "616.1.27", "616.1.28", "616.1.29", "616.1.30",
-        "617.1.15", "617.1.16", "617.1.17", "617.1.18",
-    ]
+def generate_random_screens_batch(n):
+    """
+    Generate n screen fingerprints at once with vectorized numpy draws
     
-    # MASSIVELY EXPANDED Chrome versions (major versions and builds)
-    chrome_major_versions = [
-        109, 110, 111, 112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124, 125, 126, 127, 128, 129, 130
-    ]
-    chrome_builds = [
-        "0.0.0", "0.0.0", "0.0.0",  # Common default
-        "0.5414.74", "0.5414.87", "0.5414.119", "0.5414.129",
-        "0.5481.77", "0.5481.100", "0.5481.177", "0.5481.192",
-        "0.5615.49", "0.5615.86", "0.5615.121", "0.5615.137", "0.5615.165",
-        "0.5735.90", "0.5735.106", "0.5735.134", "0.5735.198", "0.5735.248",
-        "0.5845.96", "0.5845.110", "0.5845.140", "0.5845.179", "0.5845.228",
-        "0.5993.70", "0.5993.88", "0.5993.117", "0.5993.159",
-        "0.6045.105", "0.6045.124", "0.6045.159", "0.6045.199",
-        "0.6099.56", "0.6099.71", "0.6099.109", "0.6099.129", "0.6099.216",
-        "0.6100.42", "0.6100.67", "0.6100.88", "0.6100.99",
-        "0.6261.57", "0.6261.69", "0.6261.94", "0.6261.111", "0.6261.128",
-        "0.6312.58", "0.6312.86", "0.6312.105", "0.6312.122", "0.6312.145",
-        "0.6367.60", "0.6367.78", "0.6367.91", "0.6367.118", "0.6367.155", "0.6367.201",
-        "0.6478.61", "0.6478.114", "0.6478.126", "0.6478.182",
-        "0.6563.64", "0.6563.110", "0.6563.156", "0.6563.187",
-        "0.6613.84", "0.6613.119", "0.6613.137", "0.6613.162",
-        "0.6723.58", "0.6723.91", "0.6723.116", "0.6723.132",
-        "0.6820.51", "0.6820.82", "0.6820.106", "0.6820.128",
-    ]
+    Same distribution as generate_random_screen(), used when filling fingerprint pools.
     
-    # MASSIVELY EXPANDED Firefox versions
-    firefox_versions = [
-        110, 111, 112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124, 125, 126, 127, 128
-    ]
+    Args:
+        n: Number of screens to generate
     
-    # MASSIVELY EXPANDED Edge versions
-    edge_versions = [
-        109, 110, 111, 112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124, 125
+    Returns:
+        List of n ScreenFingerprint
+    """
+    if n <= 0:
+        return []
+    rng = np.random.default_rng()
+    
+    # Weighted resolution pick for the whole batch
+    idx = rng.choice(len(_RES_CHOICES), size=n, p=_RES_P)
+    base_widths = _RES_WIDTHS[idx]
+    base_heights = _RES_HEIGHTS[idx]
+    base_dprs = _RES_DPRS[idx]
+    
+    # ±2% variation in resolution (inclusive bounds), with minimum size
+    width_limits = (base_widths * 0.02).astype(int)
+    height_limits = (base_heights * 0.02).astype(int)
+    widths = np.maximum(base_widths + rng.integers(-width_limits, width_limits + 1), 1024)
+    heights = np.maximum(base_heights + rng.integers(-height_limits, height_limits + 1), 768)
+    
+    taskbars = rng.choice(_TASKBAR_HEIGHTS, size=n)
+    color_depths = rng.choice(_COLOR_DEPTHS, size=n)
+    
+    # ±0.05 devicePixelRatio jitter for high-DPI displays only
+    jittered = np.clip(np.round(base_dprs + rng.uniform(-0.05, 0.05, size=n), 2), 1.0, 3.0)
+    dprs = np.where(base_dprs > 1, jittered, base_dprs)
+    
+    return [
+        ScreenFingerprint(width, height, width, height - taskbar, depth, depth, dpr, 'landscape-primary')
+        for width, height, taskbar, depth, dpr in zip(
+            widths.tolist(), heights.tolist(), taskbars.tolist(), color_depths.tolist(), dprs.tolist()
+        )
     ]
+
+# MASSIVELY EXPANDED Platform/OS options - Desktop, Mobile, Tablet, Legacy
+_PLATFORMS = (
+    # Modern Windows (heavily weighted)
+    "Windows NT 10.0; Win64; x64",
+    "Windows NT 10.0; Win64; x64",
+    "Windows NT 10.0; Win64; x64",
+    "Windows NT 11.0; Win64; x64",
+    "Windows NT 11.0; Win64; x64",
+    "Windows NT 10.0; WOW64",
+    "Windows NT 10.0; Win64; x64; rv:109.0",
+    "Windows NT 10.0; Win64; x64; rv:115.0",
+    "Windows NT 6.1; Win64; x64",  # Windows 7
+    "Windows NT 6.3; Win64; x64",  # Windows 8.1
+    "Windows NT 6.2; Win64; x64",  # Windows 8
+    "Windows NT 6.1; WOW64",  # Windows 7 32-bit on 64-bit
+    "Windows NT 6.3; WOW64",
+    "Windows NT 5.1",  # Windows XP
+    "Windows NT 6.0",  # Windows Vista
+    "Windows NT 10.0; ARM64",
+    
+    # macOS (massively expanded)
+    "Macintosh; Intel Mac OS X 10_15_7",
+    "Macintosh; Intel Mac OS X 10_15_7",
+    "Macintosh; Intel Mac OS X 11_6_0",
+    "Macintosh; Intel Mac OS X 11_7_0",
+    "Macintosh; Intel Mac OS X 12_0_1",
+    "Macintosh; Intel Mac OS X 12_1_0",
+    "Macintosh; Intel Mac OS X 12_2_1",
+    "Macintosh; Intel Mac OS X 12_3_1",
+    "Macintosh; Intel Mac OS X 12_4",
+    "Macintosh; Intel Mac OS X 12_5_1",
+    "Macintosh; Intel Mac OS X 12_6_0",
+    "Macintosh; Intel Mac OS X 12_6_7",
+    "Macintosh; Intel Mac OS X 13_0_0",
+    "Macintosh; Intel Mac OS X 13_0_1",
+    "Macintosh; Intel Mac OS X 13_1",
+    "Macintosh; Intel Mac OS X 13_2_1",
+    "Macintosh; Intel Mac OS X 13_3_1",
+    "Macintosh; Intel Mac OS X 13_4_1",
+    "Macintosh; Intel Mac OS X 13_5_2",
+    "Macintosh; Intel Mac OS X 13_6_0",
+    "Macintosh; Intel Mac OS X 14_0",
+    "Macintosh; Intel Mac OS X 14_1_1",
+    "Macintosh; Intel Mac OS X 14_2_1",
+    "Macintosh; Intel Mac OS X 14_3_0",
+    "Macintosh; Intel Mac OS X 14_4_0",
+    "Macintosh; Intel Mac OS X 10_14_6",  # Mojave
+    "Macintosh; Intel Mac OS X 10_13_6",  # High Sierra
+    "Macintosh; Intel Mac OS X 10_12_6",  # Sierra
+    "Macintosh; Apple M1 Mac OS X 13_2_1",  # Apple Silicon
+    "Macintosh; Apple M2 Mac OS X 14_1_1",  # Apple Silicon M2
+    
+    # Linux (massively expanded)
+    "X11; Linux x86_64",
+    "X11; Linux x86_64",
+    "X11; Ubuntu; Linux x86_64",
+    "X11; Ubuntu; Linux x86_64",
+    "X11; Fedora; Linux x86_64",
+    "X11; Debian; Linux x86_64",
+    "X11; Arch Linux; Linux x86_64",
+    "X11; Manjaro; Linux x86_64",
+    "X11; Linux x86_64; rv:109.0",
+    "X11; Linux i686",
+    "X11; CrOS x86_64 14541.0.0",  # ChromeOS
+    "X11; CrOS x86_64 15117.0.0",
+    "X11; CrOS aarch64 15183.0.0",
+    "X11; Linux aarch64",
+    
+    # Android smartphones (massively expanded)
+    "Linux; Android 14; SM-S928B",  # Samsung Galaxy S24 Ultra
+    "Linux; Android 14; SM-S926B",  # Samsung Galaxy S24+
+    "Linux; Android 14; SM-S921B",  # Samsung Galaxy S24
+    "Linux; Android 13; SM-S918B",  # Samsung Galaxy S23 Ultra
+    "Linux; Android 13; SM-S916B",  # Samsung Galaxy S23+
+    "Linux; Android 13; SM-S911B",  # Samsung Galaxy S23
+    "Linux; Android 13; SM-G998B",  # Samsung Galaxy S21 Ultra
+    "Linux; Android 12; SM-G991B",  # Samsung Galaxy S21
+    "Linux; Android 13; Pixel 8 Pro",
+    "Linux; Android 13; Pixel 8",
+    "Linux; Android 13; Pixel 7 Pro",
+    "Linux; Android 13; Pixel 7",
+    "Linux; Android 12; Pixel 6 Pro",
+    "Linux; Android 12; Pixel 6",
+    "Linux; Android 11; Pixel 5",
+    "Linux; Android 11; Pixel 4a",
+    "Linux; Android 10; Pixel 3 XL",
+    "Linux; Android 13; SM-A536B",  # Samsung Galaxy A53
+    "Linux; Android 12; SM-A525F",  # Samsung Galaxy A52
+    "Linux; Android 13; SM-A546B",  # Samsung Galaxy A54
+    "Linux; Android 13; SM-A146B",  # Samsung Galaxy A14
+    "Linux; Android 11; SM-G973F",  # Samsung Galaxy S10
+    "Linux; Android 10; SM-G960F",  # Samsung Galaxy S9
+    "Linux; Android 13; OnePlus KB2003",  # OnePlus 11
+    "Linux; Android 13; OnePlus CPH2449",  # OnePlus 11R
+    "Linux; Android 12; OnePlus LE2123",  # OnePlus 9 Pro
+    "Linux; Android 11; OnePlus IN2023",  # OnePlus 8T
+    "Linux; Android 11; ONEPLUS A6013",  # OnePlus 6T
+    "Linux; Android 13; 2201123G",  # Xiaomi 12
+    "Linux; Android 13; 2211133G",  # Xiaomi 12T
+    "Linux; Android 13; 23049PCD8G",  # Xiaomi 13
+    "Linux; Android 12; M2102J20SG",  # Xiaomi Mi 11
+    "Linux; Android 11; Mi 10T Pro",
+    "Linux; Android 10; Mi 9",
+    "Linux; Android 13; Redmi Note 12 Pro",
+    "Linux; Android 12; Redmi Note 11 Pro",
+    "Linux; Android 13; Moto G Power (2023)",
+    "Linux; Android 12; Moto G Stylus 5G",
+    "Linux; Android 11; Nokia 8.3 5G",
+    "Linux; Android 13; ASUS_AI2302",  # ASUS ROG Phone 7
+    "Linux; Android 12; ASUS_I006D",  # ASUS Zenfone 9
+    "Linux; Android 13; V2231A",  # Vivo X90 Pro
+    "Linux; Android 13; V2227A",  # Vivo Y56 5G
+    "Linux; Android 13; RMX3501",  # Realme GT 2 Pro
+    "Linux; Android 12; RMX3371",  # Realme 9 Pro+
+    "Linux; Android 13; Infinix X6833B",  # Infinix Note 30
+    
+    # Android tablets (massively expanded)
+    "Linux; Android 13; SM-X906B",  # Samsung Galaxy Tab S9 Ultra
+    "Linux; Android 13; SM-X916B",  # Samsung Galaxy Tab S9+
+    "Linux; Android 13; SM-X916C",  # Samsung Galaxy Tab S9
+    "Linux; Android 12; SM-X906C",  # Samsung Galaxy Tab S8 Ultra
+    "Linux; Android 12; SM-X906B",  # Samsung Galaxy Tab S8+
+    "Linux; Android 11; SM-T870",  # Samsung Galaxy Tab S7
+    "Linux; Android 13; Lenovo TB-X606F",  # Lenovo Tab P11
+    "Linux; Android 12; Lenovo TB-J606F",  # Lenovo Tab M10
+    "Linux; Android 13; Lenovo TB-Q706F",  # Lenovo Tab P12 Pro
+    "Linux; Android 13; XiaoMi Pad 6",
+    "Linux; Android 12; XiaoMi Pad 5 Pro",
+    "Linux; Android 13; Pixel Tablet",
+    
+    # iOS (iPhone) - massively expanded
+    "iPhone; CPU iPhone OS 17_3_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 17_2_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 17_1_2 like Mac OS X",
+    "iPhone; CPU iPhone OS 17_1_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 17_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 17_0_3 like Mac OS X",
+    "iPhone; CPU iPhone OS 17_0_2 like Mac OS X",
+    "iPhone; CPU iPhone OS 17_0_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 17_0 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_7_2 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_6_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_6 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_5_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_5 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_4_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_4 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_3_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_3 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_2 like Mac OS X",
+    "iPhone; CPU iPhone OS 16_1_2 like Mac OS X",
+    "iPhone; CPU iPhone OS 15_7_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 15_7 like Mac OS X",
+    "iPhone; CPU iPhone OS 15_6_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 15_6 like Mac OS X",
+    "iPhone; CPU iPhone OS 15_5 like Mac OS X",
+    "iPhone; CPU iPhone OS 14_8_1 like Mac OS X",
+    "iPhone; CPU iPhone OS 14_8 like Mac OS X",
+    
+    # iOS (iPad) - massively expanded
+    "iPad; CPU OS 17_3_1 like Mac OS X",
+    "iPad; CPU OS 17_2_1 like Mac OS X",
+    "iPad; CPU OS 17_1_2 like Mac OS X",
+    "iPad; CPU OS 17_1_1 like Mac OS X",
+    "iPad; CPU OS 17_1 like Mac OS X",
+    "iPad; CPU OS 17_0_3 like Mac OS X",
+    "iPad; CPU OS 16_7_2 like Mac OS X",
+    "iPad; CPU OS 16_6_1 like Mac OS X",
+    "iPad; CPU OS 16_6 like Mac OS X",
+    "iPad; CPU OS 16_5_1 like Mac OS X",
+    "iPad; CPU OS 16_5 like Mac OS X",
+    "iPad; CPU OS 16_4_1 like Mac OS X",
+    "iPad; CPU OS 15_7_1 like Mac OS X",
+    "iPad; CPU OS 15_7 like Mac OS X",
+    "iPad; CPU OS 14_8_1 like Mac OS X",
+    "iPad; CPU OS 14_8 like Mac OS X",
+)
+
+# Platform partitions, classified once
+_WIN_PLATFORMS = tuple(p for p in _PLATFORMS if 'Windows' in p)
+_MAC_PLATFORMS = tuple(p for p in _PLATFORMS if 'Mac' in p and 'iPhone' not in p and 'iPad' not in p)
+_ANDROID_PLATFORMS = frozenset(p for p in _PLATFORMS if 'Android' in p)
+_IOS_PLATFORMS = frozenset(p for p in _PLATFORMS if 'iPhone' in p or 'iPad' in p)
+# Mobile Chrome platforms (Android phones/tablets and iPhone) -> suffix before Safari/
+_CHROME_MOBILE_SUFFIXES = {
+    p: "Mobile Safari" if 'Android' in p else ""
+    for p in _PLATFORMS if 'Android' in p or 'iPhone' in p
+}
+
+# MASSIVELY EXPANDED WebKit/AppleWebKit versions
+_WEBKIT_VERSIONS = (
+    "537.36", "537.36", "537.36",  # Most common
+    "537.35", "537.34", "537.33", "537.32", "537.31", "537.30",
+    "605.1.15", "605.1.16", "605.1.17", "605.1.18", "605.1.19", "605.1.20",
+    "604.1.38", "604.1.39", "604.1.40", "604.1.41", "604.1.42",
+    "604.5.6", "604.5.7", "604.5.8", "604.5.9",
+    "605.1.33", "605.1.34", "605.1.35",
+    "606.1.36", "606.1.37", "606.1.38", "606.1.39",
+    "607.1.40", "607.1.41", "607.1.42", "607.1.43",
+    "608.1.49", "608.1.50", "608.1.51", "608.1.52",
+    "609.1.20", "609.1.21", "609.1.22", "609.1.23",
+    "610.1.25", "610.1.26", "610.1.27", "610.1.28",
+    "611.1.30", "611.1.31", "611.1.32",
+    "612.1.29", "612.1.30", "612.1.31",
+    "613.1.17", "613.1.18", "613.1.19",
+    "614.1.26", "614.1.27", "614.1.28",
+    "615.1.26", "615.1.27", "615.1.28", "615.1.29",
+    "616.1.27", "616.1.28", "616.1.29", "616.1.30",
+    "617.1.15", "617.1.16", "617.1.17", "617.1.18",
+)
+
+# MASSIVELY EXPANDED Chrome versions (major versions and builds)
+_CHROME_MAJOR_VERSIONS = (
+    109, 110, 111, 112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124, 125, 126, 127, 128, 129, 130
+)
+_CHROME_BUILDS = (
+    "0.0.0", "0.0.0", "0.0.0",  # Common default
+    "0.5414.74", "0.5414.87", "0.5414.119", "0.5414.129",
+    "0.5481.77", "0.5481.100", "0.5481.177", "0.5481.192",
+    "0.5615.49", "0.5615.86", "0.5615.121", "0.5615.137", "0.5615.165",
+    "0.5735.90", "0.5735.106", "0.5735.134", "0.5735.198", "0.5735.248",
+    "0.5845.96", "0.5845.110", "0.5845.140", "0.5845.179", "0.5845.228",
+    "0.5993.70", "0.5993.88", "0.5993.117", "0.5993.159",
+    "0.6045.105", "0.6045.124", "0.6045.159", "0.6045.199",
+    "0.6099.56", "0.6099.71", "0.6099.109", "0.6099.129", "0.6099.216",
+    "0.6100.42", "0.6100.67", "0.6100.88", "0.6100.99",
+    "0.6261.57", "0.6261.69", "0.6261.94", "0.6261.111", "0.6261.128",
+    "0.6312.58", "0.6312.86", "0.6312.105", "0.6312.122", "0.6312.145",
+    "0.6367.60", "0.6367.78", "0.6367.91", "0.6367.118", "0.6367.155", "0.6367.201",
+    "0.6478.61", "0.6478.114", "0.6478.126", "0.6478.182",
+    "0.6563.64", "0.6563.110", "0.6563.156", "0.6563.187",
+    "0.6613.84", "0.6613.119", "0.6613.137", "0.6613.162",
+    "0.6723.58", "0.6723.91", "0.6723.116", "0.6723.132",
+    "0.6820.51", "0.6820.82", "0.6820.106", "0.6820.128",
+)
+
+# MASSIVELY EXPANDED Edge versions
+_EDGE_VERSIONS = (
+    109, 110, 111, 112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124, 125
+)
+
+# Every Chrome major.build combination and Edge token prefix, formatted once
+_CHROME_VERSIONS = tuple(f"{major}.{build}" for major in _CHROME_MAJOR_VERSIONS for build in _CHROME_BUILDS)
+_EDGE_PREFIXES = tuple(f"Edg/{ver}.0." for ver in _EDGE_VERSIONS)
+
+# MASSIVELY EXPANDED Firefox versions
+_FIREFOX_VERSIONS = (
+    110, 111, 112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124, 125, 126, 127, 128
+)
+
+# MASSIVELY EXPANDED Safari versions
+_SAFARI_VERSIONS = (
+    "15.0", "15.1", "15.2", "15.3", "15.4", "15.5", "15.6",
+    "16.0", "16.1", "16.2", "16.3", "16.4", "16.5", "16.6",
+    "17.0", "17.1", "17.2", "17.3", "17.4", "17.5"
+)
+
+# Legacy browser versions
+_OPERA_VERSIONS = ("12.16", "12.17", "11.64", "11.62", "10.63")
+_IE_VERSIONS = ("11.0", "10.0", "9.0", "8.0", "7.0")
+_TRIDENT_VERSIONS = ("7.0", "6.0", "5.0", "4.0")
+# Version classes, parsed once instead of float() on every UA
+_PRESTO_OPERA_VERSIONS = frozenset(v for v in _OPERA_VERSIONS if float(v) < 15)
+_MODERN_IE_VERSIONS = frozenset(v for v in _IE_VERSIONS if float(v) >= 11)
+
+def _build_chrome_ua(platform, _choice=random.choice, _randint=random.randint):
+    webkit = _choice(_WEBKIT_VERSIONS)
+    chrome_version = _choice(_CHROME_VERSIONS)
+    
+    # Filter platform for mobile Chrome
+    mobile_suffix = _CHROME_MOBILE_SUFFIXES.get(platform)
+    if mobile_suffix is not None:
+        # Mobile Chrome
+        return f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Chrome/{chrome_version} {mobile_suffix} Safari/{webkit}"
+    # Desktop Chrome
+    return f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Chrome/{chrome_version} Safari/{webkit}"
+
+def _build_firefox_ua(platform, _choice=random.choice, _randint=random.randint):
+    firefox_ver = _choice(_FIREFOX_VERSIONS)
+    # Firefox uses Gecko
+    if platform in _ANDROID_PLATFORMS:
+        # Mobile Firefox
+        return f"Mozilla/5.0 ({platform}) Gecko/{firefox_ver}.0 Firefox/{firefox_ver}.0"
+    # Desktop Firefox
+    return f"Mozilla/5.0 ({platform}; rv:{firefox_ver}.0) Gecko/20100101 Firefox/{firefox_ver}.0"
+
+def _build_safari_ua(platform, _choice=random.choice, _randint=random.randint):
+    # Safari on macOS and iOS
+    webkit = _choice(_WEBKIT_VERSIONS)
+    safari_ver = _choice(_SAFARI_VERSIONS)
+    
+    if platform in _IOS_PLATFORMS:
+        # iOS Safari
+        return f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Version/{safari_ver} Mobile/15E148 Safari/{webkit}"
+    # macOS Safari
+    platform = _choice(_MAC_PLATFORMS)
+    return f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Version/{safari_ver} Safari/{webkit}"
+
+def _build_edge_ua(platform, _choice=random.choice, _randint=random.randint):
+    webkit = _choice(_WEBKIT_VERSIONS)
+    edge_prefix = _choice(_EDGE_PREFIXES)
+    chrome_version = _choice(_CHROME_VERSIONS)  # Edge is Chromium-based
     
-    # MASSIVELY EXPANDED Safari versions
-    safari_versions = [
-        "15.0", "15.1", "15.2", "15.3", "15.4", "15.5", "15.6",
-        "16.0", "16.1", "16.2", "16.3", "16.4", "16.5", "16.6",
-        "17.0", "17.1", "17.2", "17.3", "17.4", "17.5"
-    ]
+    # Edge is primarily Windows
+    platform = _choice(_WIN_PLATFORMS)
     
-    # Legacy browser versions
-    opera_versions = ["12.16", "12.17", "11.64", "11.62", "10.63"]
-    ie_versions = ["11.0", "10.0", "9.0", "8.0", "7.0"]
-    trident_versions = ["7.0", "6.0", "5.0", "4.0"]
+    return f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Chrome/{chrome_version} Safari/{webkit} {edge_prefix}{_randint(1000, 9999)}.{_randint(10, 99)}"
+
+def _build_opera_ua(platform, _choice=random.choice, _randint=random.randint):
+    # Opera (legacy Presto and modern Chromium-based)
+    opera_ver = _choice(_OPERA_VERSIONS)
+    if opera_ver in _PRESTO_OPERA_VERSIONS:
+        # Old Presto Opera
+        return f"Opera/9.80 ({platform}) Presto/2.12.388 Version/{opera_ver}"
+    # Modern Chromium-based Opera
+    webkit = _choice(_WEBKIT_VERSIONS)
+    chrome_version = _choice(_CHROME_VERSIONS)
+    opera_major = _randint(85, 105)
+    return f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Chrome/{chrome_version} Safari/{webkit} OPR/{opera_major}.0.{_randint(1000, 9999)}.{_randint(10, 99)}"
+
+def _build_ie_ua(platform, _choice=random.choice, _randint=random.randint):
+    # Internet Explorer (legacy)
+    ie_ver = _choice(_IE_VERSIONS)
+    trident_ver = _choice(_TRIDENT_VERSIONS)
     
-    # Choose browser type - weighted towards modern browsers
-    browser_choices = (
-        ['chrome'] * 35 + ['firefox'] * 25 + ['safari'] * 15 + 
-        ['edge'] * 15 + ['opera'] * 5 + ['ie'] * 5
-    )
-    browser_type = random.choice(browser_choices)
-    platform = random.choice(platforms)
-    
-    if browser_type == 'chrome':
-        webkit = random.choice(webkit_versions)
-        chrome_major = random.choice(chrome_major_versions)
-        chrome_build = random.choice(chrome_builds)
-        chrome_version = f"{chrome_major}.{chrome_build}"
-        
-        # Filter platform for mobile Chrome
-        if 'Android' in platform or 'iPhone' in platform:
-            # Mobile Chrome
-            mobile_suffix = "Mobile Safari" if 'Android' in platform else ""
-            ua = f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Chrome/{chrome_version} {mobile_suffix} Safari/{webkit}"
-        else:
-            # Desktop Chrome
-            ua = f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Chrome/{chrome_version} Safari/{webkit}"
-        
-    elif browser_type == 'firefox':
-        firefox_ver = random.choice(firefox_versions)
-        # Firefox uses Gecko
-        if 'Android' in platform:
-            # Mobile Firefox
-            ua = f"Mozilla/5.0 ({platform}) Gecko/{firefox_ver}.0 Firefox/{firefox_ver}.0"
-        else:
-            # Desktop Firefox
-            ua = f"Mozilla/5.0 ({platform}; rv:{firefox_ver}.0) Gecko/20100101 Firefox/{firefox_ver}.0"
-        
-    elif browser_type == 'safari':
-        # Safari on macOS and iOS
-        webkit = random.choice(webkit_versions)
-        safari_ver = random.choice(safari_versions)
-        
-        if 'iPhone' in platform or 'iPad' in platform:
-            # iOS Safari
-            ua = f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Version/{safari_ver} Mobile/15E148 Safari/{webkit}"
-        else:
-            # macOS Safari
-            mac_platforms = [p for p in platforms if 'Mac' in p and 'iPhone' not in p and 'iPad' not in p]
-            if mac_platforms:
-                platform = random.choice(mac_platforms)
-            ua = f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Version/{safari_ver} Safari/{webkit}"
-        
-    elif browser_type == 'edge':
-        webkit = random.choice(webkit_versions)
-        edge_ver = random.choice(edge_versions)
-        chrome_major = random.choice(chrome_major_versions)  # Edge is Chromium-based
-        chrome_build = random.choice(chrome_builds)
-        chrome_version = f"{chrome_major}.{chrome_build}"
-        
-        # Edge is primarily Windows
-        win_platforms = [p for p in platforms if 'Windows' in p]
-        if win_platforms:
-            platform = random.choice(win_platforms)
-        
-        ua = f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Chrome/{chrome_version} Safari/{webkit} Edg/{edge_ver}.0.{random.randint(1000, 9999)}.{random.randint(10, 99)}"
-    
-    elif browser_type == 'opera':
-        # Opera (legacy Presto and modern Chromium-based)
-        opera_ver = random.choice(opera_versions)
-        if float(opera_ver) < 15:
-            # Old Presto Opera
-            ua = f"Opera/9.80 ({platform}) Presto/2.12.388 Version/{opera_ver}"
-        else:
-            # Modern Chromium-based Opera
-            webkit = random.choice(webkit_versions)
-            chrome_major = random.choice(chrome_major_versions)
-            chrome_build = random.choice(chrome_builds)
-            chrome_version = f"{chrome_major}.{chrome_build}"
-            opera_major = random.randint(85, 105)
-            ua = f"Mozilla/5.0 ({platform}) AppleWebKit/{webkit} (KHTML, like Gecko) Chrome/{chrome_version} Safari/{webkit} OPR/{opera_major}.0.{random.randint(1000, 9999)}.{random.randint(10, 99)}"
-    
-    elif browser_type == 'ie':
-        # Internet Explorer (legacy)
-        ie_ver = random.choice(ie_versions)
-        trident_ver = random.choice(trident_versions)
-        
-        # IE only on Windows
-        win_platforms = [p for p in platforms if 'Windows' in p]
-        if win_platforms:
-            platform = random.choice(win_platforms)
-        
-        if float(ie_ver) >= 11:
-            ua = f"Mozilla/5.0 ({platform}; Trident/{trident_ver}; rv:{ie_ver}) like Gecko"
-        else:
-            ua = f"Mozilla/5.0 (compatible; MSIE {ie_ver}; {platform}; Trident/{trident_ver})"
+    # IE only on Windows
+    platform = _choice(_WIN_PLATFORMS)
     
-    return ua
+    if ie_ver in _MODERN_IE_VERSIONS:
+        return f"Mozilla/5.0 ({platform}; Trident/{trident_ver}; rv:{ie_ver}) like Gecko"
+    return f"Mozilla/5.0 (compatible; MSIE {ie_ver}; {platform}; Trident/{trident_ver})"
 
-def play_youtube_video(driver, browser_type):
+# Browser family -> UA builder, each taking the drawn platform
+_UA_BUILDERS = {
+    'chrome': _build_chrome_ua,
+    'firefox': _build_firefox_ua,
+    'safari': _build_safari_ua,
+    'edge': _build_edge_ua,
+    'opera': _build_opera_ua,
+    'ie': _build_ie_ua,
+}
+
+# Choose browser type - weighted towards modern browsers (35/25/15/15/5/5)
+_UA_BROWSER_TYPES = ('chrome', 'firefox', 'safari', 'edge', 'opera', 'ie')
+_UA_BROWSER_CUM_WEIGHTS = (35, 60, 75, 90, 95, 100)
+
+def generate_random_user_agent(_choice=random.choice, _randint=random.randint, _choices=random.choices):
+    """Generate a random realistic user agent by combining different components"""
+    browser_type = _choices(_UA_BROWSER_TYPES, cum_weights=_UA_BROWSER_CUM_WEIGHTS)[0]
+    return _UA_BUILDERS[browser_type](_choice(_PLATFORMS), _choice, _randint)
+
+# ============================================
+# FINGERPRINT POOL
+# ============================================
+
+def generate_fingerprint(browser_type, fonts=None, screen=None):
     """
-    Detect and play YouTube videos when encountered
-    
+    Generate a complete fingerprint bundle for one browser session
+
     Args:
-        driver: WebDriver instance
-        browser_type: Browser name for logging
-    
+        browser_type: Browser type (chrome/firefox/edge/chromium), drives plugin selection
+        fonts: Pre-generated font list (e.g. from generate_random_fonts_batch), drawn if None
+        screen: Pre-generated ScreenFingerprint (e.g. from generate_random_screens_batch), drawn if None
+
     Returns:
-        bool: True if a video was played
+        dict with every randomized value create_driver needs, including the
+        rendered stealth script so that string work happens here (usually in
+        the pool's refill thread) rather than in create_driver
     """
-    try:
-        current_url = driver.current_url
-        
+    accept_language = generate_random_language()
+    fingerprint = {
+        'user_agent': generate_random_user_agent(),
+        'accept_language': accept_language,
+        'screen': screen if screen is not None else generate_random_screen(),
+        'gpu': generate_random_gpu(),
+        'hardware': generate_random_hardware(),
+        'connection': generate_random_connection(),
+        'timezone_offset': get_timezone_for_language(accept_language),
+        'battery': generate_random_battery(),
+        'media_devices': generate_random_media_devices(),
+        'fonts': fonts if fonts is not None else generate_random_fonts(),
+        'plugins_js': generate_random_plugins(browser_type),
+        'webrtc': generate_random_webrtc(),
+    }
+    fingerprint['stealth_js'] = build_stealth_js(
+        browser_type, fingerprint['screen'], fingerprint['gpu'], fingerprint['hardware'],
+        fingerprint['connection'], fingerprint['timezone_offset'], accept_language, fingerprint['battery'],
+        fingerprint['media_devices'], fingerprint['fonts'], fingerprint['plugins_js'],
+        fingerprint['webrtc']
+    )
+    return fingerprint
+
+
+def generate_fingerprints(browser_type, count):
+    """Generate count fingerprint bundles, drawing fonts and screens as one batch"""
+    return [generate_fingerprint(browser_type, fonts, screen)
+            for fonts, screen in zip(generate_random_fonts_batch(count),
+                                     generate_random_screens_batch(count))]
+
+
+# Bump when a bundle's fields or generators change in a way the template
+# hash below can't see
+_FINGERPRINT_CACHE_SCHEMA = 1
+
+def fingerprint_cache_version():
+    """
+    Version key for the pickled pools: the schema number plus a hash of the
+    stealth script templates and the NamedTuple fields bundles are built from,
+    so a cache written by other code is discarded instead of served
+    """
+    digest = hashlib.sha256()
+    for part in (str(_FINGERPRINT_CACHE_SCHEMA), _STEALTH_JS.template,
+                 *(t.template for t in _STEALTH_JS_BY_BROWSER.values()),
+                 _CANVAS_NOISE_JS.template, repr(ScreenFingerprint._fields),
+                 repr(GPUFingerprint._fields)):
+        digest.update(part.encode())
+    return digest.hexdigest()
+
+
+class FingerprintPool:
+    """
+    Pre-generated fingerprint bundles, one pool per browser type
+
+    - Each bundle is served once, so sessions never share a fingerprint
+    - Pools are refilled in a background thread when they run low
+    - Optionally persisted with pickle so container restarts start warm
+      (read on first use, not at import)
+    """
+    def __init__(self, size, cache_path=''):
+        self.size = size
+        self.cache_path = cache_path
+        self._pools = {}
+        self._loaded = False
+        self._refilling = set()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def _load(self):
+        """
+        Load pickled pools from disk, once (lock must be held)
+
+        The file is consumed, so bundles are never served twice. A cache from
+        another version (see fingerprint_cache_version) is discarded.
+        """
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = pickle.load(f)
+            os.remove(self.cache_path)
+            if not isinstance(cache, dict) or cache.get('version') != fingerprint_cache_version():
+                print(f'⚠ Discarding fingerprint cache from another version: {self.cache_path}')
+                return
+            self._pools = cache['pools']
+            total = sum(len(pool) for pool in self._pools.values())
+            print(f'✓ Loaded {total} cached fingerprints from {self.cache_path}')
+        except Exception as e:
+            print(f'⚠ Failed to load fingerprint cache: {e}')
+            self._pools = {}
+
+    def _save(self):
+        """Persist remaining pools to disk (after every refill and every bundle served)"""
+        if not self.cache_path:
+            return
+        tmp_path = f'{self.cache_path}.tmp'
+        try:
+            # One writer at a time, and the snapshot taken under the same lock
+            # so an older snapshot never overwrites a newer one
+            with self._save_lock:
+                with self._lock:
+                    snapshot = {b: list(pool) for b, pool in self._pools.items()}
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump({'version': fingerprint_cache_version(), 'pools': snapshot},
+                                f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f'⚠ Failed to save fingerprint cache: {e}')
+
+    def _refill(self, browser_type):
+        """Top the pool for browser_type back up to full size"""
+        try:
+            with self._lock:
+                missing = self.size - len(self._pools.get(browser_type, []))
+            fresh = generate_fingerprints(browser_type, missing)
+            with self._lock:
+                self._pools.setdefault(browser_type, []).extend(fresh)
+            self._save()
+        finally:
+            with self._lock:
+                self._refilling.discard(browser_type)
+
+    def _start_refill(self, browser_type):
+        """Start a background refill unless one is already running (lock must be held)"""
+        if browser_type in self._refilling:
+            return
+        self._refilling.add(browser_type)
+        threading.Thread(target=self._refill, args=(browser_type,), daemon=True).start()
+
+    def prime(self, browser_types):
+        """Fill pools for the given browser types in the background"""
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._load()
+            for browser_type in browser_types:
+                if len(self._pools.get(browser_type, [])) < self.size:
+                    self._start_refill(browser_type)
+
+    def get(self, browser_type):
+        """
+        Take one fingerprint bundle for browser_type
+
+        Falls back to generating one inline when the pool is disabled or empty
+        """
+        if self.size <= 0:
+            return generate_fingerprint(browser_type)
+
+        with self._lock:
+            self._load()
+            pool = self._pools.setdefault(browser_type, [])
+            fingerprint = pool.pop() if pool else None
+            if len(pool) <= self.size // 2:
+                self._start_refill(browser_type)
+
+        if fingerprint is None:
+            fingerprint = generate_fingerprint(browser_type)
+        else:
+            # Drop the served bundle from the cache file right away: the
+            # container may restart before the next refill rewrites it
+            self._save()
+        return fingerprint
+
+
+# Fingerprint pool configuration from environment
+FINGERPRINT_POOL_SIZE = int(os.getenv('FINGERPRINT_POOL_SIZE', '32'))
+FINGERPRINT_POOL_CACHE = os.getenv('FINGERPRINT_POOL_CACHE', '')
+
+# Global fingerprint pool instance
+fingerprint_pool = FingerprintPool(FINGERPRINT_POOL_SIZE, FINGERPRINT_POOL_CACHE)
+
+def play_youtube_video(driver, browser_type):
+    """
+    Detect and play YouTube videos when encountered
+    
+    Args:
+        driver: WebDriver instance
+        browser_type: Browser name for logging
+    
+    Returns:
+        bool: True if a video was played
+    """
+    try:
+        current_url = driver.current_url
+        
         # Check if we're on YouTube
         if 'youtube.com' not in current_url and 'youtu.be' not in current_url:
             return False
@@ -2709,6 +2950,774 @@ def play_youtube_video(driver, browser_type):
         print(f'  [{browser_type}] ⚠️  YouTube play error: {str(e)[:50]}')
         return False
 
+# ============================================
+# COOKIE CONSENT
+# ============================================
+
+_TEXT_PSEUDO_RE = re.compile(r':(not\(:)?(?:has-text|contains)\("([^"]*)"\)\)?')
+_ATTR_CONTAINS_RE = re.compile(r'^\[([\w-]+)\*="([^"]*)"\]$')
+
+def _text_selector_to_xpath(selector):
+    """
+    Convert a text-matching selector to XPath
+    
+    :has-text("...") (Playwright) and :contains("...") (jQuery) are not CSS, so
+    browsers reject them. Selectors like 'button:has-text("Accept")',
+    'button:contains("A"):not(:contains("B"))' or '[class*="cookie"] button:has-text("Accept")'
+    are rewritten to the equivalent XPath; plain CSS selectors are returned unchanged.
+    """
+    match = _TEXT_PSEUDO_RE.search(selector)
+    if not match:
+        return selector
+    
+    # Text may contain spaces, so only split the part before the first pseudo-class
+    *ancestors, tag = selector[:match.start()].split(' ')
+    target = selector[match.start():]
+    xpath = ''
+    for ancestor in ancestors:
+        attr, value = _ATTR_CONTAINS_RE.match(ancestor).groups()
+        xpath += f'//*[contains(@{attr}, "{value}")]'
+    
+    tag = tag or '*'
+    conditions = [
+        f'not(contains(., "{text}"))' if negated else f'contains(., "{text}")'
+        for negated, text in _TEXT_PSEUDO_RE.findall(target)
+    ]
+    return f'{xpath}//{tag}[{" and ".join(conditions)}]'
+
+def _selector_by(selector):
+    """Locator strategy for a selector produced by _text_selector_to_xpath"""
+    return By.XPATH if selector.startswith('/') else By.CSS_SELECTOR
+
+# Individual "Agree" buttons (e.g., DIDOMI consent platform) - these must be
+# clicked per category before the main button on some sites
+_INDIVIDUAL_AGREE_SELECTORS = (
+    # DIDOMI and similar platforms with individual toggles
+    'button[aria-label="Agree"]',
+    'button[aria-label*="Agree"]:not([aria-label*="all"])',
+    '.didomi-components-button[aria-label*="Agree"]',
+    'button.didomi-button:not(.didomi-button-highlight)',
+    '//button[contains(., "Agree") and not(contains(., "all"))]',
+    # Generic agree buttons (not "Agree to all")
+    'button:not([aria-label*="all"]):not([class*="all"])',
+)
+
+# The same selectors as one CSS union plus one XPath union, for a single-query lookup
+_INDIVIDUAL_AGREE_CSS_UNION = ', '.join(s for s in _INDIVIDUAL_AGREE_SELECTORS if _selector_by(s) == By.CSS_SELECTOR)
+_INDIVIDUAL_AGREE_XPATH_UNION = ' | '.join(s for s in _INDIVIDUAL_AGREE_SELECTORS if _selector_by(s) == By.XPATH)
+
+# Step 1: individual "Agree" buttons, excluding "Disagree" and "Agree to all"
+_AGREE_RE = re.compile(r'agree', re.IGNORECASE)
+_AGREE_EXCLUDE_RE = re.compile(r'disagree|all', re.IGNORECASE)
+
+# Google/YouTube consent buttons by XPath (more reliable for exact text matching)
+_GOOGLE_CONSENT_XPATHS = (
+    # French (primary for the user's case)
+    "//button[contains(text(), 'Tout accepter')]",
+    "//button[contains(., 'Tout accepter')]",
+    "//button[normalize-space()='Tout accepter']",
+    "//form//button[contains(text(), 'Tout accepter')]",
+    "//form//button[contains(text(), 'accepter')]",
+    "//div[@role='dialog']//button[contains(text(), 'Tout accepter')]",
+    # English
+    "//button[contains(text(), 'Accept all')]",
+    "//button[contains(., 'Accept all')]",
+    "//button[normalize-space()='Accept all']",
+    "//form//button[contains(text(), 'Accept all')]",
+    "//div[@role='dialog']//button[contains(text(), 'Accept all')]",
+    # German
+    "//button[contains(text(), 'Alle akzeptieren')]",
+    "//form//button[contains(text(), 'Alle akzeptieren')]",
+    # Spanish
+    "//button[contains(text(), 'Aceptar todo')]",
+    "//form//button[contains(text(), 'Aceptar todo')]",
+    # Italian
+    "//button[contains(text(), 'Accetta tutto')]",
+    # Portuguese
+    "//button[contains(text(), 'Aceitar tudo')]",
+    # Dutch
+    "//button[contains(text(), 'Alles accepteren')]",
+    # Swedish
+    "//button[contains(text(), 'Godkänn alla')]",
+    # Danish
+    "//button[contains(text(), 'Accepter alle')]",
+    # Finnish
+    "//button[contains(text(), 'Hyväksy kaikki')]",
+)
+
+# Google/YouTube consent CSS selectors, tried after the XPaths
+_GOOGLE_CONSENT_SELECTORS = (
+    # Google consent form specific selectors
+    'form[action*="consent.google"] button[type="submit"]',
+    'form[action*="consent"] button[type="submit"]',
+    
+    # YouTube-specific consent handling
+    'button[aria-label*="Accept all"]',
+    'button[aria-label*="accept all"]',
+    'button[aria-label*="Accepter tout"]',
+    'button[aria-label*="Tout accepter"]',
+    'ytd-button-renderer button[aria-label*="Accept"]',
+    'tp-yt-paper-dialog button[aria-label*="Accept all"]',
+    'c3-consent-bump button[aria-label*="Accept"]',
+    '[aria-label="Accept all"]',
+    '[aria-label="Tout accepter"]',
+    '[aria-label="Accept the use of cookies"]',
+    'ytd-consent-bump-v2-lightbox button[aria-label*="Accept"]',
+    
+    # Additional Google consent patterns
+    'button[jsname*="accept"]',
+    'button[jsaction*="accept"]',
+    
+    # Generic dialog buttons (try first button in Google consent dialogs)
+    'div[role="dialog"] button[type="button"]',
+)
+
+# Each list queried as one union (one find_elements round trip instead of one per entry)
+_GOOGLE_CONSENT_XPATH_UNION = ' | '.join(_GOOGLE_CONSENT_XPATHS)
+_GOOGLE_CONSENT_SELECTOR_UNION = ', '.join(_GOOGLE_CONSENT_SELECTORS)
+
+# Step 2: Google/YouTube consent button text
+_CONSENT_ACCEPT_RE = re.compile(r'accept|accepter|tout|all|alle|aceptar|accetta|aceitar|godkänn|hyväksy', re.IGNORECASE)
+_CONSENT_REJECT_RE = re.compile(r'reject|refus|refuse|deny|decline|opt out|options|settings|parameters|param', re.IGNORECASE)
+
+# Toggle switches/checkboxes for cookie categories
+_TOGGLE_SELECTORS = (
+    # Usercentrics / accessiBe toggles
+    'input[type="checkbox"][role="switch"]',
+    '.switch input[type="checkbox"]',
+    'input[aria-label*="Cookies"]',
+    'input[aria-label*="cookie"]',
+    # Generic toggles with cookie-related parents
+    '[class*="cookie"] input[type="checkbox"]',
+    '[id*="cookie"] input[type="checkbox"]',
+    '[class*="consent"] input[type="checkbox"]',
+    '[id*="consent"] input[type="checkbox"]',
+    # Toggle switches (not just checkboxes)
+    '[role="switch"]',
+    '.toggle-switch input',
+)
+_TOGGLE_SELECTOR_UNION = ', '.join(_TOGGLE_SELECTORS)
+
+# Step 4: Common "Accept All" / "Agree to all" buttons (Comprehensive Multi-Language, Multi-Provider)
+_ACCEPT_ALL_SELECTORS = (
+    # ============================================
+    # MAJOR CONSENT PLATFORMS
+    # ============================================
+    
+    # OneTrust
+    '#onetrust-accept-btn-handler',
+    '.onetrust-close-btn-handler',
+    'button[aria-label="Accept All Cookies"]',
+    '#accept-recommended-btn-handler',
+    '.ot-pc-refuse-all-handler',
+    
+    # Cookiebot
+    '#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll',
+    '#CybotCookiebotDialogBodyButtonAccept',
+    '.CybotCookiebotDialogBodyButton',
+    'a[id*="CybotCookiebot"]',
+    
+    # DIDOMI
+    'button[aria-label="Agree to all"]',
+    'button.didomi-button-highlight',
+    '#didomi-notice-agree-button',
+    '.didomi-consent-popup-actions button:first-child',
+    
+    # Quantcast Choice (TCF)
+    'button[aria-label="AGREE"]',
+    'button[aria-label="ACCEPTER"]',
+    'button[mode="primary"]',
+    '.qc-cmp2-summary-buttons button:first-child',
+    
+    # Usercentrics
+    '[data-testid="uc-accept-all-button"]',
+    '#uc-btn-accept-banner',
+    'button[data-testid="uc-accept-all-button"]',
+    '[aria-label="Accept All"]',
+    
+    # TrustArc
+    '#truste-consent-button',
+    '.truste-button1',
+    '.trustarc-agree-btn',
+    
+    # Osano
+    '.osano-cm-accept-all',
+    '.osano-cm-dialog__close',
+    
+    # Cookie Information
+    '#cookie-information-template-wrapper button',
+    
+    # Termly
+    '#termly-code-snippet-support button',
+    
+    # Sourcepoint
+    'button[title="Accept all"]',
+    'button[title="Accepter tout"]',
+    
+    # Consentmanager.net
+    '#cmpwelcomebtnyes',
+    '.cmpboxbtnyes',
+    
+    # ============================================
+    # TCF VENDOR DIALOGS (Multi-Language)
+    # ============================================
+    
+    # English
+    'button:has-text("Consent")',
+    'button:has-text("Accept")',
+    'button:has-text("I Accept")',
+    'button:has-text("I Agree")',
+    'button[title*="Consent"]',
+    'button[aria-label*="Consent"]',
+    'button[aria-label*="Accept"]',
+    
+    # French
+    'button:has-text("Accepter")',
+    'button:has-text("J\'accepte")',
+    'button:has-text("Je consens")',
+    'button[aria-label*="Accepter"]',
+    'button[title*="Accepter"]',
+    
+    # German
+    'button:has-text("Akzeptieren")',
+    'button:has-text("Alle akzeptieren")',
+    'button:has-text("Zustimmen")',
+    'button[aria-label*="Akzeptieren"]',
+    
+    # Spanish
+    'button:has-text("Aceptar")',
+    'button:has-text("Acepto")',
+    'button:has-text("Aceptar todo")',
+    'button[aria-label*="Aceptar"]',
+    
+    # Italian
+    'button:has-text("Accetta")',
+    'button:has-text("Accetto")',
+    'button:has-text("Accetta tutto")',
+    'button[aria-label*="Accetta"]',
+    
+    # Portuguese
+    'button:has-text("Aceitar")',
+    'button:has-text("Aceito")',
+    'button:has-text("Aceitar tudo")',
+    'button[aria-label*="Aceitar"]',
+    
+    # Dutch
+    'button:has-text("Accepteren")',
+    'button:has-text("Alles accepteren")',
+    'button[aria-label*="Accepteren"]',
+    
+    # Polish
+    'button:has-text("Akceptuję")',
+    'button:has-text("Zgadzam się")',
+    'button[aria-label*="Akceptuj"]',
+    
+    # Swedish
+    'button:has-text("Acceptera")',
+    'button:has-text("Godkänn")',
+    'button[aria-label*="Acceptera"]',
+    
+    # Danish
+    'button:has-text("Accepter")',
+    'button:has-text("Godkend")',
+    
+    # Norwegian
+    'button:has-text("Godta")',
+    'button:has-text("Aksepter")',
+    
+    # Finnish
+    'button:has-text("Hyväksy")',
+    
+    # ============================================
+    # COMMON CLASS PATTERNS
+    # ============================================
+    
+    '[class*="accept-all"]',
+    '[class*="acceptAll"]',
+    '[class*="accept_all"]',
+    '[class*="consent-accept"]',
+    '[class*="consent-btn"]',
+    '[class*="consent-button"]',
+    '[class*="cookie-accept"]',
+    '[class*="cookie-btn-accept"]',
+    '[class*="cookies-accept"]',
+    '[class*="cmp-accept"]',
+    '[class*="gdpr-accept"]',
+    '[class*="banner-accept"]',
+    '[class*="consent-agree"]',
+    '[class*="agree-button"]',
+    '.accept-cookies',
+    '.accept-button',
+    '.cookie-accept-button',
+    '.js-accept-cookies',
+    '.cookie-banner-accept',
+    '.consent-banner-button-accept',
+    
+    # ============================================
+    # COMMON ID PATTERNS
+    # ============================================
+    
+    '#accept-cookies',
+    '#acceptCookies',
+    '#accept_cookies',
+    '#cookie-accept',
+    '#cookieAccept',
+    '#cookie_accept',
+    '#accept-all',
+    '#acceptAll',
+    '#accept_all',
+    '#acceptAllButton',
+    '#accept-all-cookies',
+    '#accept_all_cookies',
+    '#btn-accept',
+    '#btn-accept-all',
+    '#btnAcceptAll',
+    '#cookie-consent-accept',
+    '#consent-accept-all',
+    '#gdpr-accept',
+    '#privacy-accept',
+    
+    # ============================================
+    # DATA ATTRIBUTES (Provider-Specific)
+    # ============================================
+    
+    '[data-action="accept"]',
+    '[data-action="accept-all"]',
+    '[data-action="acceptAll"]',
+    '[data-cookie="accept"]',
+    '[data-consent="accept"]',
+    '[data-consent="accept-all"]',
+    '[data-testid="cookie-accept"]',
+    '[data-testid="accept-all"]',
+    '[data-testid="accept-all-cookies"]',
+    '[data-testid="consent-banner-accept-button"]',
+    '[data-choice="accept"]',
+    '[data-choice="accept-all"]',
+    '[data-gdpr="accept"]',
+    '[data-cookie-consent="accept"]',
+    '[data-cc="accept"]',
+    '[data-consent-action="accept"]',
+    
+    # ============================================
+    # BUTTON NAMES & TITLES
+    # ============================================
+    
+    'button[name="accept"]',
+    'button[name="accept-all"]',
+    'button[name="agree"]',
+    'button[name="consent"]',
+    'button[title="Accept"]',
+    'button[title="Accept all"]',
+    'button[title="Accept All Cookies"]',
+    'button[title="Accepter"]',
+    'button[title="Accepter tout"]',
+    'button[title="Akzeptieren"]',
+    'button[title="Aceptar"]',
+    
+    # ============================================
+    # SPECIFIC SITE IMPLEMENTATIONS
+    # ============================================
+    
+    # IAB TCF Framework
+    '[class*="tcf"] button:first-child',
+    '[id*="tcf"] button[mode="primary"]',
+    
+    # Utiq / ConsentHub / Reworld Media
+    'button:contains("Accepter"):not(:contains("Rejeter"))',
+    '[class*="consenthub"] button:contains("Accepter")',
+    '[id*="utiq"] button:contains("Accepter")',
+    
+    # Generic fallbacks
+    'button[class*="accept"]:not([class*="reject"]):not([class*="refuse"])',
+    'button[id*="accept"]:not([id*="reject"])',
+    '.cookie-banner button:first-child',
+    '.cookie-notice button:first-child',
+    '[class*="cookie"] button:has-text("Accept")',
+    '[class*="consent"] button:has-text("Accept")',
+    '[class*="gdpr"] button:has-text("Accept")',
+    '[class*="privacy"] button:has-text("Accept")',
+)
+# Text-matching selectors converted to XPath once, so none of them is rejected as invalid CSS
+_ACCEPT_ALL_SELECTORS = tuple(map(_text_selector_to_xpath, _ACCEPT_ALL_SELECTORS))
+
+# In-page equivalent of WebElement.is_displayed(), shared by the batch scripts below
+_IS_VISIBLE_JS = '''
+const isVisible = (el) => {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+};
+'''
+
+# Returns the indices of the visible (and, if arguments[1], enabled) elements of arguments[0]
+_VISIBLE_INDICES_JS = _IS_VISIBLE_JS + '''
+const requireEnabled = arguments[1];
+return Array.from(arguments[0], (el, i) => (el && isVisible(el) && !(requireEnabled && el.disabled)) ? i : -1)
+    .filter(i => i >= 0);
+'''
+
+def filter_visible_elements(driver, elements, require_enabled=False):
+    """
+    Keep only the visible (and optionally enabled) elements, checked in one round trip
+    
+    Replaces per-element is_displayed()/is_enabled() calls, each of which is a
+    WebDriver round trip. Falls back to those calls if the script fails.
+    
+    Args:
+        driver: WebDriver instance
+        elements: WebElements to filter
+        require_enabled: Also drop disabled elements
+    
+    Returns:
+        List of the matching elements, in their original order
+    """
+    if not elements:
+        return []
+    try:
+        indices = driver.execute_script(_VISIBLE_INDICES_JS, elements, require_enabled)
+        return [elements[i] for i in indices]
+    except:
+        visible = []
+        for element in elements:
+            try:
+                if element.is_displayed() and (not require_enabled or element.is_enabled()):
+                    visible.append(element)
+            except:
+                continue
+        return visible
+
+# Button-like elements considered for text matching, queried as one union
+_BUTTON_SELECTOR_UNION = 'button, a.button, .btn, [role="button"]'
+
+# Visible elements matching arguments[0] as [element, text] pairs, in document order
+_VISIBLE_BUTTONS_JS = _IS_VISIBLE_JS + '''
+return Array.from(document.querySelectorAll(arguments[0]))
+    .filter(isVisible)
+    .map(el => [el, (el.innerText || '').trim()]);
+'''
+
+def find_visible_buttons(driver):
+    """
+    Visible buttons and their text, fetched in one round trip
+    
+    Replaces find_elements + per-button is_displayed()/text calls, each of
+    which is a WebDriver round trip. Falls back to those calls if the script fails.
+    
+    Returns:
+        List of (element, text) tuples
+    """
+    try:
+        return [(element, text) for element, text in driver.execute_script(_VISIBLE_BUTTONS_JS, _BUTTON_SELECTOR_UNION)]
+    except:
+        visible = []
+        for button in driver.find_elements(By.CSS_SELECTOR, _BUTTON_SELECTOR_UNION):
+            try:
+                if button.is_displayed():
+                    visible.append((button, button.text.strip()))
+            except:
+                continue
+        return visible
+
+# Visible matches of CSS arguments[0] or XPath arguments[1], each once, as [el, text]
+_INDIVIDUAL_AGREE_JS = _IS_VISIBLE_JS + '''
+const found = new Set(document.querySelectorAll(arguments[0]));
+const snapshot = document.evaluate(arguments[1], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < snapshot.snapshotLength; i++) found.add(snapshot.snapshotItem(i));
+return Array.from(found).filter(isVisible).map(el => [el, (el.innerText || '').trim()]);
+'''
+
+def find_individual_agree_buttons(driver):
+    """
+    Visible individual "Agree" candidates and their text, fetched in one round trip
+    
+    Replaces a find_elements + visibility filter per selector and a .text call
+    per element (the generic button selector matches most buttons on a page).
+    Each element is returned once even if several selectors match it. Falls
+    back to the per-selector calls if the script fails.
+    
+    Returns:
+        List of (element, text) tuples
+    """
+    try:
+        return [(element, text) for element, text in driver.execute_script(
+            _INDIVIDUAL_AGREE_JS, _INDIVIDUAL_AGREE_CSS_UNION, _INDIVIDUAL_AGREE_XPATH_UNION)]
+    except:
+        candidates = []
+        for selector in _INDIVIDUAL_AGREE_SELECTORS:
+            try:
+                for element in filter_visible_elements(driver, driver.find_elements(_selector_by(selector), selector)):
+                    try:
+                        candidates.append((element, element.text))
+                    except:
+                        continue
+            except:
+                continue
+        return candidates
+
+def wait_until_gone(driver, element, timeout=0.75, reload_timeout=0):
+    """
+    Wait for a clicked consent button to be removed or hidden
+    
+    Replaces a fixed sleep after the click: most banners disappear within
+    tens of milliseconds, and the timeout caps the slow ones.
+    
+    Args:
+        driver: WebDriver instance
+        element: The element that was clicked
+        timeout: Maximum seconds to wait
+        reload_timeout: For consent forms that submit and reload the page: once
+                        the element is stale, also wait up to this many seconds
+                        for the new document to finish loading
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.05).until(EC.invisibility_of_element(element))
+        if reload_timeout and EC.staleness_of(element)(driver):
+            WebDriverWait(driver, reload_timeout, poll_frequency=0.05).until(
+                lambda d: d.execute_script('return document.readyState') == 'complete'
+            )
+    except:
+        pass
+
+def click_first_visible(driver, by, selector, text_filter=None, retries=1):
+    """
+    Click the first visible, enabled element matching a (union) selector
+    
+    Consent dialogs often re-render while they animate in, so a
+    StaleElementReferenceException re-queries the page instead of giving up.
+    
+    Args:
+        driver: WebDriver instance
+        by: Locator strategy (By.CSS_SELECTOR / By.XPATH)
+        selector: Selector, typically a CSS ',' or XPath '|' union
+        text_filter: Optional callable on the element text, the element is skipped if it returns False
+        retries: How many times to re-query after a stale element
+    
+    Returns:
+        The clicked element, or None if nothing was clicked
+    """
+    for _ in range(retries + 1):
+        try:
+            for element in filter_visible_elements(driver, driver.find_elements(by, selector), require_enabled=True):
+                try:
+                    if text_filter is None or text_filter(element.text):
+                        element.click()
+                        return element
+                except StaleElementReferenceException:
+                    raise
+                except:
+                    continue
+            return None
+        except StaleElementReferenceException:
+            continue
+        except:
+            return None
+    return None
+
+# Clicks the first visible element matching a selector list, in order, in a single
+# round trip. Entries starting with '/' are XPath, the rest CSS; selectors the
+# browser still rejects are skipped. Returns the clicked element, or null.
+_CLICK_FIRST_VISIBLE_JS = 'const selectors = %s;' + _IS_VISIBLE_JS + '''
+for (const selector of selectors) {
+    let elements;
+    try {
+        if (selector.startsWith('/')) {
+            const snapshot = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            elements = Array.from({length: snapshot.snapshotLength}, (_, i) => snapshot.snapshotItem(i));
+        } else {
+            elements = document.querySelectorAll(selector);
+        }
+    } catch (e) {
+        continue;
+    }
+    for (const el of elements) {
+        if (isVisible(el)) {
+            el.click();
+            return el;
+        }
+    }
+}
+return null;
+'''
+
+def _build_click_first_visible_js(selectors):
+    """Embed a selector list into _CLICK_FIRST_VISIBLE_JS (done once per list at import)"""
+    return _CLICK_FIRST_VISIBLE_JS % json.dumps(list(selectors))
+
+_ACCEPT_ALL_JS = _build_click_first_visible_js(_ACCEPT_ALL_SELECTORS)
+# Consent iframes only get the first (most generic) selectors
+_IFRAME_ACCEPT_SELECTORS = _ACCEPT_ALL_SELECTORS[:10]
+_IFRAME_ACCEPT_JS = _build_click_first_visible_js(_IFRAME_ACCEPT_SELECTORS)
+
+# Accept button text (Multi-Language), matched against lowercased button text
+_ACCEPT_TEXT_PATTERNS = (
+    # ============================================
+    # ENGLISH
+    # ============================================
+    'accept all cookies', 'accept all', 'accept cookies', 'i accept', 'allow all', 'allow cookies',
+    'agree', 'agree to all', 'agree and continue', 'got it', 'ok', 'continue', 'consent',
+    'agree and close', 'accept & close', 'accept and continue', 'accept & continue',
+    'allow all cookies', 'yes, i accept', 'i understand', 'understood',
+    
+    # ============================================
+    # FRENCH
+    # ============================================
+    'accepter et continuer', 'accepter tout', 'accepter', 'tout accepter', 
+    'j\'accepte', 'j accepte', 'accepter et fermer', 'consentir', 'je consens',
+    'accepter les cookies', 'accepter tous les cookies', 'd\'accord',
+    'autoriser', 'autoriser tout',
+    
+    # ============================================
+    # GERMAN
+    # ============================================
+    'alle akzeptieren', 'akzeptieren', 'einverstanden', 'akzeptieren und fortfahren',
+    'alle cookies akzeptieren', 'verstanden', 'zustimmen', 'ich stimme zu',
+    'annehmen', 'alle annehmen', 'ok, verstanden',
+    
+    # ============================================
+    # SPANISH
+    # ============================================
+    'aceptar todo', 'aceptar', 'acepto', 'aceptar y continuar', 'consentimiento',
+    'aceptar todas', 'aceptar cookies', 'permitir', 'permitir todo',
+    'de acuerdo', 'entendido', 'estoy de acuerdo',
+    
+    # ============================================
+    # ITALIAN
+    # ============================================
+    'accetta tutto', 'accetto', 'accetta', 'accetta e continua', 'consenso',
+    'accetta tutti', 'accetta i cookie', 'acconsento', 'sono d\'accordo',
+    'd\'accordo', 'ho capito', 'autorizza',
+    
+    # ============================================
+    # PORTUGUESE
+    # ============================================
+    'aceitar tudo', 'aceitar', 'aceitar e continuar', 'consentir', 'aceito',
+    'aceitar cookies', 'aceitar todos', 'permitir', 'permitir tudo',
+    'concordo', 'eu aceito', 'entendi',
+    
+    # ============================================
+    # DUTCH
+    # ============================================
+    'accepteer alles', 'accepteren', 'ja, accepteren', 'accepteren en doorgaan',
+    'alle cookies accepteren', 'toestaan', 'akkoord', 'ik ga akkoord',
+    'begrepen', 'ik accepteer',
+    
+    # ============================================
+    # POLISH
+    # ============================================
+    'akceptuję', 'zgadzam się', 'zaakceptuj wszystko', 'akceptuj',
+    'akceptuj wszystkie', 'zgoda', 'rozumiem', 'potwierdzam',
+    
+    # ============================================
+    # SWEDISH
+    # ============================================
+    'acceptera', 'godkänn', 'acceptera alla', 'jag accepterar',
+    'acceptera allt', 'jag godkänner', 'ok, jag förstår', 'tillåt',
+    
+    # ============================================
+    # DANISH
+    # ============================================
+    'accepter', 'godkend', 'accepter alle', 'jeg accepterer',
+    'tillad', 'forstået', 'jeg forstår',
+    
+    # ============================================
+    # NORWEGIAN
+    # ============================================
+    'godta', 'aksepter', 'godta alle', 'jeg godtar',
+    'jeg aksepterer', 'tillat', 'forstått',
+    
+    # ============================================
+    # FINNISH
+    # ============================================
+    'hyväksy', 'hyväksy kaikki', 'hyväksyn', 'ymmärrän',
+    'salli', 'suostumus',
+    
+    # ============================================
+    # OTHER EUROPEAN LANGUAGES
+    # ============================================
+    'souhlasím', 'přijmout vše', 'přijmout', 'rozumím',  # Czech
+    'accept toate', 'sunt de acord', 'înțeleg',  # Romanian
+    
+    # ============================================
+    # NON-LATIN SCRIPTS
+    # ============================================
+    'συμφωνώ', 'αποδοχή', 'αποδοχή όλων', 'κατανοώ',  # Greek
+    'принимаю', 'согласен', 'принять все', 'понятно',  # Russian
+    'kabul ediyorum', 'kabul et', 'tümünü kabul et', 'anladım',  # Turkish
+    'موافق', 'قبول', 'قبول الكل', 'أوافق',  # Arabic
+    '同意する', '同意', 'すべて許可', '了解',  # Japanese
+    '동의', '모두 동의', '확인', '동의합니다',  # Korean
+    '接受', '全部接受', '同意', '我同意', '确定', '接受全部', '允许', '明白了',  # Chinese
+)
+
+# First pass: prioritize "accept all" / "accepter tout" type buttons
+_PRIORITY_ACCEPT_PATTERNS = (
+    # English
+    'accept all cookies', 'accept all', 'allow all', 'agree to all', 'consent',
+    # French
+    'accepter tout', 'tout accepter', 'accepter et continuer', 'accepter tous les cookies',
+    # German
+    'alle akzeptieren', 'alle cookies akzeptieren',
+    # Spanish
+    'aceptar todo', 'aceptar todas',
+    # Italian
+    'accetta tutto', 'accetta tutti',
+    # Portuguese
+    'aceitar tudo', 'aceitar todos',
+    # Dutch
+    'accepteer alles', 'alle cookies accepteren',
+    # Polish
+    'zaakceptuj wszystko', 'akceptuj wszystkie',
+    # Swedish, Danish, Norwegian
+    'acceptera alla', 'acceptera allt', 'godta alle', 'accepter alle',
+    # Finnish, Czech
+    'hyväksy kaikki', 'přijmout vše',
+)
+
+# Step 5 matchers, each pattern list compiled into one alternation over the
+# lowercased button text
+_PRIORITY_ACCEPT_RE = re.compile('|'.join(map(re.escape, _PRIORITY_ACCEPT_PATTERNS)))
+_ACCEPT_TEXT_RE = re.compile('|'.join(map(re.escape, _ACCEPT_TEXT_PATTERNS)))
+
+# Most consent buttons carry just the pattern text, so exact matches are a set
+# lookup before the regex scan. Includes multi-word patterns spelled without
+# spaces ("acceptall")
+_ACCEPT_TEXT_EXACT = frozenset(_ACCEPT_TEXT_PATTERNS) | frozenset(p.replace(' ', '') for p in _ACCEPT_TEXT_PATTERNS)
+
+# Bare one-word accept buttons ("Accepter", "Accept", "OK", ...)
+_SIMPLE_ACCEPT_WORDS = frozenset(('accepter', 'accept', 'agree', 'ok', 'aceptar', 'akzeptieren', 'accetta', 'aceitar'))
+_PRIORITY_REJECT_RE = re.compile('reject|refuse|rejeter|refuser|deny|decline|manage options')
+_ACCEPT_REJECT_RE = re.compile('reject|refuse|rejeter|refuser|deny|decline|preferences|manage|gérer')
+
+# Consent manager iframe name/id keywords (the pattern is also valid JS, see below)
+_IFRAME_COOKIE_RE = re.compile(r'cookie|consent|gdpr|privacy|didomi', re.IGNORECASE)
+
+# Iframes whose name (or id, if unnamed) matches arguments[0], case-insensitively
+_CONSENT_IFRAMES_JS = '''
+const keywords = new RegExp(arguments[0], 'i');
+return Array.from(document.querySelectorAll('iframe'))
+    .filter(f => keywords.test(f.name || f.id || ''));
+'''
+
+def find_consent_iframes(driver):
+    """
+    Iframes that look like cookie consent managers, filtered in one round trip
+    
+    Replaces find_elements + per-iframe get_attribute('name'/'id') calls.
+    Falls back to those calls if the script fails.
+    """
+    try:
+        return driver.execute_script(_CONSENT_IFRAMES_JS, _IFRAME_COOKIE_RE.pattern) or []
+    except:
+        consent_iframes = []
+        for iframe in driver.find_elements(By.TAG_NAME, 'iframe'):
+            try:
+                iframe_name = iframe.get_attribute('name') or iframe.get_attribute('id') or ''
+                if _IFRAME_COOKIE_RE.search(iframe_name):
+                    consent_iframes.append(iframe)
+            except:
+                continue
+        return consent_iframes
+
 def auto_accept_cookies(driver, browser_type, max_attempts=3):
     """Automatically detect and click cookie consent buttons - with retries and multi-step handling"""
     
@@ -2720,33 +3729,16 @@ def auto_accept_cookies(driver, browser_type, max_attempts=3):
             
             # Step 1: Click individual "Agree" buttons if they exist (e.g., DIDOMI consent platform)
             # This handles cases where you need to agree to individual categories before the main button
-            individual_agree_selectors = [
-                # DIDOMI and similar platforms with individual toggles
-                'button[aria-label="Agree"]',
-                'button[aria-label*="Agree"]:not([aria-label*="all"])',
-                '.didomi-components-button[aria-label*="Agree"]',
-                'button.didomi-button:not(.didomi-button-highlight)',
-                'button:has-text("Agree"):not(:has-text("all"))',
-                # Generic agree buttons (not "Agree to all")
-                'button:not([aria-label*="all"]):not([class*="all"])',
-            ]
-            
             individual_agreed = False
-            for selector in individual_agree_selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        try:
-                            if element.is_displayed() and 'agree' in element.text.lower():
-                                # Filter out "Disagree" buttons and "Agree to all" buttons
-                                if 'disagree' not in element.text.lower() and 'all' not in element.text.lower():
-                                    element.click()
-                                    individual_agreed = True
-                                    time.sleep(0.3)  # Small delay between individual clicks
-                        except:
-                            continue
-                except:
-                    continue
+            for element, text in find_individual_agree_buttons(driver):
+                # Filter out "Disagree" buttons and "Agree to all" buttons
+                if _AGREE_RE.search(text) and not _AGREE_EXCLUDE_RE.search(text):
+                    try:
+                        element.click()
+                        individual_agreed = True
+                        time.sleep(0.3)  # Small delay between individual clicks
+                    except:
+                        continue
             
             if individual_agreed:
                 print(f'  [{browser_type}] 🍪 Clicked individual agree buttons')
@@ -2754,170 +3746,61 @@ def auto_accept_cookies(driver, browser_type, max_attempts=3):
             
             # Step 2: Google & YouTube-specific consent handling (must be before generic)
             try:
-                # Try XPath for Google consent buttons (more reliable for exact text matching)
-                google_consent_xpaths = [
-                    # French (primary for the user's case)
-                    "//button[contains(text(), 'Tout accepter')]",
-                    "//button[contains(., 'Tout accepter')]",
-                    "//button[normalize-space()='Tout accepter']",
-                    "//form//button[contains(text(), 'Tout accepter')]",
-                    "//form//button[contains(text(), 'accepter')]",
-                    "//div[@role='dialog']//button[contains(text(), 'Tout accepter')]",
-                    # English
-                    "//button[contains(text(), 'Accept all')]",
-                    "//button[contains(., 'Accept all')]",
-                    "//button[normalize-space()='Accept all']",
-                    "//form//button[contains(text(), 'Accept all')]",
-                    "//div[@role='dialog']//button[contains(text(), 'Accept all')]",
-                    # German
-                    "//button[contains(text(), 'Alle akzeptieren')]",
-                    "//form//button[contains(text(), 'Alle akzeptieren')]",
-                    # Spanish
-                    "//button[contains(text(), 'Aceptar todo')]",
-                    "//form//button[contains(text(), 'Aceptar todo')]",
-                    # Italian
-                    "//button[contains(text(), 'Accetta tutto')]",
-                    # Portuguese
-                    "//button[contains(text(), 'Aceitar tudo')]",
-                    # Dutch
-                    "//button[contains(text(), 'Alles accepteren')]",
-                    # Swedish
-                    "//button[contains(text(), 'Godkänn alla')]",
-                    # Danish
-                    "//button[contains(text(), 'Accepter alle')]",
-                    # Finnish
-                    "//button[contains(text(), 'Hyväksy kaikki')]",
-                ]
-                
                 # First try XPath selectors (more reliable for exact text matching)
-                for xpath in google_consent_xpaths:
-                    try:
-                        elements = driver.find_elements(By.XPATH, xpath)
-                        for element in elements:
-                            try:
-                                if element.is_displayed() and element.is_enabled():
-                                    element.click()
-                                    print(f'  [{browser_type}] 🍪 Accepted Google/YouTube consent (XPath)')
-                                    time.sleep(1)
-                                    return True
-                            except:
-                                continue
-                    except:
-                        continue
-                
-                # Then try CSS selectors for Google consent
-                google_consent_selectors = [
-                    # Google consent form specific selectors
-                    'form[action*="consent.google"] button[type="submit"]',
-                    'form[action*="consent"] button[type="submit"]',
-                    
-                    # YouTube-specific consent handling
-                    'button[aria-label*="Accept all"]',
-                    'button[aria-label*="accept all"]',
-                    'button[aria-label*="Accepter tout"]',
-                    'button[aria-label*="Tout accepter"]',
-                    'ytd-button-renderer button[aria-label*="Accept"]',
-                    'tp-yt-paper-dialog button[aria-label*="Accept all"]',
-                    'c3-consent-bump button[aria-label*="Accept"]',
-                    '[aria-label="Accept all"]',
-                    '[aria-label="Tout accepter"]',
-                    '[aria-label="Accept the use of cookies"]',
-                    'ytd-consent-bump-v2-lightbox button[aria-label*="Accept"]',
-                    
-                    # Additional Google consent patterns
-                    'button[jsname*="accept"]',
-                    'button[jsaction*="accept"]',
-                    
-                    # Generic dialog buttons (try first button in Google consent dialogs)
-                    'div[role="dialog"] button[type="button"]',
-                ]
+                clicked = click_first_visible(driver, By.XPATH, _GOOGLE_CONSENT_XPATH_UNION)
+                if clicked:
+                    print(f'  [{browser_type}] 🍪 Accepted Google/YouTube consent (XPath)')
+                    # The form submits and reloads the page
+                    wait_until_gone(driver, clicked, timeout=1, reload_timeout=1)
+                    return True
                 
                 # Try CSS selectors
-                for selector in google_consent_selectors:
-                    try:
-                        elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                        for element in elements:
-                            try:
-                                if element.is_displayed() and element.is_enabled():
-                                    # Check button text to ensure it's the accept button
-                                    button_text = element.text.lower()
-                                    accept_keywords = ['accept', 'accepter', 'tout', 'all', 'alle', 'aceptar', 'accetta', 'aceitar', 'godkänn', 'hyväksy']
-                                    reject_keywords = ['reject', 'refus', 'refuse', 'deny', 'decline', 'opt out', 'options', 'settings', 'parameters', 'param']
-                                    
-                                    # Only click if it has accept keywords and no reject keywords
-                                    has_accept = any(keyword in button_text for keyword in accept_keywords)
-                                    has_reject = any(keyword in button_text for keyword in reject_keywords)
-                                    
-                                    if has_accept and not has_reject:
-                                        element.click()
-                                        print(f'  [{browser_type}] 🍪 Accepted Google/YouTube consent (CSS)')
-                                        time.sleep(1)
-                                        return True
-                            except:
-                                continue
-                    except:
-                        continue
+                # Only click if it has accept keywords and no reject keywords
+                clicked = click_first_visible(driver, By.CSS_SELECTOR, _GOOGLE_CONSENT_SELECTOR_UNION,
+                                              lambda text: _CONSENT_ACCEPT_RE.search(text) and not _CONSENT_REJECT_RE.search(text))
+                if clicked:
+                    print(f'  [{browser_type}] 🍪 Accepted Google/YouTube consent (CSS)')
+                    # The form submits and reloads the page
+                    wait_until_gone(driver, clicked, timeout=1, reload_timeout=1)
+                    return True
             except:
                 pass
             
             # Step 3: Toggle cookie category switches (Usercentrics, accessiBe, etc.)
             try:
-                # Find toggle switches/checkboxes for cookie categories
-                toggle_selectors = [
-                    # Usercentrics / accessiBe toggles
-                    'input[type="checkbox"][role="switch"]',
-                    '.switch input[type="checkbox"]',
-                    'input[aria-label*="Cookies"]',
-                    'input[aria-label*="cookie"]',
-                    # Generic toggles with cookie-related parents
-                    '[class*="cookie"] input[type="checkbox"]',
-                    '[id*="cookie"] input[type="checkbox"]',
-                    '[class*="consent"] input[type="checkbox"]',
-                    '[id*="consent"] input[type="checkbox"]',
-                    # Toggle switches (not just checkboxes)
-                    '[role="switch"]',
-                    '.toggle-switch input',
-                ]
-                
                 toggled_count = 0
-                for selector in toggle_selectors:
+                toggles = driver.find_elements(By.CSS_SELECTOR, _TOGGLE_SELECTOR_UNION)
+                for toggle in filter_visible_elements(driver, toggles, require_enabled=True):
                     try:
-                        toggles = driver.find_elements(By.CSS_SELECTOR, selector)
-                        for toggle in toggles:
-                            try:
-                                # Check if toggle is visible and not already checked
-                                if toggle.is_displayed() and toggle.is_enabled():
-                                    # Get labels to avoid toggling "Essential" (always on)
-                                    parent_text = ''
+                        # Get labels to avoid toggling "Essential" (always on)
+                        parent_text = ''
+                        try:
+                            parent = toggle.find_element(By.XPATH, './ancestor::*[1]')
+                            parent_text = parent.text.lower() if parent else ''
+                        except:
+                            pass
+                        
+                        # Skip "Essential" toggles (they're always on and read-only)
+                        if 'essential' not in parent_text and 'essent' not in parent_text:
+                            # Check if already checked
+                            is_checked = toggle.is_selected() or toggle.get_attribute('checked') == 'true' or toggle.get_attribute('aria-checked') == 'true'
+                            
+                            if not is_checked:
+                                # Click to enable this cookie category
+                                try:
+                                    # Try clicking the toggle itself
+                                    toggle.click()
+                                    toggled_count += 1
+                                    time.sleep(random.uniform(0.2, 0.4))
+                                except:
+                                    # If direct click fails, try clicking parent label
                                     try:
-                                        parent = toggle.find_element(By.XPATH, './ancestor::*[1]')
-                                        parent_text = parent.text.lower() if parent else ''
+                                        parent = toggle.find_element(By.XPATH, './ancestor::label[1]')
+                                        parent.click()
+                                        toggled_count += 1
+                                        time.sleep(random.uniform(0.2, 0.4))
                                     except:
                                         pass
-                                    
-                                    # Skip "Essential" toggles (they're always on and read-only)
-                                    if 'essential' not in parent_text and 'essent' not in parent_text:
-                                        # Check if already checked
-                                        is_checked = toggle.is_selected() or toggle.get_attribute('checked') == 'true' or toggle.get_attribute('aria-checked') == 'true'
-                                        
-                                        if not is_checked:
-                                            # Click to enable this cookie category
-                                            try:
-                                                # Try clicking the toggle itself
-                                                toggle.click()
-                                                toggled_count += 1
-                                                time.sleep(random.uniform(0.2, 0.4))
-                                            except:
-                                                # If direct click fails, try clicking parent label
-                                                try:
-                                                    parent = toggle.find_element(By.XPATH, './ancestor::label[1]')
-                                                    parent.click()
-                                                    toggled_count += 1
-                                                    time.sleep(random.uniform(0.2, 0.4))
-                                                except:
-                                                    pass
-                            except:
-                                continue
                     except:
                         continue
                 
@@ -2928,420 +3811,52 @@ def auto_accept_cookies(driver, browser_type, max_attempts=3):
                 pass
             
             # Step 4: Common "Accept All" / "Agree to all" buttons (Comprehensive Multi-Language, Multi-Provider)
-            accept_all_selectors = [
-                # ============================================
-                # MAJOR CONSENT PLATFORMS
-                # ============================================
-                
-                # OneTrust
-                '#onetrust-accept-btn-handler',
-                '.onetrust-close-btn-handler',
-                'button[aria-label="Accept All Cookies"]',
-                '#accept-recommended-btn-handler',
-                '.ot-pc-refuse-all-handler',
-                
-                # Cookiebot
-                '#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll',
-                '#CybotCookiebotDialogBodyButtonAccept',
-                '.CybotCookiebotDialogBodyButton',
-                'a[id*="CybotCookiebot"]',
-                
-                # DIDOMI
-                'button[aria-label="Agree to all"]',
-                'button.didomi-button-highlight',
-                '#didomi-notice-agree-button',
-                '.didomi-consent-popup-actions button:first-child',
-                
-                # Quantcast Choice (TCF)
-                'button[aria-label="AGREE"]',
-                'button[aria-label="ACCEPTER"]',
-                'button[mode="primary"]',
-                '.qc-cmp2-summary-buttons button:first-child',
-                
-                # Usercentrics
-                '[data-testid="uc-accept-all-button"]',
-                '#uc-btn-accept-banner',
-                'button[data-testid="uc-accept-all-button"]',
-                '[aria-label="Accept All"]',
-                
-                # TrustArc
-                '#truste-consent-button',
-                '.truste-button1',
-                '.trustarc-agree-btn',
-                
-                # Osano
-                '.osano-cm-accept-all',
-                '.osano-cm-dialog__close',
-                
-                # Cookie Information
-                '#cookie-information-template-wrapper button',
-                
-                # Termly
-                '#termly-code-snippet-support button',
-                
-                # Sourcepoint
-                'button[title="Accept all"]',
-                'button[title="Accepter tout"]',
-                
-                # Consentmanager.net
-                '#cmpwelcomebtnyes',
-                '.cmpboxbtnyes',
-                
-                # ============================================
-                # TCF VENDOR DIALOGS (Multi-Language)
-                # ============================================
-                
-                # English
-                'button:has-text("Consent")',
-                'button:has-text("Accept")',
-                'button:has-text("I Accept")',
-                'button:has-text("I Agree")',
-                'button[title*="Consent"]',
-                'button[aria-label*="Consent"]',
-                'button[aria-label*="Accept"]',
-                
-                # French
-                'button:has-text("Accepter")',
-                'button:has-text("J\'accepte")',
-                'button:has-text("Je consens")',
-                'button[aria-label*="Accepter"]',
-                'button[title*="Accepter"]',
-                
-                # German
-                'button:has-text("Akzeptieren")',
-                'button:has-text("Alle akzeptieren")',
-                'button:has-text("Zustimmen")',
-                'button[aria-label*="Akzeptieren"]',
-                
-                # Spanish
-                'button:has-text("Aceptar")',
-                'button:has-text("Acepto")',
-                'button:has-text("Aceptar todo")',
-                'button[aria-label*="Aceptar"]',
-                
-                # Italian
-                'button:has-text("Accetta")',
-                'button:has-text("Accetto")',
-                'button:has-text("Accetta tutto")',
-                'button[aria-label*="Accetta"]',
-                
-                # Portuguese
-                'button:has-text("Aceitar")',
-                'button:has-text("Aceito")',
-                'button:has-text("Aceitar tudo")',
-                'button[aria-label*="Aceitar"]',
-                
-                # Dutch
-                'button:has-text("Accepteren")',
-                'button:has-text("Alles accepteren")',
-                'button[aria-label*="Accepteren"]',
-                
-                # Polish
-                'button:has-text("Akceptuję")',
-                'button:has-text("Zgadzam się")',
-                'button[aria-label*="Akceptuj"]',
-                
-                # Swedish
-                'button:has-text("Acceptera")',
-                'button:has-text("Godkänn")',
-                'button[aria-label*="Acceptera"]',
-                
-                # Danish
-                'button:has-text("Accepter")',
-                'button:has-text("Godkend")',
-                
-                # Norwegian
-                'button:has-text("Godta")',
-                'button:has-text("Aksepter")',
-                
-                # Finnish
-                'button:has-text("Hyväksy")',
-                
-                # ============================================
-                # COMMON CLASS PATTERNS
-                # ============================================
-                
-                '[class*="accept-all"]',
-                '[class*="acceptAll"]',
-                '[class*="accept_all"]',
-                '[class*="consent-accept"]',
-                '[class*="consent-btn"]',
-                '[class*="consent-button"]',
-                '[class*="cookie-accept"]',
-                '[class*="cookie-btn-accept"]',
-                '[class*="cookies-accept"]',
-                '[class*="cmp-accept"]',
-                '[class*="gdpr-accept"]',
-                '[class*="banner-accept"]',
-                '[class*="consent-agree"]',
-                '[class*="agree-button"]',
-                '.accept-cookies',
-                '.accept-button',
-                '.cookie-accept-button',
-                '.js-accept-cookies',
-                '.cookie-banner-accept',
-                '.consent-banner-button-accept',
-                
-                # ============================================
-                # COMMON ID PATTERNS
-                # ============================================
-                
-                '#accept-cookies',
-                '#acceptCookies',
-                '#accept_cookies',
-                '#cookie-accept',
-                '#cookieAccept',
-                '#cookie_accept',
-                '#accept-all',
-                '#acceptAll',
-                '#accept_all',
-                '#acceptAllButton',
-                '#accept-all-cookies',
-                '#accept_all_cookies',
-                '#btn-accept',
-                '#btn-accept-all',
-                '#btnAcceptAll',
-                '#cookie-consent-accept',
-                '#consent-accept-all',
-                '#gdpr-accept',
-                '#privacy-accept',
-                
-                # ============================================
-                # DATA ATTRIBUTES (Provider-Specific)
-                # ============================================
-                
-                '[data-action="accept"]',
-                '[data-action="accept-all"]',
-                '[data-action="acceptAll"]',
-                '[data-cookie="accept"]',
-                '[data-consent="accept"]',
-                '[data-consent="accept-all"]',
-                '[data-testid="cookie-accept"]',
-                '[data-testid="accept-all"]',
-                '[data-testid="accept-all-cookies"]',
-                '[data-testid="consent-banner-accept-button"]',
-                '[data-choice="accept"]',
-                '[data-choice="accept-all"]',
-                '[data-gdpr="accept"]',
-                '[data-cookie-consent="accept"]',
-                '[data-cc="accept"]',
-                '[data-consent-action="accept"]',
-                
-                # ============================================
-                # BUTTON NAMES & TITLES
-                # ============================================
-                
-                'button[name="accept"]',
-                'button[name="accept-all"]',
-                'button[name="agree"]',
-                'button[name="consent"]',
-                'button[title="Accept"]',
-                'button[title="Accept all"]',
-                'button[title="Accept All Cookies"]',
-                'button[title="Accepter"]',
-                'button[title="Accepter tout"]',
-                'button[title="Akzeptieren"]',
-                'button[title="Aceptar"]',
-                
-                # ============================================
-                # SPECIFIC SITE IMPLEMENTATIONS
-                # ============================================
-                
-                # IAB TCF Framework
-                '[class*="tcf"] button:first-child',
-                '[id*="tcf"] button[mode="primary"]',
-                
-                # Utiq / ConsentHub / Reworld Media
-                'button:contains("Accepter"):not(:contains("Rejeter"))',
-                '[class*="consenthub"] button:contains("Accepter")',
-                '[id*="utiq"] button:contains("Accepter")',
-                
-                # Generic fallbacks
-                'button[class*="accept"]:not([class*="reject"]):not([class*="refuse"])',
-                'button[id*="accept"]:not([id*="reject"])',
-                '.cookie-banner button:first-child',
-                '.cookie-notice button:first-child',
-                '[class*="cookie"] button:has-text("Accept")',
-                '[class*="consent"] button:has-text("Accept")',
-                '[class*="gdpr"] button:has-text("Accept")',
-                '[class*="privacy"] button:has-text("Accept")',
-            ]
-            
-            # Try specific selectors first (faster and more reliable)
-            for selector in accept_all_selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            element.click()
-                            print(f'  [{browser_type}] 🍪 Accepted cookies via selector: {selector}')
-                            time.sleep(0.5)
-                            return True
-                except:
-                    continue
+            # All selectors are tried in one JavaScript round trip
+            try:
+                clicked = driver.execute_script(_ACCEPT_ALL_JS)
+                if clicked:
+                    print(f'  [{browser_type}] 🍪 Accepted cookies via "Accept All" selectors')
+                    wait_until_gone(driver, clicked)
+                    return True
+            except:
+                # Script failed (e.g. page navigating) - fall back to per-selector lookups
+                for selector in _ACCEPT_ALL_SELECTORS:
+                    try:
+                        elements = driver.find_elements(_selector_by(selector), selector)
+                        for element in elements:
+                            if element.is_displayed():
+                                element.click()
+                                print(f'  [{browser_type}] 🍪 Accepted cookies via selector: {selector}')
+                                wait_until_gone(driver, element)
+                                return True
+                    except:
+                        continue
             
             # Step 5: Find buttons by text content (Multi-Language)
-            accept_text_patterns = [
-                # ============================================
-                # ENGLISH
-                # ============================================
-                'accept all cookies', 'accept all', 'accept cookies', 'i accept', 'allow all', 'allow cookies',
-                'agree', 'agree to all', 'agree and continue', 'got it', 'ok', 'continue', 'consent',
-                'agree and close', 'accept & close', 'accept and continue', 'accept & continue',
-                'allow all cookies', 'yes, i accept', 'i understand', 'understood',
-                
-                # ============================================
-                # FRENCH
-                # ============================================
-                'accepter et continuer', 'accepter tout', 'accepter', 'tout accepter', 
-                'j\'accepte', 'j accepte', 'accepter et fermer', 'consentir', 'je consens',
-                'accepter les cookies', 'accepter tous les cookies', 'd\'accord',
-                'autoriser', 'autoriser tout',
-                
-                # ============================================
-                # GERMAN
-                # ============================================
-                'alle akzeptieren', 'akzeptieren', 'einverstanden', 'akzeptieren und fortfahren',
-                'alle cookies akzeptieren', 'verstanden', 'zustimmen', 'ich stimme zu',
-                'annehmen', 'alle annehmen', 'ok, verstanden',
-                
-                # ============================================
-                # SPANISH
-                # ============================================
-                'aceptar todo', 'aceptar', 'acepto', 'aceptar y continuar', 'consentimiento',
-                'aceptar todas', 'aceptar cookies', 'permitir', 'permitir todo',
-                'de acuerdo', 'entendido', 'estoy de acuerdo',
-                
-                # ============================================
-                # ITALIAN
-                # ============================================
-                'accetta tutto', 'accetto', 'accetta', 'accetta e continua', 'consenso',
-                'accetta tutti', 'accetta i cookie', 'acconsento', 'sono d\'accordo',
-                'd\'accordo', 'ho capito', 'autorizza',
-                
-                # ============================================
-                # PORTUGUESE
-                # ============================================
-                'aceitar tudo', 'aceitar', 'aceitar e continuar', 'consentir', 'aceito',
-                'aceitar cookies', 'aceitar todos', 'permitir', 'permitir tudo',
-                'concordo', 'eu aceito', 'entendi',
-                
-                # ============================================
-                # DUTCH
-                # ============================================
-                'accepteer alles', 'accepteren', 'ja, accepteren', 'accepteren en doorgaan',
-                'alle cookies accepteren', 'toestaan', 'akkoord', 'ik ga akkoord',
-                'begrepen', 'ik accepteer',
-                
-                # ============================================
-                # POLISH
-                # ============================================
-                'akceptuję', 'zgadzam się', 'zaakceptuj wszystko', 'akceptuj',
-                'akceptuj wszystkie', 'zgoda', 'rozumiem', 'potwierdzam',
-                
-                # ============================================
-                # SWEDISH
-                # ============================================
-                'acceptera', 'godkänn', 'acceptera alla', 'jag accepterar',
-                'acceptera allt', 'jag godkänner', 'ok, jag förstår', 'tillåt',
-                
-                # ============================================
-                # DANISH
-                # ============================================
-                'accepter', 'godkend', 'accepter alle', 'jeg accepterer',
-                'tillad', 'forstået', 'jeg forstår',
-                
-                # ============================================
-                # NORWEGIAN
-                # ============================================
-                'godta', 'aksepter', 'godta alle', 'jeg godtar',
-                'jeg aksepterer', 'tillat', 'forstått',
-                
-                # ============================================
-                # FINNISH
-                # ============================================
-                'hyväksy', 'hyväksy kaikki', 'hyväksyn', 'ymmärrän',
-                'salli', 'suostumus',
-                
-                # ============================================
-                # OTHER EUROPEAN LANGUAGES
-                # ============================================
-                'souhlasím', 'přijmout vše', 'přijmout', 'rozumím',  # Czech
-                'accept toate', 'sunt de acord', 'înțeleg',  # Romanian
-                
-                # ============================================
-                # NON-LATIN SCRIPTS
-                # ============================================
-                'συμφωνώ', 'αποδοχή', 'αποδοχή όλων', 'κατανοώ',  # Greek
-                'принимаю', 'согласен', 'принять все', 'понятно',  # Russian
-                'kabul ediyorum', 'kabul et', 'tümünü kabul et', 'anladım',  # Turkish
-                'موافق', 'قبول', 'قبول الكل', 'أوافق',  # Arabic
-                '同意する', '同意', 'すべて許可', '了解',  # Japanese
-                '동의', '모두 동의', '확인', '동의합니다',  # Korean
-                '接受', '全部接受', '同意', '我同意', '确定', '接受全部', '允许', '明白了',  # Chinese
-            ]
-            
             try:
-                all_buttons = driver.find_elements(By.TAG_NAME, 'button')
-                all_buttons += driver.find_elements(By.CSS_SELECTOR, 'a.button, .btn, [role="button"]')
-                
-                # First pass: prioritize "accept all" / "accepter tout" type buttons
-                priority_patterns = [
-                    # English
-                    'accept all cookies', 'accept all', 'allow all', 'agree to all', 'consent',
-                    # French
-                    'accepter tout', 'tout accepter', 'accepter et continuer', 'accepter tous les cookies',
-                    # German
-                    'alle akzeptieren', 'alle cookies akzeptieren',
-                    # Spanish
-                    'aceptar todo', 'aceptar todas',
-                    # Italian
-                    'accetta tutto', 'accetta tutti',
-                    # Portuguese
-                    'aceitar tudo', 'aceitar todos',
-                    # Dutch
-                    'accepteer alles', 'alle cookies accepteren',
-                    # Polish
-                    'zaakceptuj wszystko', 'akceptuj wszystkie',
-                    # Swedish, Danish, Norwegian
-                    'acceptera alla', 'acceptera allt', 'godta alle', 'accepter alle',
-                    # Finnish, Czech
-                    'hyväksy kaikki', 'přijmout vše',
-                ]
+                # Lowercased once here, for both passes
+                visible_buttons = [(button, text, text.lower()) for button, text in find_visible_buttons(driver)]
                 
-                for button in all_buttons:
+                for button, text, button_text in visible_buttons:
                     try:
-                        if not button.is_displayed():
-                            continue
-                        
-                        button_text = button.text.lower().strip()
-                        
                         # Skip reject buttons
-                        reject_keywords = ['reject', 'refuse', 'rejeter', 'refuser', 'deny', 'decline', 'manage options']
-                        if any(keyword in button_text for keyword in reject_keywords):
+                        if _PRIORITY_REJECT_RE.search(button_text):
                             continue
                         
                         # Check priority patterns first
-                        for pattern in priority_patterns:
-                            if pattern in button_text:
-                                button.click()
-                                print(f'  [{browser_type}] 🍪 Accepted cookies via text: "{button.text[:40]}"')
-                                time.sleep(0.5)
-                                return True
+                        if _PRIORITY_ACCEPT_RE.search(button_text):
+                            button.click()
+                            print(f'  [{browser_type}] 🍪 Accepted cookies via text: "{text[:40]}"')
+                            wait_until_gone(driver, button)
+                            return True
                     except:
                         continue
                 
                 # Second pass: accept other accept buttons
-                for button in all_buttons:
+                for button, text, button_text in visible_buttons:
                     try:
-                        if not button.is_displayed():
-                            continue
-                        
-                        button_text = button.text.lower().strip()
-                        
                         # Skip reject buttons (check before anything else)
-                        reject_keywords = ['reject', 'refuse', 'rejeter', 'refuser', 'deny', 'decline', 'preferences', 'manage', 'gérer']
-                        if any(keyword in button_text for keyword in reject_keywords):
+                        if _ACCEPT_REJECT_RE.search(button_text):
                             continue
                         
                         # Skip empty buttons
@@ -3349,20 +3864,18 @@ def auto_accept_cookies(driver, browser_type, max_attempts=3):
                             continue
                         
                         # Check for exact simple matches first (for buttons with just "Accepter", "Accept", etc.)
-                        simple_accept_words = ['accepter', 'accept', 'agree', 'ok', 'aceptar', 'akzeptieren', 'accetta', 'aceitar']
-                        if button_text in simple_accept_words:
+                        if button_text in _SIMPLE_ACCEPT_WORDS:
                             button.click()
-                            print(f'  [{browser_type}] 🍪 Accepted cookies via exact match: "{button.text[:40]}"')
-                            time.sleep(0.5)
+                            print(f'  [{browser_type}] 🍪 Accepted cookies via exact match: "{text[:40]}"')
+                            wait_until_gone(driver, button)
                             return True
                         
                         # Check if button text matches any accept pattern
-                        for pattern in accept_text_patterns:
-                            if pattern in button_text or button_text == pattern.replace(' ', ''):
-                                button.click()
-                                print(f'  [{browser_type}] 🍪 Accepted cookies via text: "{button.text[:40]}"')
-                                time.sleep(0.5)
-                                return True
+                        if button_text in _ACCEPT_TEXT_EXACT or _ACCEPT_TEXT_RE.search(button_text):
+                            button.click()
+                            print(f'  [{browser_type}] 🍪 Accepted cookies via text: "{text[:40]}"')
+                            wait_until_gone(driver, button)
+                            return True
                     except:
                         continue
             except:
@@ -3370,27 +3883,33 @@ def auto_accept_cookies(driver, browser_type, max_attempts=3):
             
             # Step 5: Try iframe-based cookie consent (some use iframes)
             try:
-                iframes = driver.find_elements(By.TAG_NAME, 'iframe')
-                for iframe in iframes:
+                for iframe in find_consent_iframes(driver):
                     try:
-                        iframe_name = iframe.get_attribute('name') or iframe.get_attribute('id') or ''
-                        if any(keyword in iframe_name.lower() for keyword in ['cookie', 'consent', 'gdpr', 'privacy', 'didomi']):
-                            driver.switch_to.frame(iframe)
-                            
-                            # Try to find accept button in iframe
-                            for selector in accept_all_selectors[:10]:
+                        driver.switch_to.frame(iframe)
+                        
+                        # Try to find accept button in iframe (one round trip for all selectors)
+                        try:
+                            clicked = driver.execute_script(_IFRAME_ACCEPT_JS)
+                        except:
+                            # Script failed - fall back to per-selector lookups
+                            clicked = None
+                            for selector in _IFRAME_ACCEPT_SELECTORS:
                                 try:
-                                    element = driver.find_element(By.CSS_SELECTOR, selector)
+                                    element = driver.find_element(_selector_by(selector), selector)
                                     if element.is_displayed():
                                         element.click()
-                                        driver.switch_to.default_content()
-                                        print(f'  [{browser_type}] 🍪 Accepted cookies in iframe')
-                                        time.sleep(0.5)
-                                        return True
+                                        clicked = element
+                                        break
                                 except:
                                     continue
-                            
-                            driver.switch_to.default_content()
+                        
+                        # Wait while still inside the iframe, where the element lives
+                        if clicked:
+                            wait_until_gone(driver, clicked)
+                        driver.switch_to.default_content()
+                        if clicked:
+                            print(f'  [{browser_type}] 🍪 Accepted cookies in iframe')
+                            return True
                     except:
                         driver.switch_to.default_content()
                         continue
@@ -3411,85 +3930,163 @@ def auto_accept_cookies(driver, browser_type, max_attempts=3):
             
     return False
 
+# Common ad selectors (Google Ads, display ads, etc.)
+_AD_SELECTORS = (
+    # Google Ads
+    'iframe[id*="google_ads"]',
+    'iframe[id*="aswift"]',
+    'div[id*="google_ads"]',
+    'ins.adsbygoogle',
+    
+    # Generic ad containers
+    '[class*="advertisement"]',
+    '[class*="ad-container"]',
+    '[class*="ad-banner"]',
+    '[class*="ad-slot"]',
+    '[id*="ad-container"]',
+    '[id*="advertisement"]',
+    'div[class*="ads"]',
+    'div[id*="ads"]',
+    
+    # Common ad networks
+    '[class*="doubleclick"]',
+    '[id*="doubleclick"]',
+    'iframe[src*="doubleclick"]',
+    'iframe[src*="googlesyndication"]',
+    'iframe[src*="advertising"]',
+    
+    # Ad links
+    'a[href*="ad.doubleclick"]',
+    'a[href*="googleadservices"]',
+    'a[rel="sponsored"]',
+    'a[data-ad]',
+    
+    # Taboola, Outbrain, etc.
+    '[class*="taboola"]',
+    '[class*="outbrain"]',
+    '[id*="taboola"]',
+    '[id*="outbrain"]',
+)
+# Queried as one union: one find_elements round trip instead of one per selector
+_AD_SELECTOR_UNION = ', '.join(_AD_SELECTORS)
+
+# Counts the visible, enabled ads matching a selector and picks one uniformly
+# with reservoir sampling, so only the chosen element is sent back to Python
+_PICK_AD_JS = _IS_VISIBLE_JS + '''
+const pickAd = (selector) => {
+    let count = 0;
+    let chosen = null;
+    for (const el of document.querySelectorAll(selector)) {
+        if (el.disabled || !isVisible(el)) continue;
+        count++;
+        if (Math.random() * count < 1) chosen = el;
+    }
+    return [count, chosen];
+};
+'''
+
+# Picks an ad for arguments[0] and stamps it with a data-v-<arguments[1]> attribute
+# (the shape of Vue's scoped-style markers, common on real pages).
+# Returns [count, element]
+_PICK_VISIBLE_AD_JS = _PICK_AD_JS + '''
+const [count, chosen] = pickAd(arguments[0]);
+if (chosen) chosen.setAttribute(`data-v-${arguments[1]}`, '');
+return [count, chosen];
+'''
+
+# Stale-reference retry done atomically in the page: clicks the stamped ad if it
+# is still attached (unstamping it first), otherwise a fresh pick. Returns whether
+# anything was clicked
+_CLICK_STAMPED_AD_JS = _PICK_AD_JS + '''
+const stamped = document.querySelector(`[data-v-${arguments[1]}]`);
+if (stamped) stamped.removeAttribute(`data-v-${arguments[1]}`);
+const target = stamped || pickAd(arguments[0])[1];
+if (!target) return false;
+target.scrollIntoView({block: 'center'});
+target.click();
+return true;
+'''
+
+# Removes the stamp left by _PICK_VISIBLE_AD_JS (token in arguments[0])
+_UNSTAMP_AD_JS = '''
+for (const el of document.querySelectorAll(`[data-v-${arguments[0]}]`)) el.removeAttribute(`data-v-${arguments[0]}`);
+'''
+
+def unstamp_ad(driver, token):
+    """Remove the pick stamp from the page, so the chosen ad isn't left marked"""
+    try:
+        driver.execute_script(_UNSTAMP_AD_JS, token)
+    except:
+        pass
+
+def pick_visible_ad(driver, token, _randrange=random.randrange):
+    """
+    Count the visible ads on the page and pick one at random
+    
+    Only the chosen ad comes back over WebDriver instead of every match, and
+    it is stamped with a data-v-<token> attribute so a retry can find it again
+    without another Python-side lookup (see unstamp_ad). Falls back to per-element
+    is_displayed()/is_enabled() calls (still reservoir sampled, unstamped)
+    if the script fails.
+    
+    Args:
+        driver: WebDriver instance
+        token: Unique suffix for the stamp attribute (lowercase hex)
+    
+    Returns:
+        (ad count, chosen ad element or None)
+    """
+    try:
+        count, chosen = driver.execute_script(_PICK_VISIBLE_AD_JS, _AD_SELECTOR_UNION, token)
+        return count, chosen
+    except:
+        count = 0
+        chosen = None
+        for element in driver.find_elements(By.CSS_SELECTOR, _AD_SELECTOR_UNION):
+            try:
+                if element.is_displayed() and element.is_enabled():
+                    count += 1
+                    if _randrange(count) == 0:
+                        chosen = element
+            except:
+                continue
+        return count, chosen
+
 def detect_and_click_ads(driver, browser_type, click_chance=0.6):
     """Detect ads on page and optionally click them (60% chance by default)"""
+    # Decide whether to click (60% chance) before looking, so skipped pages
+    # cost no WebDriver round trips at all
+    if random.random() > click_chance:
+        return False
+    
     try:
         # Store initial window handle (but don't manage tabs - let caller handle that)
         initial_window = driver.current_window_handle
         
-        # Common ad selectors (Google Ads, display ads, etc.)
-        ad_selectors = [
-            # Google Ads
-            'iframe[id*="google_ads"]',
-            'iframe[id*="aswift"]',
-            'div[id*="google_ads"]',
-            'ins.adsbygoogle',
-            
-            # Generic ad containers
-            '[class*="advertisement"]',
-            '[class*="ad-container"]',
-            '[class*="ad-banner"]',
-            '[class*="ad-slot"]',
-            '[id*="ad-container"]',
-            '[id*="advertisement"]',
-            'div[class*="ads"]',
-            'div[id*="ads"]',
-            
-            # Common ad networks
-            '[class*="doubleclick"]',
-            '[id*="doubleclick"]',
-            'iframe[src*="doubleclick"]',
-            'iframe[src*="googlesyndication"]',
-            'iframe[src*="advertising"]',
-            
-            # Ad links
-            'a[href*="ad.doubleclick"]',
-            'a[href*="googleadservices"]',
-            'a[rel="sponsored"]',
-            'a[data-ad]',
-            
-            # Taboola, Outbrain, etc.
-            '[class*="taboola"]',
-            '[class*="outbrain"]',
-            '[id*="taboola"]',
-            '[id*="outbrain"]'
-        ]
-        
-        ads_found = []
-        
-        # Find all potential ads
-        for selector in ad_selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    try:
-                        if element.is_displayed() and element.is_enabled():
-                            ads_found.append(element)
-                    except:
-                        continue
-            except:
-                continue
-        
-        if not ads_found:
-            return False
-        
-        print(f'  [{browser_type}] 📢 Detected {len(ads_found)} ad(s) on page')
+        # Count potential ads and pick (and stamp) the one we'd click
+        ad_token = os.urandom(8).hex()
+        ads_count, ad_to_click = pick_visible_ad(driver, ad_token)
         
-        # Decide whether to click (60% chance)
-        if random.random() > click_chance:
-            print(f'  [{browser_type}] 🎲 Decided not to click ads this time')
+        if ad_to_click is None:
             return False
         
-        # Try to click a random ad
-        ad_to_click = random.choice(ads_found)
+        print(f'  [{browser_type}] 📢 Detected {ads_count} ad(s) on page')
         
+        # Try to click the randomly picked ad
         try:
-            # Scroll ad into view
-            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", ad_to_click)
-            time.sleep(random.uniform(0.5, 1.0))
-            
-            # Try to click the ad
-            ad_to_click.click()
+            try:
+                # Scroll ad into view
+                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", ad_to_click)
+                time.sleep(random.uniform(0.5, 1.0))
+                
+                # Try to click the ad
+                ad_to_click.click()
+            except StaleElementReferenceException:
+                # Ad slot re-rendered (rotating creatives): find the stamped ad or
+                # pick a fresh one and click it in the same script, so there is no
+                # element reference left to go stale
+                if not driver.execute_script(_CLICK_STAMPED_AD_JS, _AD_SELECTOR_UNION, ad_token):
+                    return False
             print(f'  [{browser_type}] 💰 Clicked on ad!')
             time.sleep(random.uniform(1, 3))
             
@@ -3526,6 +4123,9 @@ def detect_and_click_ads(driver, browser_type, click_chance=0.6):
                     pass
             
             return False
+        finally:
+            # Clicked or not, don't leave the chosen ad marked
+            unstamp_ad(driver, ad_token)
             
     except Exception as e:
         # Don't let ad clicking break the automation
@@ -3537,367 +4137,344 @@ def detect_and_click_ads(driver, browser_type, click_chance=0.6):
             pass
         return False
 
-def create_driver(browser_type, max_retries=3):
-    """Create a Selenium WebDriver for automated browsing with anti-detection
+# ============================================
+# CDP HELPERS
+# ============================================
+
+# Hub connections kept per session, so concurrent commands don't each open
+# (and then discard) a fresh connection
+HUB_CONNECTION_POOL_SIZE = 8
+
+# Chromium builds patched with Emulation.setCanvasNoiseInjectionEnabled add
+# canvas noise natively; stock builds lack the command, so it is opt-in
+NATIVE_CANVAS_NOISE = os.getenv('NATIVE_CANVAS_NOISE', 'false').lower() == 'true'
+
+# URL patterns (comma-separated, * wildcards) Chromium sessions never fetch, e.g.
+# "*.mp4,*.webm,*.woff2" to save bandwidth. Empty by default: ads are mostly
+# images and a browser that never loads images is easy to spot
+BLOCKED_URL_PATTERNS = tuple(p.strip() for p in os.getenv('BLOCKED_URL_PATTERNS', '').split(',') if p.strip())
+
+def widen_hub_connection_pool(driver):
+    """Let a session keep several pooled connections to the hub (urllib3 defaults to one)"""
+    try:
+        conn = driver.command_executor._conn
+        conn.connection_pool_kw['maxsize'] = HUB_CONNECTION_POOL_SIZE
+        conn.clear()  # Existing pools were built with the old size
+    except:
+        pass
+
+# Vendor prefix of the driver's CDP endpoint (chromedriver: goog, msedgedriver: ms)
+_CDP_VENDOR_PREFIXES = {'chrome': 'goog', 'chromium': 'goog', 'edge': 'ms'}
+
+def enable_cdp_commands(driver, browser_type):
+    """
+    Teach a Remote driver the Chromium CDP endpoint
+    
+    webdriver.Remote only knows the W3C commands (execute_cdp_cmd lives on the
+    local ChromiumDriver). The hub forwards /session/<id>/<vendor>/cdp/execute
+    to the node's chromedriver/msedgedriver as-is, so registering that route on
+    this session's command executor is all execute_cdp_cmd needs.
     
     Args:
-        browser_type: The browser to create (chrome, firefox, etc.)
-        max_retries: Maximum number of retry attempts for session creation
-        
+        driver: WebDriver instance
+        browser_type: Browser type (only Chromium-based browsers have the endpoint)
+    
     Returns:
-        WebDriver instance
-        
-    Raises:
-        Exception: If unable to create driver after max_retries attempts
+        True if the endpoint was registered
+    """
+    prefix = _CDP_VENDOR_PREFIXES.get(browser_type)
+    if prefix is None:
+        return False
+    executor = driver.command_executor
+    # The command table is shared by every connection, so this session gets a copy
+    executor._commands = {
+        **executor._commands,
+        'executeCdpCommand': ('POST', f'/session/$sessionId/{prefix}/cdp/execute'),
+    }
+    return True
+
+def execute_cdp_cmd(driver, cmd, params):
     """
+    Run one CDP command through the hub (see enable_cdp_commands)
     
-    # Generate a random realistic user agent (thousands of combinations possible)
-    user_agent = generate_random_user_agent()
+    Args:
+        driver: WebDriver instance
+        cmd: CDP method (e.g. 'Network.enable')
+        params: Method parameters
     
-    # Generate random European language (80% French)
-    accept_language = generate_random_language()
+    Returns:
+        The command's result dict
+    """
+    return driver.execute('executeCdpCommand', {'cmd': cmd, 'params': params})['value']
+
+def enable_cdp_domain(driver, domain):
+    """
+    Enable a CDP domain once per session
     
-    # Generate random screen properties
-    screen = generate_random_screen()
+    Args:
+        driver: WebDriver instance
+        domain: CDP domain name (e.g. 'Network')
     
-    # Generate random GPU info for WebGL fingerprinting (with multi-GPU support)
-    gpu = generate_random_gpu()
+    Returns:
+        True if the enable command was sent, False if already enabled
+    """
+    enabled = getattr(driver, '_cdp_domains_enabled', None)
+    if enabled is None:
+        enabled = driver._cdp_domains_enabled = set()
+    if domain in enabled:
+        return False
+    execute_cdp_cmd(driver, f'{domain}.enable', {})
+    enabled.add(domain)
+    return True
+
+def execute_cdp_cmds(driver, commands, return_exceptions=False):
+    """
+    Send independent CDP commands concurrently
     
-    # Generate random hardware specs (CPU, RAM, touch)
-    hardware = generate_random_hardware()
+    Each CDP command is a blocking POST through the hub; sending them from
+    a small thread pool overlaps those waits. Only use this for commands whose
+    order doesn't matter.
     
-    # Generate random network connection properties
-    connection = generate_random_connection()
+    Args:
+        driver: WebDriver instance (see widen_hub_connection_pool)
+        commands: Sequence of (cmd, params) tuples
+        return_exceptions: Put a failed command's exception in its result slot
+                           instead of raising the first error
     
-    # Get timezone based on language
-    timezone_offset = get_timezone_for_language(accept_language)
+    Returns:
+        List of results, in the same order as commands
+    """
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        futures = [executor.submit(execute_cdp_cmd, driver, cmd, params) for cmd, params in commands]
+        if return_exceptions:
+            return [future.exception() or future.result() for future in futures]
+        return [future.result() for future in futures]
+
+def idle_pause(driver, browser_type, seconds):
+    """
+    Sleep with the page's scripts suspended (Chromium only)
     
-    # Generate random battery status
-    battery = generate_random_battery()
+    Analytics and animation loops otherwise keep the renderer busy while we
+    "read", and the next WebDriver command queues behind them. Scripts are
+    re-enabled before returning, since the setting survives navigations.
     
-    # Generate random media devices
-    media_devices = generate_random_media_devices()
+    If they can't be re-enabled (after one retry), every later page would load
+    with JS off, so the session is marked dead for browse() to recreate.
     
-    # Generate random fonts list
-    fonts = generate_random_fonts()
+    Args:
+        driver: WebDriver instance
+        browser_type: Browser type (Firefox just sleeps)
+        seconds: How long to pause
     
-    # Generate random plugins with browser-specific logic
-    plugins_js = generate_random_plugins(browser_type)
+    Raises:
+        WebDriverException: If scripts could not be re-enabled
+    """
+    if browser_type not in ('chrome', 'chromium', 'edge'):
+        time.sleep(seconds)
+        return
     
-    # Generate random WebRTC local IPs
-    webrtc = generate_random_webrtc()
+    try:
+        execute_cdp_cmd(driver, 'Emulation.setScriptExecutionDisabled', {'value': True})
+    except:
+        time.sleep(seconds)
+        return
+    try:
+        time.sleep(seconds)
+    finally:
+        for attempt in range(2):
+            try:
+                execute_cdp_cmd(driver, 'Emulation.setScriptExecutionDisabled', {'value': False})
+                break
+            except Exception as e:
+                error = e
+        else:
+            print(f'  [{browser_type}] ❌ Could not re-enable page scripts: {str(error)[:100]}')
+            driver._session_dead = True
+            raise WebDriverException('Driver connection lost: page scripts left disabled')
+
+# ============================================
+# BROWSER OPTIONS
+# ============================================
+# Everything here is the same for every session; create_driver only adds
+# the user agent, window size and language
+
+_CHROME_ARGUMENTS = (
+    # Enable remote debugging so we can connect to CDP from outside the container
+    '--remote-debugging-port=9222',
+    '--remote-debugging-address=0.0.0.0',
+    
+    # Selenium Stealth recommended options
+    '--disable-blink-features=AutomationControlled',
+    
+    # Additional Facebook/anti-bot detection prevention
+    '--disable-features=IsolateOrigins,site-per-process,SitePerProcess',
+    '--disable-site-isolation-trials',
+    
+    # Additional stealth arguments from the article
+    '--disable-popup-blocking',
+    '--start-maximized',
+    '--disable-extensions',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-setuid-sandbox',
+    '--disable-infobars',
+    
+    # Additional anti-detection for Facebook and modern sites
+    '--enable-features=NetworkService,NetworkServiceInProcess',
+    '--disable-features=VizDisplayCompositor',
+    '--force-color-profile=srgb',
+    '--metrics-recording-only',
+    '--use-mock-keychain',
+)
+
+# Additional stealth preferences
+_CHROME_PREFS = {
+    "profile.default_content_setting_values.notifications": 2,
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+    "webrtc.ip_handling_policy": "disable_non_proxied_udp",
+    "webrtc.multiple_routes_enabled": False,
+    "webrtc.nonproxied_udp_enabled": False,
+    # Disable external protocol handler prompts
+    "profile.default_content_setting_values.protocol_handlers": 2,
+    "profile.content_settings.exceptions.protocol_handlers": {}
+}
+
+# Comprehensive Firefox stealth preferences, as (name, value) pairs
+_FIREFOX_PREFERENCES = (
+    ("dom.webdriver.enabled", False),
+    ("useAutomationExtension", False),
+    ("marionette", True),
+    
+    # Privacy & tracking preferences
+    ("privacy.trackingprotection.enabled", False),
+    ("geo.enabled", False),
+    ("geo.provider.use_corelocation", False),
+    ("geo.prompt.testing", False),
+    ("geo.prompt.testing.allow", False),
+    
+    # Media preferences (disable WebRTC leaks)
+    ("media.peerconnection.enabled", False),
+    ("media.navigator.enabled", False),
+    
+    # Disable leak detection
+    ("network.http.sendRefererHeader", 0),
+    ("network.http.sendSecureXSiteReferrer", False),
+    
+    # Canvas fingerprinting protection
+    ("privacy.resistFingerprinting", True),
+    ("privacy.trackingprotection.fingerprinting.enabled", True),
+    
+    # WebGL fingerprinting
+    ("webgl.disabled", False),
+    ("privacy.resistFingerprinting.block_mozAddonManager", True),
+    
+    # Notifications
+    ("dom.webnotifications.enabled", False),
+    ("dom.push.enabled", False),
+    
+    # Additional anti-detection
+    ("browser.startup.page", 0),
+    ("browser.cache.disk.enable", False),
+    ("browser.cache.memory.enable", False),
+    ("browser.cache.offline.enable", False),
+    ("network.http.use-cache", False),
+    
+    # Disable external protocol handler prompts (xdg-open, etc.)
+    ("network.protocol-handler.external-default", False),
+    ("network.protocol-handler.warn-external-default", False),
+    ("network.protocol-handler.expose-all", False),
+    ("network.protocol-handler.expose.http", True),
+    ("network.protocol-handler.expose.https", True),
+    ("network.protocol-handler.expose.ftp", True),
+    # Disable specific protocol handlers that trigger popups
+    ("network.protocol-handler.external.mailto", False),
+    ("network.protocol-handler.external.news", False),
+    ("network.protocol-handler.external.nntp", False),
+    ("network.protocol-handler.external.snews", False),
+    ("network.protocol-handler.external.tel", False),
+    ("network.protocol-handler.external.webcal", False),
+    ("network.protocol-handler.external.ms-windows-store", False),
+)
+
+_EDGE_ARGUMENTS = (
+    # Enable remote debugging so we can connect to CDP from outside the container
+    '--remote-debugging-port=9222',
+    '--remote-debugging-address=0.0.0.0',
+    
+    # Comprehensive Edge stealth configuration
+    '--disable-blink-features=AutomationControlled',
+    
+    # Additional Edge-specific stealth arguments
+    '--disable-popup-blocking',
+    '--start-maximized',
+    '--disable-extensions',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-setuid-sandbox',
+    '--disable-infobars',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process,VizDisplayCompositor',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+)
+
+# Edge preferences (similar to Chrome)
+_EDGE_PREFS = {
+    "profile.default_content_setting_values.notifications": 2,
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+    "webrtc.ip_handling_policy": "disable_non_proxied_udp",
+    "webrtc.multiple_routes_enabled": False,
+    "webrtc.nonproxied_udp_enabled": False,
+    "profile.default_content_setting_values.media_stream_mic": 2,
+    "profile.default_content_setting_values.media_stream_camera": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    # Disable external protocol handler prompts
+    "profile.default_content_setting_values.protocol_handlers": 2,
+    "profile.content_settings.exceptions.protocol_handlers": {}
+}
+
+# ============================================
+# STEALTH SCRIPT
+# ============================================
+
+def _minify_js(source):
+    """
+    Strip indentation, blank lines and whole-line comments from a script
     
-    # Save persona to disk for rotation across sessions
-    if persona_manager:
-        try:
-            fingerprint_data = fingerprint_to_dict(
-                browser_type, user_agent, accept_language, screen, gpu, hardware,
-                connection, timezone_offset, battery, media_devices, fonts, webrtc, plugins_js
-            )
-            persona_id = persona_manager.create_persona(fingerprint_data)
-            print(f'[{browser_type}] 💾 Saved persona: {persona_id}')
-        except Exception as e:
-            print(f'[{browser_type}] ⚠️  Failed to save persona: {str(e)[:50]}')
-    
-    print(f'[{browser_type}] Generated UA: {user_agent[:80]}...')
-    print(f'[{browser_type}] Language: {accept_language.split(",")[0]}')
-    print(f'[{browser_type}] Screen: {screen["width"]}x{screen["height"]} @ {screen["devicePixelRatio"]}x DPR')
-    print(f'[{browser_type}] GPU: {gpu["vendor"]} / {gpu["renderer"][:50]}{"... [Multi-GPU]" if gpu["isMultiGPU"] else ""}')
-    print(f'[{browser_type}] Hardware: {hardware["hardwareConcurrency"]} cores, {hardware["deviceMemory"]}GB RAM, {hardware["maxTouchPoints"]} touch')
-    print(f'[{browser_type}] Connection: {connection["effectiveType"]}, {connection["rtt"]}ms RTT, {connection["downlink"]}Mbps')
-    print(f'[{browser_type}] Timezone: UTC{timezone_offset/60:+.0f}')
-    print(f'[{browser_type}] Battery: {"Charging" if battery["charging"] else "Discharging"} at {int(battery["level"]*100)}%')
-    print(f'[{browser_type}] WebRTC: {len(webrtc["localIPs"])} local IPs')
-    print(f'[{browser_type}] Media: {len(media_devices)} devices, Fonts: {len(fonts)} installed, Plugins: randomized')
-    
-    if browser_type == 'chrome' or browser_type == 'chromium':
-        options = webdriver.ChromeOptions()
-        
-        # Set browser name for Selenium Grid to pick the right nodes
-        # Selenium Grid uses 'chrome' for both chrome and chromium
-        options.set_capability('browserName', 'chrome')
-        
-        # Enable remote debugging so we can connect to CDP from outside the container
-        options.add_argument('--remote-debugging-port=9222')
-        options.add_argument('--remote-debugging-address=0.0.0.0')
-        
-        # Selenium Stealth recommended options
-        options.add_argument(f'user-agent={user_agent}')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        # Additional Facebook/anti-bot detection prevention
-        options.add_argument('--disable-features=IsolateOrigins,site-per-process,SitePerProcess')
-        options.add_argument('--disable-site-isolation-trials')
-        
-        # Additional stealth arguments from the article
-        options.add_argument('--disable-popup-blocking')
-        options.add_argument('--start-maximized')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-setuid-sandbox')
-        options.add_argument('--disable-infobars')
-        options.add_argument(f'--window-size={screen["width"]},{screen["height"]}')
-        options.add_argument(f'--lang={accept_language.split(",")[0].split(";")[0]}')
-        
-        # Additional anti-detection for Facebook and modern sites
-        options.add_argument('--enable-features=NetworkService,NetworkServiceInProcess')
-        options.add_argument('--disable-features=VizDisplayCompositor')
-        options.add_argument('--force-color-profile=srgb')
-        options.add_argument('--metrics-recording-only')
-        options.add_argument('--use-mock-keychain')
-        
-        # Additional stealth preferences
-        prefs = {
-            "profile.default_content_setting_values.notifications": 2,
-            "credentials_enable_service": False,
-            "profile.password_manager_enabled": False,
-            "webrtc.ip_handling_policy": "disable_non_proxied_udp",
-            "webrtc.multiple_routes_enabled": False,
-            "webrtc.nonproxied_udp_enabled": False,
-            # Disable external protocol handler prompts
-            "profile.default_content_setting_values.protocol_handlers": 2,
-            "profile.content_settings.exceptions.protocol_handlers": {}
-        }
-        options.add_experimental_option("prefs", prefs)
-        
-    elif browser_type == 'firefox':
-        options = webdriver.FirefoxOptions()
-        
-        # Comprehensive Firefox stealth preferences
-        options.set_preference("general.useragent.override", user_agent)
-        options.set_preference("dom.webdriver.enabled", False)
-        options.set_preference("useAutomationExtension", False)
-        options.set_preference("marionette", True)
-        
-        # Language preferences
-        options.set_preference("intl.accept_languages", accept_language)
-        options.set_preference("intl.locale.requested", accept_language.split(",")[0].split(";")[0])
-        
-        # Privacy & tracking preferences
-        options.set_preference("privacy.trackingprotection.enabled", False)
-        options.set_preference("geo.enabled", False)
-        options.set_preference("geo.provider.use_corelocation", False)
-        options.set_preference("geo.prompt.testing", False)
-        options.set_preference("geo.prompt.testing.allow", False)
-        
-        # Media preferences (disable WebRTC leaks)
-        options.set_preference("media.peerconnection.enabled", False)
-        options.set_preference("media.navigator.enabled", False)
-        
-        # Disable leak detection
-        options.set_preference("network.http.sendRefererHeader", 0)
-        options.set_preference("network.http.sendSecureXSiteReferrer", False)
-        
-        # Canvas fingerprinting protection
-        options.set_preference("privacy.resistFingerprinting", True)
-        options.set_preference("privacy.trackingprotection.fingerprinting.enabled", True)
-        
-        # WebGL fingerprinting
-        options.set_preference("webgl.disabled", False)
-        options.set_preference("privacy.resistFingerprinting.block_mozAddonManager", True)
-        
-        # Notifications
-        options.set_preference("dom.webnotifications.enabled", False)
-        options.set_preference("dom.push.enabled", False)
-        
-        # Additional anti-detection
-        options.set_preference("browser.startup.page", 0)
-        options.set_preference("browser.cache.disk.enable", False)
-        options.set_preference("browser.cache.memory.enable", False)
-        options.set_preference("browser.cache.offline.enable", False)
-        options.set_preference("network.http.use-cache", False)
-        
-        # Disable external protocol handler prompts (xdg-open, etc.)
-        options.set_preference("network.protocol-handler.external-default", False)
-        options.set_preference("network.protocol-handler.warn-external-default", False)
-        options.set_preference("network.protocol-handler.expose-all", False)
-        options.set_preference("network.protocol-handler.expose.http", True)
-        options.set_preference("network.protocol-handler.expose.https", True)
-        options.set_preference("network.protocol-handler.expose.ftp", True)
-        # Disable specific protocol handlers that trigger popups
-        options.set_preference("network.protocol-handler.external.mailto", False)
-        options.set_preference("network.protocol-handler.external.news", False)
-        options.set_preference("network.protocol-handler.external.nntp", False)
-        options.set_preference("network.protocol-handler.external.snews", False)
-        options.set_preference("network.protocol-handler.external.tel", False)
-        options.set_preference("network.protocol-handler.external.webcal", False)
-        options.set_preference("network.protocol-handler.external.ms-windows-store", False)
-        
-    elif browser_type == 'edge':
-        options = webdriver.EdgeOptions()
-        
-        # Enable remote debugging so we can connect to CDP from outside the container
-        options.add_argument('--remote-debugging-port=9222')
-        options.add_argument('--remote-debugging-address=0.0.0.0')
-        
-        # Comprehensive Edge stealth configuration
-        options.add_argument(f'user-agent={user_agent}')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        # Additional Edge-specific stealth arguments
-        options.add_argument('--disable-popup-blocking')
-        options.add_argument('--start-maximized')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-setuid-sandbox')
-        options.add_argument('--disable-infobars')
-        options.add_argument(f'--window-size={screen["width"]},{screen["height"]}')
-        options.add_argument('--disable-web-security')
-        options.add_argument('--disable-features=IsolateOrigins,site-per-process,VizDisplayCompositor')
-        options.add_argument(f'--lang={accept_language.split(",")[0].split(";")[0]}')
-        options.add_argument('--disable-background-timer-throttling')
-        options.add_argument('--disable-backgrounding-occluded-windows')
-        options.add_argument('--disable-renderer-backgrounding')
-        
-        # Edge preferences (similar to Chrome)
-        prefs = {
-            "profile.default_content_setting_values.notifications": 2,
-            "credentials_enable_service": False,
-            "profile.password_manager_enabled": False,
-            "webrtc.ip_handling_policy": "disable_non_proxied_udp",
-            "webrtc.multiple_routes_enabled": False,
-            "webrtc.nonproxied_udp_enabled": False,
-            "profile.default_content_setting_values.media_stream_mic": 2,
-            "profile.default_content_setting_values.media_stream_camera": 2,
-            "profile.default_content_setting_values.geolocation": 2,
-            # Disable external protocol handler prompts
-            "profile.default_content_setting_values.protocol_handlers": 2,
-            "profile.content_settings.exceptions.protocol_handlers": {}
-        }
-        options.add_experimental_option("prefs", prefs)
-    else:
-        raise ValueError(f"Unsupported browser: {browser_type}")
-    
-    # ============================================
-    # RETRY LOGIC FOR SESSION CREATION
-    # ============================================
-    print(f'[{browser_type}] Creating browser session with stealth mode...')
-    
-    last_error = None
-    for attempt in range(1, max_retries + 1):
-        try:
-            if attempt > 1:
-                print(f'[{browser_type}] 🔄 Retry attempt {attempt}/{max_retries}...')
-                time.sleep(5 * attempt)  # Exponential backoff
-            
-            driver = webdriver.Remote(
-                command_executor='http://selenium-hub:4444/wd/hub',
-                options=options
-            )
-            
-            # If successful, break out of retry loop
-            print(f'[{browser_type}] ✅ Session created successfully')
-            break
-            
-        except Exception as e:
-            last_error = e
-            error_msg = str(e)
-            print(f'[{browser_type}] ⚠ Session creation attempt {attempt}/{max_retries} failed: {error_msg[:100]}')
-            
-            if attempt < max_retries:
-                if 'timeout' in error_msg.lower() or 'timed out' in error_msg.lower():
-                    print(f'[{browser_type}] 💤 Selenium Grid is overloaded, waiting before retry...')
-                elif 'unable to connect to renderer' in error_msg.lower():
-                    print(f'[{browser_type}] 💥 Renderer crash, waiting before retry...')
-            else:
-                # Final attempt failed
-                print(f'[{browser_type}] ❌ Failed to create session after {max_retries} attempts')
-                raise Exception(f"Could not create {browser_type} session after {max_retries} attempts: {error_msg}")
-    
-    # ============================================
-    # CDP SETUP - Selenium Grid 4 Native Support
-    # ============================================
-    # Selenium Grid 4 has built-in CDP support via WebSocket tunneling
-    # driver.execute_cdp_cmd() works directly with RemoteWebDriver
+    Line breaks are kept, so automatic semicolon insertion still applies and
+    string or regex literals are never touched.
     
-    if browser_type in ['chrome', 'chromium', 'edge']:
-        print(f'[{browser_type}] 🔧 Initializing CDP (Chrome DevTools Protocol)...')
-        
-        try:
-            # Test basic CDP connection
-            version = driver.execute_cdp_cmd('Browser.getVersion', {})
-            browser_version = version.get('product', 'Unknown')
-            protocol_version = version.get('protocolVersion', 'Unknown')
-            print(f'[{browser_type}] ✓ CDP connected: {browser_version}')
-            print(f'[{browser_type}]   Protocol version: {protocol_version}')
-            
-            # Enable CDP domains for page-level commands
-            try:
-                print(f'[{browser_type}] 🔌 Enabling CDP domains...')
-                driver.execute_cdp_cmd('Network.enable', {})
-                print(f'[{browser_type}]   ✓ Network domain enabled')
-                
-                driver.execute_cdp_cmd('Page.enable', {})
-                print(f'[{browser_type}]   ✓ Page domain enabled')
-                
-                # Apply CDP-based stealth
-                print(f'[{browser_type}] 🎭 Applying CDP stealth overrides...')
-                
-                # Override user agent via CDP (more reliable than --user-agent flag)
-                driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                    "userAgent": user_agent,
-                    "platform": "Win32",
-                    "acceptLanguage": accept_language
-                })
-                print(f'[{browser_type}]   ✓ User agent overridden via CDP')
-                print(f'[{browser_type}]   UA: {user_agent[:60]}...')
-                
-                # Set extra HTTP headers for authenticity
-                driver.execute_cdp_cmd('Network.setExtraHTTPHeaders', {
-                    'headers': {
-                        'Accept-Language': accept_language,
-                        'Accept-Encoding': 'gzip, deflate, br',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'DNT': '1',
-                        'Upgrade-Insecure-Requests': '1'
-                    }
-                })
-                print(f'[{browser_type}]   ✓ Extra HTTP headers configured')
-                
-                # Disable cache for realistic behavior
-                driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
-                print(f'[{browser_type}]   ✓ Network cache disabled')
-                
-                # Set download behavior (prevent downloads from blocking)
-                driver.execute_cdp_cmd('Page.setDownloadBehavior', {
-                    'behavior': 'deny'
-                })
-                print(f'[{browser_type}]   ✓ Downloads blocked')
-                
-                print(f'[{browser_type}] ✅ Full CDP stealth active!')
-                
-            except Exception as e:
-                print(f'[{browser_type}] ⚠ Page-level CDP commands failed: {str(e)[:80]}')
-                print(f'[{browser_type}] ℹ Falling back to JavaScript-based stealth')
-                
-        except (AttributeError, Exception) as e:
-            print(f'[{browser_type}] ⚠ Native CDP unavailable: {str(e)[:80]}')
-            print(f'[{browser_type}] ℹ Using JavaScript stealth only')
+    Args:
+        source: JavaScript source
     
-    elif browser_type == 'firefox':
-        # For Firefox, inject comprehensive stealth script after page load
-        driver._stealth_js = f'''
+    Returns:
+        Minified source
+    """
+    lines = (line.strip() for line in source.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+# Fingerprint overrides shared by every browser. Chromium registers the script
+# once through CDP (Page.addScriptToEvaluateOnNewDocument); Firefox has no CDP,
+# so it is injected with execute_script after every page load. Templates are
+# built once at import; only the per-session fingerprint values are
+# substituted (see build_stealth_js)
+_COMMON_STEALTH_JS = '''
             // ============================================
             // ADVANCED WEBDRIVER ARTIFACT REMOVAL
             // ============================================
             
-            // Remove all Gecko/Firefox driver artifacts
+            // Remove all driver artifacts
             delete window.__webdriver_evaluate;
             delete window.__selenium_evaluate;
             delete window.__webdriver_script_func;
             delete window.__webdriver_script_fn;
-            delete window.__fxdriver_evaluate;
             delete window.__driver_unwrapped;
             delete window.__webdriver_unwrapped;
-            delete window.__fxdriver_unwrapped;
             
             // Remove document-level script caches
             delete document.__webdriver_script_fn;
@@ -3905,348 +4482,784 @@ def create_driver(browser_type, max_retries=3):
             delete document.__webdriver_unwrapped;
             delete document.__driver_evaluate;
             delete document.__webdriver_evaluate;
-            delete document.__fxdriver_evaluate;
             delete document.__driver_unwrapped;
-            delete document.__fxdriver_unwrapped;
             delete document.__webdriver_script_func;
             
             // Remove all variations using regex
-            Object.keys(window).forEach(key => {{
-                if (key.match(/^(__webdriver|__selenium|__fxdriver|__driver|__gecko)/)) {{
-                    try {{
+            Object.keys(window).forEach(key => {
+                if (key.match(/^(__webdriver|__selenium|__fxdriver|__driver|__gecko)/)) {
+                    try {
                         delete window[key];
-                    }} catch (e) {{}}
-                }}
-            }});
+                    } catch (e) {}
+                }
+            });
             
             // Override Function.prototype.toString to hide proxy behavior
             const originalToString = Function.prototype.toString;
-            const newToString = function() {{
+            const newToString = function() {
                 if (this === navigator.webdriver || 
-                    this === Navigator.prototype.webdriver) {{
-                    return 'function webdriver() {{ [native code] }}';
-                }}
+                    this === Navigator.prototype.webdriver) {
+                    return 'function webdriver() { [native code] }';
+                }
                 const str = originalToString.call(this);
                 return str;
-            }};
+            };
             
-            Object.defineProperty(Function.prototype, 'toString', {{
+            Object.defineProperty(Function.prototype, 'toString', {
                 value: newToString,
                 writable: true,
                 configurable: true,
                 enumerable: false
-            }});
+            });
             
             // ============================================
             // NAVIGATOR PROPERTY OVERRIDES
             // ============================================
             
             // Remove webdriver property
-            Object.defineProperty(navigator, 'webdriver', {{
+            Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined,
                 configurable: true
-            }});
+            });
             
             // Override screen properties with randomized values
-            Object.defineProperty(screen, 'width', {{
-                get: () => {screen["width"]},
-                configurable: true
-            }});
-            Object.defineProperty(screen, 'height', {{
-                get: () => {screen["height"]},
-                configurable: true
-            }});
-            Object.defineProperty(screen, 'availWidth', {{
-                get: () => {screen["availWidth"]},
-                configurable: true
-            }});
-            Object.defineProperty(screen, 'availHeight', {{
-                get: () => {screen["availHeight"]},
+            Object.defineProperty(screen, 'width', {
+                get: () => ${screen_width},
                 configurable: true
-            }});
-            Object.defineProperty(screen, 'colorDepth', {{
-                get: () => {screen["colorDepth"]},
+            });
+            Object.defineProperty(screen, 'height', {
+                get: () => ${screen_height},
                 configurable: true
-            }});
-            Object.defineProperty(screen, 'pixelDepth', {{
-                get: () => {screen["pixelDepth"]},
+            });
+            Object.defineProperty(screen, 'availWidth', {
+                get: () => ${screen_avail_width},
                 configurable: true
-            }});
-            Object.defineProperty(window, 'devicePixelRatio', {{
-                get: () => {screen["devicePixelRatio"]},
+            });
+            Object.defineProperty(screen, 'availHeight', {
+                get: () => ${screen_avail_height},
                 configurable: true
-            }});
-            
-            // Also override window.innerWidth/Height to match screen
-            Object.defineProperty(window, 'innerWidth', {{
-                get: () => {screen["width"]},
-                configurable: true
-            }});
-            Object.defineProperty(window, 'innerHeight', {{
-                get: () => {screen["availHeight"]},
+            });
+            Object.defineProperty(screen, 'colorDepth', {
+                get: () => ${screen_color_depth},
                 configurable: true
-            }});
-            Object.defineProperty(window, 'outerWidth', {{
-                get: () => {screen["width"]},
+            });
+            Object.defineProperty(screen, 'pixelDepth', {
+                get: () => ${screen_pixel_depth},
                 configurable: true
-            }});
-            Object.defineProperty(window, 'outerHeight', {{
-                get: () => {screen["height"]},
+            });
+            Object.defineProperty(window, 'devicePixelRatio', {
+                get: () => ${device_pixel_ratio},
                 configurable: true
-            }});
+            });
             
             // Mock plugins (randomized per session, PDF plugins heavily varied)
-            Object.defineProperty(navigator, 'plugins', {{
-                get: () => {plugins_js},
+            Object.defineProperty(navigator, 'plugins', {
+                get: () => ${plugins_js},
                 configurable: true
-            }});
+            });
             
             // Mock mimeTypes  
-            Object.defineProperty(navigator, 'mimeTypes', {{
+            Object.defineProperty(navigator, 'mimeTypes', {
                 get: () => [
-                    {{type: "application/pdf", suffixes: "pdf", description: "Portable Document Format"}}
+                    {type: "application/pdf", suffixes: "pdf", description: "Portable Document Format"}
                 ],
                 configurable: true
-            }});
+            });
             
             // Mock languages
-            Object.defineProperty(navigator, 'languages', {{
-                get: () => ['en-US', 'en'],
+            Object.defineProperty(navigator, 'languages', {
+                get: () => ${languages},
                 configurable: true
-            }});
+            });
             
             // Mock connection (for Network Information API)
-            Object.defineProperty(navigator, 'connection', {{
-                get: () => ({{
-                    effectiveType: '{connection["effectiveType"]}',
-                    rtt: {connection["rtt"]},
-                    downlink: {connection["downlink"]},
-                    saveData: {str(connection["saveData"]).lower()},
+            Object.defineProperty(navigator, 'connection', {
+                get: () => ({
+                    effectiveType: '${connection_effective_type}',
+                    rtt: ${connection_rtt},
+                    downlink: ${connection_downlink},
+                    saveData: ${connection_save_data},
                     onchange: null
-                }}),
+                }),
                 configurable: true
-            }});
+            });
             
             // Mock hardwareConcurrency (randomized)
-            Object.defineProperty(navigator, 'hardwareConcurrency', {{
-                get: () => {hardware["hardwareConcurrency"]},
+            Object.defineProperty(navigator, 'hardwareConcurrency', {
+                get: () => ${hardware_concurrency},
                 configurable: true
-            }});
+            });
             
             // Mock deviceMemory (randomized)
-            Object.defineProperty(navigator, 'deviceMemory', {{
-                get: () => {hardware["deviceMemory"]},
+            Object.defineProperty(navigator, 'deviceMemory', {
+                get: () => ${device_memory},
                 configurable: true
-            }});
+            });
             
             // Mock maxTouchPoints (randomized based on device)
-            Object.defineProperty(navigator, 'maxTouchPoints', {{
-                get: () => {hardware["maxTouchPoints"]},
+            Object.defineProperty(navigator, 'maxTouchPoints', {
+                get: () => ${max_touch_points},
                 configurable: true
-            }});
+            });
             
             // Override timezone offset
-            Date.prototype.getTimezoneOffset = function() {{
-                return {timezone_offset};
-            }};
+            Date.prototype.getTimezoneOffset = function() {
+                return ${timezone_offset};
+            };
             
             // Mock Battery API with randomized realistic values
-            if (navigator.getBattery) {{
-                const batteryInfo = {{
-                    charging: {str(battery["charging"]).lower()},
-                    chargingTime: {battery["chargingTime"]},
-                    dischargingTime: {battery["dischargingTime"]},
-                    level: {battery["level"]},
-                    addEventListener: function() {{}},
-                    removeEventListener: function() {{}},
+            if (navigator.getBattery) {
+                const batteryInfo = {
+                    charging: ${battery_charging},
+                    chargingTime: ${battery_charging_time},
+                    dischargingTime: ${battery_discharging_time},
+                    level: ${battery_level},
+                    addEventListener: function() {},
+                    removeEventListener: function() {},
                     onchargingchange: null,
                     onchargingtimechange: null,
                     ondischargingtimechange: null,
                     onlevelchange: null
-                }};
+                };
                 navigator.getBattery = () => Promise.resolve(batteryInfo);
-            }}
+            }
             
             // Mock media device enumeration with randomized realistic devices
-            if (navigator.mediaDevices && navigator.mediaDevices.enumerateDevices) {{
-                const devices = {str(media_devices).replace("'", '"')};
-                navigator.mediaDevices.enumerateDevices = () => {{
+            if (navigator.mediaDevices && navigator.mediaDevices.enumerateDevices) {
+                const devices = ${media_devices};
+                navigator.mediaDevices.enumerateDevices = () => {
                     return Promise.resolve(devices);
-                }};
-            }}
+                };
+            }
+            
+            ${canvas_noise_js}
+            
+            // AudioContext fingerprinting - add randomized noise per session
+            const AudioContext = window.AudioContext || window.webkitAudioContext;
+            if (AudioContext) {
+                const audioNoise = Math.random() * 0.0002 - 0.0001;
+                
+                // Noise tables built once per document and indexed with i & 4095,
+                // instead of a Math.random() call per sample
+                const AUDIO_NOISE_TABLE = new Float32Array(4096);
+                const FREQUENCY_NOISE_TABLE = new Float32Array(4096);
+                for (let k = 0; k < 4096; k++) {
+                    AUDIO_NOISE_TABLE[k] = audioNoise + (Math.random() - 0.5) * 0.00005;
+                    FREQUENCY_NOISE_TABLE[k] = (Math.random() - 0.5) * 0.1;
+                }
+                
+                const originalGetChannelData = AudioBuffer.prototype.getChannelData;
+                AudioBuffer.prototype.getChannelData = function(channel) {
+                    const originalData = originalGetChannelData.call(this, channel);
+                    // Add randomized noise per session
+                    const n = originalData.length;
+                    for (let i = 0; i < n; i++) {
+                        originalData[i] += AUDIO_NOISE_TABLE[i & 4095];
+                    }
+                    return originalData;
+                };
+                
+                const OriginalAnalyser = window.AnalyserNode || window.webkitAnalyserNode;
+                if (OriginalAnalyser) {
+                    const originalGetFloatFrequencyData = OriginalAnalyser.prototype.getFloatFrequencyData;
+                    OriginalAnalyser.prototype.getFloatFrequencyData = function(array) {
+                        originalGetFloatFrequencyData.call(this, array);
+                        const n = array.length;
+                        for (let i = 0; i < n; i++) {
+                            array[i] += FREQUENCY_NOISE_TABLE[i & 4095];
+                        }
+                    };
+                }
+            }
+            
+            // Font fingerprinting - wildly randomized per session
+            const availableFonts = ${fonts};
+            const originalMeasureText = CanvasRenderingContext2D.prototype.measureText;
+            CanvasRenderingContext2D.prototype.measureText = function(text) {
+                const metrics = originalMeasureText.call(this, text);
+                // Add noise to font metrics
+                const noise = (Math.random() - 0.5) * 0.0002;
+                Object.defineProperty(metrics, 'width', {
+                    value: metrics.width + noise,
+                    writable: false
+                });
+                return metrics;
+            };
+            
+            // WebGL fingerprinting protection
+            const webglOverrides = new Map([
+                [37445, ${gpu_vendor}],       // UNMASKED_VENDOR_WEBGL
+                [37446, ${gpu_renderer}]      // UNMASKED_RENDERER_WEBGL
+            ]);
+            // WebGL2RenderingContext is a sibling of WebGLRenderingContext, not a
+            // subclass, so both prototypes are patched with the same override
+            const webglPrototypes = [WebGLRenderingContext.prototype];
+            if (typeof WebGL2RenderingContext !== 'undefined') {
+                webglPrototypes.push(WebGL2RenderingContext.prototype);
+            }
+            webglPrototypes.forEach(proto => {
+                const getParameter = proto.getParameter;
+                proto.getParameter = function(parameter) {
+                    const value = webglOverrides.get(parameter);
+                    return value !== undefined ? value : getParameter.call(this, parameter);
+                };
+            });
+            
+            // WebRTC IP randomization (enable but with random local IPs per session)
+            const randomLocalIPsFF = ${local_ips};
+            const OriginalRTCPeerConnectionFF = window.RTCPeerConnection || window.webkitRTCPeerConnection || window.mozRTCPeerConnection;
+            if (OriginalRTCPeerConnectionFF) {
+                window.RTCPeerConnection = function(...args) {
+                    const pc = new OriginalRTCPeerConnectionFF(...args);
+                    const originalCreateOffer = pc.createOffer;
+                    const originalCreateAnswer = pc.createAnswer;
+                    
+                    // Inject random IPs into SDP
+                    const injectRandomIPs = (sdp) => {
+                        if (sdp && sdp.sdp && randomLocalIPsFF.length > 0) {
+                            const randomIP = randomLocalIPsFF[Math.floor(Math.random() * randomLocalIPsFF.length)];
+                            // Replace candidate IPs with our random ones
+                            sdp.sdp = sdp.sdp.replace(/([0-9]{1,3}\\.){3}[0-9]{1,3}/g, randomIP);
+                        }
+                        return sdp;
+                    };
+                    
+                    pc.createOffer = function(...args2) {
+                        return originalCreateOffer.apply(this, args2).then(injectRandomIPs);
+                    };
+                    
+                    pc.createAnswer = function(...args2) {
+                        return originalCreateAnswer.apply(this, args2).then(injectRandomIPs);
+                    };
+                    
+                    return pc;
+                };
+                window.RTCPeerConnection.prototype = OriginalRTCPeerConnectionFF.prototype;
+                if (window.mozRTCPeerConnection) {
+                    window.mozRTCPeerConnection = window.RTCPeerConnection;
+                }
+            }
+            
+            // Mock permissions
+            if (navigator.permissions) {
+                const originalQuery = navigator.permissions.query;
+                navigator.permissions.query = function(parameters) {
+                    if (parameters.name === 'notifications') {
+                        return Promise.resolve({ state: 'denied' });
+                    }
+                    return originalQuery.call(navigator.permissions, parameters);
+                };
+            }
+        '''
+
+# Firefox-only delta, appended to the common script. The window size overrides
+# stay here: Chromium reports its real viewport, which layout code relies on
+_FIREFOX_STEALTH_JS = '''
+            // Remove Gecko/Firefox driver artifacts
+            delete window.__fxdriver_evaluate;
+            delete window.__fxdriver_unwrapped;
+            delete document.__fxdriver_evaluate;
+            delete document.__fxdriver_unwrapped;
+            
+            // Also override window.innerWidth/Height to match screen
+            Object.defineProperty(window, 'innerWidth', {
+                get: () => ${screen_width},
+                configurable: true
+            });
+            Object.defineProperty(window, 'innerHeight', {
+                get: () => ${screen_avail_height},
+                configurable: true
+            });
+            Object.defineProperty(window, 'outerWidth', {
+                get: () => ${screen_width},
+                configurable: true
+            });
+            Object.defineProperty(window, 'outerHeight', {
+                get: () => ${screen_height},
+                configurable: true
+            });
+        '''
+
+# Canvas noise, spliced into the script unless the browser perturbs canvas
+# reads natively (see NATIVE_CANVAS_NOISE)
+_CANVAS_NOISE_JS = string.Template(_minify_js('''// Canvas fingerprinting protection - add noise injection
+            const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
+            const originalGetImageData = CanvasRenderingContext2D.prototype.getImageData;
+            
+            // Consistent noise seed per session, as a 32-bit integer for the pixel hash
+            const noiseSeedInt = ${noise_seed} | 0;
+            
+            // Integer hash (lowbias32 mixer): well-distributed low bits, fixed cost
+            function h32(i, seed) {
+                let x = (i ^ seed) >>> 0;
+                x = Math.imul(x ^ (x >>> 16), 0x7feb352d);
+                x = Math.imul(x ^ (x >>> 15), 0x846ca68b);
+                return (x ^ (x >>> 16)) >>> 0;
+            }
+            
+            // Pixels are read as one 32-bit word; on little-endian hosts (all
+            // mainstream ones) R is the low byte and alpha the high byte
+            const LITTLE_ENDIAN = new Uint8Array(new Uint32Array([1]).buffer)[0] === 1;
+            
+            function clampByte(v) {
+                return v < 0 ? 0 : (v > 255 ? 255 : v);
+            }
+            
+            // Add consistent noise (-2..2) to the RGB channels. Noise is a hash
+            // of the pixel offset and the seed, so a canvas always reads back
+            // the same and pixels don't depend on each other
+            function addCanvasNoise(data) {
+                let noise;
+                if (!LITTLE_ENDIAN) {
+                    const n = data.length;
+                    for (let i = 0; i < n; i += 4) {
+                        noise = (h32(i, noiseSeedInt) % 5) - 2;
+                        data[i] += noise;     // R
+                        data[i+1] += noise;   // G
+                        data[i+2] += noise;   // B
+                    }
+                    return;
+                }
+                // One load and one store per pixel instead of three clamped byte writes
+                const pixels = new Uint32Array(data.buffer, data.byteOffset, data.length >> 2);
+                const n = pixels.length;
+                for (let p = 0; p < n; p++) {
+                    noise = (h32(p << 2, noiseSeedInt) % 5) - 2;
+                    const px = pixels[p];
+                    pixels[p] = (px & 0xFF000000) |
+                                (clampByte(((px >>> 16) & 0xFF) + noise) << 16) |
+                                (clampByte(((px >>> 8) & 0xFF) + noise) << 8) |
+                                clampByte((px & 0xFF) + noise);
+                }
+            }
+            
+            // 2D context per canvas (null for WebGL canvases), looked up once
+            const contextCache = new WeakMap();
+            function getContext2d(canvas) {
+                let context = contextCache.get(canvas);
+                if (context === undefined) {
+                    context = canvas.getContext('2d');
+                    contextCache.set(canvas, context);
+                }
+                return context;
+            }
+            
+            // Canvases up to 16x16 px (layout and DPI probes) are too small to
+            // fingerprint with and are passed through untouched
+            const MAX_UNNOISED_PIXELS = 256;
+            
+            // Add minimal noise to canvas data
+            HTMLCanvasElement.prototype.toDataURL = function(...args) {
+                if (this.width * this.height <= MAX_UNNOISED_PIXELS) {
+                    return originalToDataURL.apply(this, args);
+                }
+                const context = getContext2d(this);
+                if (context) {
+                    const imageData = context.getImageData(0, 0, this.width, this.height);
+                    addCanvasNoise(imageData.data);
+                    context.putImageData(imageData, 0, 0);
+                }
+                return originalToDataURL.apply(this, args);
+            };
+            
+            CanvasRenderingContext2D.prototype.getImageData = function(...args) {
+                const imageData = originalGetImageData.apply(this, args);
+                if (this.canvas.width * this.canvas.height > MAX_UNNOISED_PIXELS) {
+                    addCanvasNoise(imageData.data);
+                }
+                return imageData;
+            };
+'''))
+
+# Chrome and Edge use the common script as-is. Minified once here: the script
+# is sent over the hub for every session and parsed on every document
+_STEALTH_JS = string.Template(_minify_js(_COMMON_STEALTH_JS))
+_STEALTH_JS_BY_BROWSER = {
+    'firefox': string.Template(_minify_js(_COMMON_STEALTH_JS + _FIREFOX_STEALTH_JS)),
+}
+
+# Python values are embedded as JSON literals (valid JS, whitespace-free)
+_JSON_COMPACT = (',', ':')
+
+def navigator_languages(accept_language):
+    """
+    Language tags of an Accept-Language header, in order, for navigator.languages
+    
+    Args:
+        accept_language: Header value, e.g. 'fr-FR,fr;q=0.9,en;q=0.8'
+    
+    Returns:
+        list of language tags, e.g. ['fr-FR', 'fr', 'en']
+    """
+    return [part.split(';')[0].strip() for part in accept_language.split(',') if part.strip()]
+
+def build_stealth_js(browser_type, screen, gpu, hardware, connection, timezone_offset,
+                     accept_language, battery, media_devices, fonts, plugins_js, webrtc,
+                     native_canvas_noise=False):
+    """
+    Fill the stealth script with one session's fingerprint
+    
+    Args:
+        browser_type: 'chrome', 'firefox' or 'edge' (selects the browser delta)
+        screen: ScreenFingerprint
+        gpu: GPUFingerprint
+        hardware, connection, battery, webrtc: dicts from the generate_random_* helpers
+        timezone_offset: Timezone offset in minutes
+        accept_language: Accept-Language header sent by the session (navigator.languages matches it)
+        media_devices: Media device list
+        fonts: Font list
+        plugins_js: JSON array of plugins
+        native_canvas_noise: Leave out the JS canvas overrides (the browser adds the noise)
+    
+    Returns:
+        JavaScript source to run on every page load
+    """
+    return _STEALTH_JS_BY_BROWSER.get(browser_type, _STEALTH_JS).substitute(
+        screen_width=screen.width,
+        screen_height=screen.height,
+        screen_avail_width=screen.availWidth,
+        screen_avail_height=screen.availHeight,
+        screen_color_depth=screen.colorDepth,
+        screen_pixel_depth=screen.pixelDepth,
+        device_pixel_ratio=screen.devicePixelRatio,
+        plugins_js=plugins_js,
+        connection_effective_type=connection["effectiveType"],
+        connection_rtt=connection["rtt"],
+        connection_downlink=connection["downlink"],
+        connection_save_data=json.dumps(connection["saveData"]),
+        hardware_concurrency=hardware["hardwareConcurrency"],
+        device_memory=hardware["deviceMemory"],
+        max_touch_points=hardware["maxTouchPoints"],
+        timezone_offset=timezone_offset,
+        languages=json.dumps(navigator_languages(accept_language), separators=_JSON_COMPACT),
+        battery_charging=json.dumps(battery["charging"]),
+        battery_charging_time=battery["chargingTime"],
+        battery_discharging_time=battery["dischargingTime"],
+        battery_level=battery["level"],
+        media_devices=json.dumps(media_devices, separators=_JSON_COMPACT),
+        canvas_noise_js='' if native_canvas_noise else _CANVAS_NOISE_JS.substitute(
+            noise_seed=int.from_bytes(os.urandom(4), 'little')
+        ),
+        fonts=json.dumps(fonts, separators=_JSON_COMPACT),
+        gpu_vendor=json.dumps(gpu.vendor),
+        gpu_renderer=json.dumps(gpu.renderer),
+        local_ips=json.dumps(webrtc["localIPs"], separators=_JSON_COMPACT)
+    )
+
+def create_driver(browser_type, max_retries=3):
+    """Create a Selenium WebDriver for automated browsing with anti-detection
+    
+    Args:
+        browser_type: The browser to create (chrome, firefox, etc.)
+        max_retries: Maximum number of retry attempts for session creation
+        
+    Returns:
+        WebDriver instance
+        
+    Raises:
+        Exception: If unable to create driver after max_retries attempts
+    """
+    
+    # Take a pre-generated fingerprint bundle (UA, language, screen, GPU, hardware,
+    # connection, timezone, battery, media devices, fonts, plugins, WebRTC)
+    fingerprint = fingerprint_pool.get(browser_type)
+    user_agent = fingerprint['user_agent']
+    accept_language = fingerprint['accept_language']
+    screen = fingerprint['screen']
+    gpu = fingerprint['gpu']
+    hardware = fingerprint['hardware']
+    connection = fingerprint['connection']
+    timezone_offset = fingerprint['timezone_offset']
+    battery = fingerprint['battery']
+    media_devices = fingerprint['media_devices']
+    fonts = fingerprint['fonts']
+    plugins_js = fingerprint['plugins_js']
+    webrtc = fingerprint['webrtc']
+    
+    # Save persona to disk for rotation across sessions
+    if persona_manager:
+        try:
+            fingerprint_data = fingerprint_to_dict(
+                browser_type, user_agent, accept_language, screen._asdict(), gpu._asdict(), hardware,
+                connection, timezone_offset, battery, media_devices, fonts, webrtc, plugins_js
+            )
+            persona_id = persona_manager.create_persona(fingerprint_data)
+            print(f'[{browser_type}] 💾 Saved persona: {persona_id}')
+        except Exception as e:
+            print(f'[{browser_type}] ⚠️  Failed to save persona: {str(e)[:50]}')
+    
+    # Fingerprint summary as one write rather than one print per line
+    print('\n'.join((
+        f'[{browser_type}] Generated UA: {user_agent[:80]}...',
+        f'[{browser_type}] Language: {accept_language.split(",")[0]}',
+        f'[{browser_type}] Screen: {screen.width}x{screen.height} @ {screen.devicePixelRatio}x DPR',
+        f'[{browser_type}] GPU: {gpu.vendor} / {gpu.renderer[:50]}{"... [Multi-GPU]" if gpu.isMultiGPU else ""}',
+        f'[{browser_type}] Hardware: {hardware["hardwareConcurrency"]} cores, {hardware["deviceMemory"]}GB RAM, {hardware["maxTouchPoints"]} touch',
+        f'[{browser_type}] Connection: {connection["effectiveType"]}, {connection["rtt"]}ms RTT, {connection["downlink"]}Mbps',
+        f'[{browser_type}] Timezone: UTC{timezone_offset/60:+.0f}',
+        f'[{browser_type}] Battery: {"Charging" if battery["charging"] else "Discharging"} at {int(battery["level"]*100)}%',
+        f'[{browser_type}] WebRTC: {len(webrtc["localIPs"])} local IPs',
+        f'[{browser_type}] Media: {len(media_devices)} devices, Fonts: {len(fonts)} installed, Plugins: randomized',
+    )))
+    
+    # Static arguments/preferences are module constants, only the
+    # per-session values are added here
+    lang = accept_language.split(",")[0].split(";")[0]
+    
+    if browser_type == 'chrome' or browser_type == 'chromium':
+        options = webdriver.ChromeOptions()
+        
+        # Set browser name for Selenium Grid to pick the right nodes
+        # Selenium Grid uses 'chrome' for both chrome and chromium
+        options.set_capability('browserName', 'chrome')
+        
+        for argument in _CHROME_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_argument(f'user-agent={user_agent}')
+        options.add_argument(f'--window-size={screen.width},{screen.height}')
+        options.add_argument(f'--lang={lang}')
+        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+        options.add_experimental_option('useAutomationExtension', False)
+        options.add_experimental_option("prefs", {**_CHROME_PREFS})
+        
+    elif browser_type == 'firefox':
+        options = webdriver.FirefoxOptions()
+        
+        options.set_preference("general.useragent.override", user_agent)
+        options.set_preference("intl.accept_languages", accept_language)
+        options.set_preference("intl.locale.requested", lang)
+        for name, value in _FIREFOX_PREFERENCES:
+            options.set_preference(name, value)
+        
+    elif browser_type == 'edge':
+        options = webdriver.EdgeOptions()
+        
+        for argument in _EDGE_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_argument(f'user-agent={user_agent}')
+        options.add_argument(f'--window-size={screen.width},{screen.height}')
+        options.add_argument(f'--lang={lang}')
+        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+        options.add_experimental_option('useAutomationExtension', False)
+        options.add_experimental_option("prefs", {**_EDGE_PREFS})
+    else:
+        raise ValueError(f"Unsupported browser: {browser_type}")
+    
+    # ============================================
+    # RETRY LOGIC FOR SESSION CREATION
+    # ============================================
+    print(f'[{browser_type}] Creating browser session with stealth mode...')
+    
+    last_error = None
+    for attempt in range(1, max_retries + 1):
+        try:
+            if attempt > 1:
+                print(f'[{browser_type}] 🔄 Retry attempt {attempt}/{max_retries}...')
+                time.sleep(5 * attempt)  # Exponential backoff
             
-            // Canvas fingerprinting protection - add noise injection
-            const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
-            const originalGetImageData = CanvasRenderingContext2D.prototype.getImageData;
+            # keep_alive reuses one pooled HTTP connection to the hub for every
+            # WebDriver/CDP command of this session
+            driver = webdriver.Remote(
+                command_executor='http://selenium-hub:4444/wd/hub',
+                options=options,
+                keep_alive=True
+            )
             
-            // Generate consistent noise seed per session
-            const noiseSeed = {random.random()};
+            widen_hub_connection_pool(driver)
             
-            // Simple hash function for consistent noise
-            function simpleHash(str) {{
-                let hash = 0;
-                for (let i = 0; i < str.length; i++) {{
-                    hash = ((hash << 5) - hash) + str.charCodeAt(i);
-                    hash = hash & hash;
-                }}
-                return Math.abs(hash);
-            }}
+            # If successful, break out of retry loop
+            print(f'[{browser_type}] ✅ Session created successfully')
+            break
             
-            // Add minimal noise to canvas data
-            HTMLCanvasElement.prototype.toDataURL = function(...args) {{
-                const context = this.getContext('2d');
-                if (context) {{
-                    const imageData = context.getImageData(0, 0, this.width, this.height);
-                    for (let i = 0; i < imageData.data.length; i += 4) {{
-                        const noise = (simpleHash(i.toString() + noiseSeed) % 5) - 2;
-                        imageData.data[i] += noise;     // R
-                        imageData.data[i+1] += noise;   // G
-                        imageData.data[i+2] += noise;   // B
-                    }}
-                    context.putImageData(imageData, 0, 0);
-                }}
-                return originalToDataURL.apply(this, args);
-            }};
+        except Exception as e:
+            last_error = e
+            error_msg = str(e)
+            print(f'[{browser_type}] ⚠ Session creation attempt {attempt}/{max_retries} failed: {error_msg[:100]}')
             
-            CanvasRenderingContext2D.prototype.getImageData = function(...args) {{
-                const imageData = originalGetImageData.apply(this, args);
-                for (let i = 0; i < imageData.data.length; i += 4) {{
-                    const noise = (simpleHash(i.toString() + noiseSeed) % 5) - 2;
-                    imageData.data[i] += noise;     // R
-                    imageData.data[i+1] += noise;   // G
-                    imageData.data[i+2] += noise;   // B
-                }}
-                return imageData;
-            }};
+            if attempt < max_retries:
+                if 'timeout' in error_msg.lower() or 'timed out' in error_msg.lower():
+                    print(f'[{browser_type}] 💤 Selenium Grid is overloaded, waiting before retry...')
+                elif 'unable to connect to renderer' in error_msg.lower():
+                    print(f'[{browser_type}] 💥 Renderer crash, waiting before retry...')
+            else:
+                # Final attempt failed
+                print(f'[{browser_type}] ❌ Failed to create session after {max_retries} attempts')
+                raise Exception(f"Could not create {browser_type} session after {max_retries} attempts: {error_msg}")
+    
+    # ============================================
+    # CDP SETUP - Selenium Grid 4 Native Support
+    # ============================================
+    # Commands go over the driver's vendor CDP endpoint, which the hub forwards
+    # to the node like any other session command (see enable_cdp_commands)
+    
+    # Rendered with the fingerprint (caches from other versions are discarded on load)
+    stealth_js = fingerprint['stealth_js']
+    stealth_registered = False
+    
+    if enable_cdp_commands(driver, browser_type):
+        print(f'[{browser_type}] 🔧 Initializing CDP (Chrome DevTools Protocol)...')
+        
+        try:
+            # Test basic CDP connection
+            version = execute_cdp_cmd(driver, 'Browser.getVersion', {})
+            browser_version = version.get('product', 'Unknown')
+            protocol_version = version.get('protocolVersion', 'Unknown')
+            print(f'[{browser_type}] ✓ CDP connected: {browser_version}\n'
+                  f'[{browser_type}]   Protocol version: {protocol_version}')
             
-            // AudioContext fingerprinting - add randomized noise per session
-            const AudioContext = window.AudioContext || window.webkitAudioContext;
-            if (AudioContext) {{
-                const audioNoise = Math.random() * 0.0002 - 0.0001;
-                const originalGetChannelData = AudioBuffer.prototype.getChannelData;
-                AudioBuffer.prototype.getChannelData = function(channel) {{
-                    const originalData = originalGetChannelData.call(this, channel);
-                    // Add randomized noise per session
-                    for (let i = 0; i < originalData.length; i++) {{
-                        originalData[i] += audioNoise + (Math.random() - 0.5) * 0.00005;
-                    }}
-                    return originalData;
-                }};
+            # Enable CDP domains for page-level commands
+            try:
+                print(f'[{browser_type}] 🔌 Enabling CDP domains...')
+                # Page.enable is skipped: it only turns on event delivery, and events
+                # are never read over the hub's request/response CDP endpoint
+                if enable_cdp_domain(driver, 'Network'):
+                    print(f'[{browser_type}]   ✓ Network domain enabled')
                 
-                const OriginalAnalyser = window.AnalyserNode || window.webkitAnalyserNode;
-                if (OriginalAnalyser) {{
-                    const originalGetFloatFrequencyData = OriginalAnalyser.prototype.getFloatFrequencyData;
-                    OriginalAnalyser.prototype.getFloatFrequencyData = function(array) {{
-                        originalGetFloatFrequencyData.call(this, array);
-                        for (let i = 0; i < array.length; i++) {{
-                            array[i] += (Math.random() - 0.5) * 0.1;
-                        }}
-                    }};
-                }}
-            }}
-            
-            // Font fingerprinting - wildly randomized per session
-            const availableFonts = {str(fonts)};
-            const originalMeasureText = CanvasRenderingContext2D.prototype.measureText;
-            CanvasRenderingContext2D.prototype.measureText = function(text) {{
-                const metrics = originalMeasureText.call(this, text);
-                // Add noise to font metrics
-                const noise = (Math.random() - 0.5) * 0.0002;
-                Object.defineProperty(metrics, 'width', {{
-                    value: metrics.width + noise,
-                    writable: false
-                }});
-                return metrics;
-            }};
-            
-            // WebGL fingerprinting protection
-            const getParameter = WebGLRenderingContext.prototype.getParameter;
-            WebGLRenderingContext.prototype.getParameter = function(parameter) {{
-                // parameter 37445 = UNMASKED_VENDOR_WEBGL
-                if (parameter === 37445) {{
-                    return '{gpu["vendor"]}';
-                }}
-                // parameter 37446 = UNMASKED_RENDERER_WEBGL
-                if (parameter === 37446) {{
-                    return '{gpu["renderer"]}';
-                }}
-                return getParameter.call(this, parameter);
-            }};
-            
-            // Also override for WebGL2
-            if (typeof WebGL2RenderingContext !== 'undefined') {{
-                const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
-                WebGL2RenderingContext.prototype.getParameter = function(parameter) {{
-                    if (parameter === 37445) {{
-                        return '{gpu["vendor"]}';
-                    }}
-                    if (parameter === 37446) {{
-                        return '{gpu["renderer"]}';
-                    }}
-                    return getParameter2.call(this, parameter);
-                }};
-            }}
-            
-            // WebRTC IP randomization (enable but with random local IPs per session)
-            const randomLocalIPsFF = {str(webrtc["localIPs"])};
-            const OriginalRTCPeerConnectionFF = window.RTCPeerConnection || window.webkitRTCPeerConnection || window.mozRTCPeerConnection;
-            if (OriginalRTCPeerConnectionFF) {{
-                window.RTCPeerConnection = function(...args) {{
-                    const pc = new OriginalRTCPeerConnectionFF(...args);
-                    const originalCreateOffer = pc.createOffer;
-                    const originalCreateAnswer = pc.createAnswer;
-                    
-                    // Inject random IPs into SDP
-                    const injectRandomIPs = (sdp) => {{
-                        if (sdp && sdp.sdp && randomLocalIPsFF.length > 0) {{
-                            const randomIP = randomLocalIPsFF[Math.floor(Math.random() * randomLocalIPsFF.length)];
-                            // Replace candidate IPs with our random ones
-                            sdp.sdp = sdp.sdp.replace(/([0-9]{{1,3}}\\.){{3}}[0-9]{{1,3}}/g, randomIP);
-                        }}
-                        return sdp;
-                    }};
-                    
-                    pc.createOffer = function(...args2) {{
-                        return originalCreateOffer.apply(this, args2).then(injectRandomIPs);
-                    }};
-                    
-                    pc.createAnswer = function(...args2) {{
-                        return originalCreateAnswer.apply(this, args2).then(injectRandomIPs);
-                    }};
-                    
-                    return pc;
-                }};
-                window.RTCPeerConnection.prototype = OriginalRTCPeerConnectionFF.prototype;
-                if (window.mozRTCPeerConnection) {{
-                    window.mozRTCPeerConnection = window.RTCPeerConnection;
-                }}
-            }}
-            
-            // Mock permissions
-            if (navigator.permissions) {{
-                const originalQuery = navigator.permissions.query;
-                navigator.permissions.query = function(parameters) {{
-                    if (parameters.name === 'notifications') {{
-                        return Promise.resolve({{ state: 'denied' }});
-                    }}
-                    return originalQuery(parameters);
-                }};
-            }}
-        '''
+                # Let the browser perturb canvas pixels itself and drop the JS loop
+                if NATIVE_CANVAS_NOISE:
+                    try:
+                        execute_cdp_cmd(driver, 'Emulation.setCanvasNoiseInjectionEnabled', {
+                            'seed': random.getrandbits(32)
+                        })
+                        stealth_js = build_stealth_js(
+                            browser_type, screen, gpu, hardware, connection, timezone_offset,
+                            accept_language, battery, media_devices, fonts, plugins_js, webrtc,
+                            native_canvas_noise=True
+                        )
+                        print(f'[{browser_type}]   ✓ Native canvas noise enabled')
+                    except:
+                        print(f'[{browser_type}]   ⚠️ Native canvas noise unavailable, using JS noise')
+                
+                # Apply CDP-based stealth
+                print(f'[{browser_type}] 🎭 Applying CDP stealth overrides...')
+                
+                # These overrides are independent of each other, so they are sent
+                # concurrently: one round-trip wait instead of one per command
+                cdp_commands = [
+                    # Override user agent via CDP (more reliable than --user-agent flag)
+                    ('Network.setUserAgentOverride', {
+                        "userAgent": user_agent,
+                        "platform": "Win32",
+                        "acceptLanguage": accept_language
+                    }),
+                    # Set extra HTTP headers for authenticity
+                    ('Network.setExtraHTTPHeaders', {
+                        'headers': {
+                            'Accept-Language': accept_language,
+                            'Accept-Encoding': 'gzip, deflate, br',
+                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                            'DNT': '1',
+                            'Upgrade-Insecure-Requests': '1'
+                        }
+                    }),
+                    # Disable cache for realistic behavior
+                    ('Network.setCacheDisabled', {'cacheDisabled': True}),
+                    # Set download behavior (prevent downloads from blocking)
+                    ('Page.setDownloadBehavior', {
+                        'behavior': 'deny'
+                    }),
+                ]
+                if BLOCKED_URL_PATTERNS:
+                    # Skip heavy resources the crawl doesn't need
+                    cdp_commands.append(('Network.setBlockedURLs', {'urls': list(BLOCKED_URL_PATTERNS)}))
+                
+                # Register the stealth script once: the browser runs it before any
+                # page script on every new document, so it is never re-sent per page.
+                # Wrapped in a function so its consts don't clash with page globals.
+                # Runs in the main world (an isolated world could not patch the
+                # page's prototypes); runImmediately also covers the current document
+                stealth_command = ('Page.addScriptToEvaluateOnNewDocument', {
+                    'source': f'(function() {{{stealth_js}}})();',
+                    'runImmediately': True
+                })
+                results = execute_cdp_cmds(driver, [stealth_command] + cdp_commands, return_exceptions=True)
+                # Registered or not depends on that command alone, whatever the others do
+                stealth_registered = not isinstance(results[0], Exception)
+                errors = [result for result in results if isinstance(result, Exception)]
+                if errors:
+                    raise errors[0]
+                if BLOCKED_URL_PATTERNS:
+                    print(f'[{browser_type}]   ✓ Blocking {len(BLOCKED_URL_PATTERNS)} URL pattern(s)')
+                print(f'[{browser_type}]   ✓ User agent overridden via CDP\n'
+                      f'[{browser_type}]   UA: {user_agent[:60]}...\n'
+                      f'[{browser_type}]   ✓ Extra HTTP headers configured\n'
+                      f'[{browser_type}]   ✓ Network cache disabled\n'
+                      f'[{browser_type}]   ✓ Downloads blocked\n'
+                      f'[{browser_type}]   ✓ Stealth script registered for new documents\n'
+                      f'[{browser_type}] ✅ Full CDP stealth active!')
+                
+            except Exception as e:
+                print(f'[{browser_type}] ⚠ Page-level CDP commands failed: {e!s:.80}')
+                if stealth_registered:
+                    print(f'[{browser_type}]   ✓ Stealth script registered for new documents')
+                
+        except Exception as e:
+            print(f'[{browser_type}] ⚠ Native CDP unavailable: {e!s:.80}')
+    
+    if browser_type == 'firefox':
+        # Firefox has no CDP: inject the stealth script after each page load
+        driver._stealth_js = stealth_js
         print(f'[{browser_type}] ✓ Prepared comprehensive stealth script (will inject on page load)')
+    elif not stealth_registered:
+        # Re-sending the script per page would run it after page scripts and
+        # with Firefox-style defaults; the session goes without it instead
+        print(f'[{browser_type}] ⚠ Stealth script not registered, continuing without it')
     
     driver.set_page_load_timeout(30)
-    driver.set_window_size(screen["width"], screen["height"])
+    driver.set_window_size(screen.width, screen.height)
     
     print(f'[{browser_type}] ✓ Browser ready with advanced stealth mode')
     
     return driver
 
+def quit_driver(driver):
+    """Close a driver's CDP WebSocket (if any) and end its session, ignoring errors"""
+    try:
+        # Close CDP WebSocket if it exists
+        if getattr(driver, '_cdp_client', None):
+            try:
+                driver._cdp_client.close()
+            except:
+                pass
+        driver.quit()
+    except:
+        pass
+
+def quit_driver_in_background(driver):
+    """
+    End a driver's session without waiting for it
+    
+    Tearing a browser down through the hub takes seconds (longer for a dead
+    session). The next session doesn't depend on it, so it runs on a daemon
+    thread while the next driver is created.
+    """
+    threading.Thread(target=quit_driver, args=(driver,), daemon=True).start()
+
+def inject_stealth_script(driver):
+    """
+    Run the stealth script on the current page, if the driver needs it
+    
+    Chromium sessions register the script once through CDP and skip this
+    entirely; only Firefox re-sends it per page.
+    
+    Args:
+        driver: WebDriver instance from create_driver
+    """
+    stealth_js = getattr(driver, '_stealth_js', None)
+    if stealth_js:
+        try:
+            driver.execute_script(stealth_js)
+        except:
+            pass
+
 def is_driver_alive(driver):
     """
     Check if the WebDriver connection is still alive
     Returns True if connection is good, False if connection is lost
+    (or the session was marked dead, see idle_pause)
     """
+    if getattr(driver, '_session_dead', False):
+        return False
     try:
         # Try a simple command to check if session is alive
         _ = driver.current_url
@@ -4269,7 +5282,7 @@ def is_driver_alive(driver):
         # For other errors, assume driver might still be alive
         return True
 
-def manage_tabs(driver, browser_type, current_browsing_tab, max_tabs=8):
+def manage_tabs(driver, browser_type, current_browsing_tab, max_tabs=8, handles=None):
     """
     Manage open tabs realistically - keep some open, close others randomly
     
@@ -4278,17 +5291,16 @@ def manage_tabs(driver, browser_type, current_browsing_tab, max_tabs=8):
         browser_type: Browser name for logging
         current_browsing_tab: The tab we're currently browsing
         max_tabs: Maximum number of tabs to keep open (default 8)
+        handles: Window handles already fetched since the last action that could
+                 open a tab (skips a window_handles round trip)
     
     Returns:
         tuple: (current_browsing_tab, switched_tab)
                switched_tab is True if we switched to a different tab
     """
     try:
-        # First check if driver is alive
-        if not is_driver_alive(driver):
-            raise WebDriverException("Driver connection lost")
-        
-        all_handles = driver.window_handles
+        # A dead session fails here and is detected in the except handler
+        all_handles = handles if handles is not None else driver.window_handles
         
         # If only one tab, nothing to do
         if len(all_handles) <= 1:
@@ -4315,14 +5327,16 @@ def manage_tabs(driver, browser_type, current_browsing_tab, max_tabs=8):
             # Switch back to current browsing tab
             try:
                 driver.switch_to.window(current_browsing_tab)
+                closed = set(tabs_to_close)
+                all_handles = [h for h in all_handles if h not in closed]
             except:
                 # Current tab was somehow closed, use first available
-                if driver.window_handles:
-                    current_browsing_tab = driver.window_handles[0]
+                all_handles = driver.window_handles
+                if all_handles:
+                    current_browsing_tab = all_handles[0]
                     driver.switch_to.window(current_browsing_tab)
         
         # Randomly decide if we should switch tabs (30% chance if multiple tabs exist)
-        all_handles = driver.window_handles
         if len(all_handles) > 1 and random.random() < 0.3:
             # Switch to a random different tab
             other_handles = [h for h in all_handles if h != current_browsing_tab]
@@ -4332,14 +5346,16 @@ def manage_tabs(driver, browser_type, current_browsing_tab, max_tabs=8):
                 print(f'  [{browser_type}] 🔄 Switched to different tab ({len(all_handles)} tabs open)')
                 return new_tab, True
         
-        # Make sure we're on the current browsing tab
+        # Make sure we're on the current browsing tab (ad clicking falls back to
+        # the first window on its error paths)
         if driver.current_window_handle != current_browsing_tab:
             try:
                 driver.switch_to.window(current_browsing_tab)
             except:
                 # Tab no longer exists, use first available
-                if driver.window_handles:
-                    current_browsing_tab = driver.window_handles[0]
+                all_handles = driver.window_handles
+                if all_handles:
+                    current_browsing_tab = all_handles[0]
                     driver.switch_to.window(current_browsing_tab)
         
         return current_browsing_tab, False
@@ -4640,13 +5656,164 @@ def detect_and_bypass_bot_challenge(driver, browser_type, max_attempts=3):
         print(f'  [{browser_type}] ⚠ Error in bot challenge bypass: {str(e)[:60]}')
         return True  # Assume we're okay if error occurred
 
+# ============================================
+# SITE PREFLIGHT
+# ============================================
+
+class SiteProbe:
+    """
+    Start URLs vetted with a quick HEAD request before a browser tab is spent on them
+
+    - Probes run on a small thread pool while the browser works on other pages
+    - Only unreachable hosts (DNS/connect errors, timeouts) and 404/410 are
+      dropped: bot walls often answer scripts with 403/503 yet load in a browser
+    - When nothing vetted is ready, a random site is used as before
+    """
+    DEAD_STATUSES = frozenset({404, 410})
+
+    def __init__(self, sites, ahead, timeout=3):
+        self.sites = sites
+        self.ahead = ahead
+        self.timeout = timeout
+        self._vetted = deque()
+        self._pending = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _probe(self, url):
+        """HEAD url; queue it if the host answered with a live status"""
+        try:
+            try:
+                response = requests.head(url, timeout=self.timeout, allow_redirects=True,
+                                         headers={'User-Agent': generate_random_user_agent()})
+                if response.status_code not in self.DEAD_STATUSES:
+                    self._vetted.append(url)
+            except requests.RequestException:
+                pass
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _top_up(self, choice):
+        """Keep `ahead` URLs vetted or in flight"""
+        with self._lock:
+            wanted = self.ahead - len(self._vetted) - self._pending
+            if wanted <= 0:
+                return
+            self._pending += wanted
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.ahead, thread_name_prefix='site-probe')
+        for _ in range(wanted):
+            self._executor.submit(self._probe, choice(self.sites))
+
+    def next_site(self, choice=random.choice):
+        """
+        Next start URL
+
+        Args:
+            choice: Random choice function (e.g. the session generator's)
+
+        Returns:
+            str: A vetted URL if one is ready, otherwise a random site
+        """
+        if self.ahead <= 0:
+            return choice(self.sites)
+        self._top_up(choice)
+        try:
+            return self._vetted.popleft()
+        except IndexError:
+            return choice(self.sites)
+
+
+# Number of start URLs probed ahead of the browser (0 disables probing)
+SITE_PROBE_AHEAD = int(os.getenv('SITE_PROBE_AHEAD', '4'))
+
+# Global site probe instance
+site_probe = SiteProbe(sites, SITE_PROBE_AHEAD)
+
+# ============================================
+# LINK DISCOVERY
+# ============================================
+
+# Visible, enabled http(s) links among the first arguments[0] anchors with an
+# href (placeholder anchors don't use up the limit), as
+# [element, href]; the cheap href and attribute tests run before the style lookup
+_CLICKABLE_LINKS_JS = _IS_VISIBLE_JS + '''
+return Array.from(document.querySelectorAll('a[href]')).slice(0, arguments[0])
+    .filter(a => /^https?:\\/\\//.test(a.href) && !a.hasAttribute('disabled') && isVisible(a))
+    .map(a => [a, a.href]);
+'''
+
+def find_clickable_links(driver, limit=200):
+    """
+    Visible http(s) links and their hrefs, fetched in one round trip
+    
+    Replaces per-link is_displayed()/is_enabled()/get_attribute('href') calls,
+    each of which is a WebDriver round trip. Falls back to those calls if the
+    script fails.
+    
+    Args:
+        driver: WebDriver instance
+        limit: Number of anchors with an href (in document order) to consider
+    
+    Returns:
+        List of (element, href) tuples
+    """
+    try:
+        return [(element, href) for element, href in driver.execute_script(_CLICKABLE_LINKS_JS, limit)]
+    except:
+        clickable = []
+        for link in driver.find_elements(By.CSS_SELECTOR, 'a[href]')[:limit]:
+            try:
+                if link.is_displayed() and link.is_enabled():
+                    href = link.get_attribute('href')
+                    if href and (href.startswith('http://') or href.startswith('https://')):
+                        clickable.append((link, href))
+            except:
+                continue
+        return clickable
+
+# The first anchor whose resolved href is arguments[0], or null
+_FIND_LINK_BY_HREF_JS = '''
+return Array.from(document.getElementsByTagName('a')).find(a => a.href === arguments[0]) || null;
+'''
+
+def find_link_by_href(driver, href):
+    """
+    Re-resolve a link from find_clickable_links after the page re-rendered it
+    
+    Args:
+        driver: WebDriver instance
+        href: The link's resolved href, as returned by find_clickable_links
+    
+    Returns:
+        The element, or None if no anchor has that href any more
+    """
+    return driver.execute_script(_FIND_LINK_BY_HREF_JS, href)
+
+# WebDriver error messages meaning the session is gone and must be recreated
+_DEAD_SESSION_RE = re.compile(
+    'cannot find session|invalid session id|tried to run command without establishing|'
+    'unable to connect to renderer|driver connection lost|session deleted|no such session',
+    re.IGNORECASE
+)
+
+# Odds of (fidget, long pause, scroll back) for each scroll step on a page
+_SCROLL_STEP_ODDS = np.array([0.5, 0.3, 0.2])
+
 def browse():
     """Main browsing function - creates chaos by clicking through random links"""
     # Initialize global fatigue model for this session
     global fatigue_model
     fatigue_model = SessionFatigueModel()
     
-    browser_type = random.choice(browsers)
+    # Session-local generator for this loop's decisions, seeded from the OS so
+    # it's independent of the module generator the pool refill threads draw from
+    rng = random.Random(os.urandom(16))
+    # Derived from it, so a session's scroll plans follow from the same seed
+    nprng = np.random.default_rng(rng.getrandbits(64))
+    
+    browser_type = rng.choices(browsers, cum_weights=_BROWSER_CUM_WEIGHTS)[0]
     print(f'\n{"="*60}')
     print(f'Starting {browser_type} browser')
     print(f'{"="*60}')
@@ -4656,25 +5823,26 @@ def browse():
     
     # Store the current browsing tab (starts as main window)
     current_browsing_tab = driver.current_window_handle
-    max_tabs = random.randint(5, 10)  # Random max tabs between 5-10
+    max_tabs = rng.randint(5, 10)  # Random max tabs between 5-10
     
     # Keep track of websites visited in this session
     websites_visited = 0
-    max_websites_per_session = random.randint(80, 120)  # 80-120 sites per session
+    max_websites_per_session = rng.randint(80, 120)  # 80-120 sites per session
     
     print(f'[{browser_type}] 🎯 Session goal: Visit {max_websites_per_session} websites')
     print(f'[{browser_type}] 📍 Initial tab: {current_browsing_tab[:8]}... (max {max_tabs} tabs)')
     
     while websites_visited < max_websites_per_session:
         try:
-            # Periodic health check every 10 websites
-            if websites_visited > 0 and websites_visited % 3 == 0:
+            # Periodic health check every 10 websites, and right away once the
+            # session has been marked dead
+            if getattr(driver, '_session_dead', False) or (websites_visited > 0 and websites_visited % 3 == 0):
                 if not is_driver_alive(driver):
                     print(f'[{browser_type}] ⚠ Driver health check failed at website {websites_visited}')
                     raise WebDriverException("Driver health check failed")
             
-            start_url = random.choice(sites)
-            start_domain = get_domain(start_url)
+            start_url = site_probe.next_site(rng.choice)
+            start_registered = get_registered_domain(get_domain(start_url))
             websites_visited += 1
             
             # Manage tabs before navigating
@@ -4689,12 +5857,8 @@ def browse():
                 print(f'\n[{browser_type}] 🌐 Website {websites_visited}/{max_websites_per_session}: {start_url}')
                 driver.get(start_url)
             
-            # Inject stealth script for Firefox
-            if hasattr(driver, '_stealth_js'):
-                try:
-                    driver.execute_script(driver._stealth_js)
-                except:
-                    pass
+            # Inject stealth script for Firefox (Chromium has it registered via CDP)
+            inject_stealth_script(driver)
             
             # Detect and bypass bot challenges (Cloudflare, etc.)
             challenge_passed = detect_and_bypass_bot_challenge(driver, browser_type, max_attempts=3)
@@ -4703,7 +5867,7 @@ def browse():
                 continue  # Skip to next website
             
             # Random human-like delay with fidgeting
-            reading_behavior(driver, duration=random.uniform(2, 4))
+            reading_behavior(driver, duration=rng.uniform(2, 4))
             
             # Auto-accept cookies
             auto_accept_cookies(driver, browser_type)
@@ -4735,11 +5899,7 @@ def browse():
                 current_browsing_tab, switched_to_ad = handle_new_tab_from_ad(driver, browser_type, current_browsing_tab)
                 if switched_to_ad:
                     # We're now browsing the ad tab, inject stealth and continue
-                    if hasattr(driver, '_stealth_js'):
-                        try:
-                            driver.execute_script(driver._stealth_js)
-                        except:
-                            pass
+                    inject_stealth_script(driver)
                     
                     # Check for bot challenges on the new ad tab
                     challenge_passed = detect_and_bypass_bot_challenge(driver, browser_type, max_attempts=3)
@@ -4759,26 +5919,31 @@ def browse():
                     time.sleep(realistic_delay(1.5, variance=0.3))
             
             # Simulate human reading/scrolling behavior on first page with realistic mouse movement
-            for _ in range(random.randint(1, 2)):
-                scroll_amount = random.randint(200, 500)
-                smooth_scroll(driver, scroll_amount, duration=random.uniform(0.4, 0.9))
+            for _ in range(rng.randint(1, 2)):
+                scroll_amount = rng.randint(200, 500)
+                smooth_scroll(driver, scroll_amount, duration=rng.uniform(0.4, 0.9))
                 
                 # Fidget mouse while "reading"
-                if random.random() < 0.6:  # 60% chance to fidget
-                    fidget_mouse(driver, duration=random.uniform(0.5, 1.5))
+                if rng.random() < 0.6:  # 60% chance to fidget
+                    fidget_mouse(driver, duration=rng.uniform(0.5, 1.5))
                 
                 time.sleep(realistic_delay(1.4, variance=0.4))
             
             time.sleep(realistic_delay(2.0, variance=0.4))
             
             # Navigate through links on this website
-            max_depth = random.randint(3, 8)  # Reduced depth per site to visit more sites
+            max_depth = rng.randint(3, 8)  # Reduced depth per site to visit more sites
             current_depth = 0
             
+            # Window handles known to be current (None when a click may have opened a tab)
+            tab_handles = None
+            
             while current_depth < max_depth:
                 try:
                     # Manage tabs at each iteration (might switch tabs randomly)
-                    current_browsing_tab, tab_switched = manage_tabs(driver, browser_type, current_browsing_tab, max_tabs)
+                    current_browsing_tab, tab_switched = manage_tabs(driver, browser_type, current_browsing_tab, max_tabs,
+                                                                     handles=tab_handles)
+                    tab_handles = None
                     
                     if tab_switched:
                         # We switched to a different tab, continue browsing it
@@ -4788,96 +5953,78 @@ def browse():
                     current_domain = get_domain(current_url)
                     
                     # Scroll the page with more human-like behavior using smooth scrolling
-                    scroll_count = random.randint(1, 3)
-                    for i in range(scroll_count):
+                    # The yes/no decisions for every scroll step, drawn in one go
+                    scroll_plan = nprng.random((rng.randint(1, 3), 3)) < _SCROLL_STEP_ODDS
+                    for fidget, long_pause, scroll_back in scroll_plan.tolist():
                         # Variable scroll amounts
-                        scroll_position = random.randint(100, 1000)
-                        smooth_scroll(driver, scroll_position, duration=random.uniform(0.3, 0.8))
+                        scroll_position = rng.randint(100, 1000)
+                        smooth_scroll(driver, scroll_position, duration=rng.uniform(0.3, 0.8))
                         
                         # Fidget mouse while scrolling (50% chance)
-                        if random.random() < 0.5:
-                            fidget_mouse(driver, duration=random.uniform(0.5, 1.2), movements=random.randint(2, 4))
+                        if fidget:
+                            fidget_mouse(driver, duration=rng.uniform(0.5, 1.2), movements=rng.randint(2, 4))
                         
                         # Human-like pauses (sometimes longer, sometimes shorter)
-                        if random.random() < 0.3:  # 30% chance of longer pause
-                            time.sleep(realistic_delay(3.0, variance=0.4))
+                        if long_pause:  # 30% chance of longer pause (page scripts suspended)
+                            idle_pause(driver, browser_type, realistic_delay(3.0, variance=0.4))
                         else:
                             time.sleep(realistic_delay(1.0, variance=0.4))
                         
                         # Occasionally scroll back up a bit
-                        if random.random() < 0.2:  # 20% chance
-                            smooth_scroll(driver, -random.randint(50, 200), duration=random.uniform(0.2, 0.5))
+                        if scroll_back:  # 20% chance
+                            smooth_scroll(driver, -rng.randint(50, 200), duration=rng.uniform(0.2, 0.5))
                             time.sleep(realistic_delay(0.5, variance=0.3))
                     
-                    # Find clickable links - be more lenient
-                    links = driver.find_elements(By.TAG_NAME, 'a')
-                    if not links:
-                        print(f'  [{browser_type}] No links found at depth {current_depth}, moving to next website')
-                        break
-                    
-                    # Get more links and filter less strictly
-                    clickable = []
-                    for link in links[:200]:  # Check more links
-                        try:
-                            if link.is_displayed() and link.is_enabled():
-                                href = link.get_attribute('href')
-                                if href and (href.startswith('http://') or href.startswith('https://')):
-                                    clickable.append(link)
-                        except:
-                            continue
-                    
+                    # Find clickable links (one round trip for all hrefs), each href parsed once
+                    clickable = [(link, href, get_domain(href)) for link, href in find_clickable_links(driver)]
                     if not clickable:
                         print(f'  [{browser_type}] No clickable links at depth {current_depth}, moving to next website')
                         break
                     
                     print(f'  [{browser_type}] Found {len(clickable)} clickable links')
                     
-                    # Separate internal and external links
+                    # Separate internal and external links (pure Python, no WebDriver calls)
                     internal_links = []
                     external_links = []
                     
-                    for link in clickable:
-                        try:
-                            href = link.get_attribute('href')
-                            if href:
-                                link_domain = get_domain(href)
-                                # More lenient domain matching (including subdomains)
-                                if link_domain == start_domain or start_domain in link_domain or link_domain in start_domain:
-                                    internal_links.append(link)
-                                else:
-                                    external_links.append(link)
-                        except:
-                            continue
+                    for candidate in clickable:
+                        # Same registered domain (including subdomains) counts as internal
+                        if get_registered_domain(candidate[2]) == start_registered:
+                            internal_links.append(candidate)
+                        else:
+                            external_links.append(candidate)
                     
                     print(f'  [{browser_type}] Internal: {len(internal_links)}, External: {len(external_links)}')
                     
                     # Choose link strategy - prefer internal to stay on site longer
-                    chosen_link = None
-                    if internal_links and random.random() < 0.8:  # 80% prefer internal
-                        chosen_link = random.choice(internal_links)
+                    chosen = None
+                    if internal_links and rng.random() < 0.8:  # 80% prefer internal
+                        chosen = rng.choice(internal_links)
                         print(f'  [{browser_type}] Depth {current_depth}: Choosing internal link')
                     elif external_links:
-                        chosen_link = random.choice(external_links)
+                        chosen = rng.choice(external_links)
                         print(f'  [{browser_type}] Depth {current_depth}: Choosing external link (will move to next website)')
                         # If we go external, break after this click to count as new website
                     elif internal_links:
-                        chosen_link = random.choice(internal_links)
+                        chosen = rng.choice(internal_links)
                     elif clickable:
-                        chosen_link = random.choice(clickable)
+                        chosen = rng.choice(clickable)
                     
-                    if chosen_link:
+                    if chosen:
+                        chosen_link, href, link_domain = chosen
                         try:
-                            href = chosen_link.get_attribute('href')
-                            link_domain = get_domain(href)
                             print(f'  [{browser_type}] Depth {current_depth}: {href[:80]}')
                             
+                            # Tab count before clicking, to spot links that open a new tab
+                            tabs_before_click = len(driver.window_handles)
+                            
                             # Try human-like hover and click (80% chance)
                             click_success = False
                             
-                            if random.random() < 0.8:
+                            if rng.random() < 0.8:
                                 # Use hover_before_click for realistic behavior
                                 try:
-                                    click_success = hover_before_click(driver, chosen_link, hover_time=random.uniform(0.3, 0.9))
+                                    click_success = hover_before_click(driver, chosen_link, hover_time=rng.uniform(0.3, 0.9))
                                     if click_success:
                                         print(f'  [{browser_type}] ✓ Used hover-and-click')
                                 except Exception as e:
@@ -4892,6 +6039,21 @@ def browse():
                                 try:
                                     chosen_link.click()
                                     click_success = True
+                                except StaleElementReferenceException:
+                                    # The page re-rendered the link after the batch was
+                                    # taken: resolve it again by href, once
+                                    try:
+                                        chosen_link = find_link_by_href(driver, href)
+                                        chosen_link.click()
+                                        click_success = True
+                                    except:
+                                        # Navigate directly
+                                        try:
+                                            driver.get(href)
+                                            click_success = True
+                                            print(f'  [{browser_type}] ✓ Navigated directly to URL')
+                                        except:
+                                            pass
                                 except Exception as e:
                                     if 'intercepted' in str(e).lower():
                                         print(f'  [{browser_type}] Click intercepted, trying alternative methods...')
@@ -4923,7 +6085,13 @@ def browse():
                                             driver.execute_script("arguments[0].click();", chosen_link)
                                             click_success = True
                                         except:
-                                            pass
+                                            # Navigate directly (href came with the link batch)
+                                            try:
+                                                driver.get(href)
+                                                click_success = True
+                                                print(f'  [{browser_type}] ✓ Navigated directly to URL')
+                                            except:
+                                                pass
                             
                             if not click_success:
                                 print(f'  [{browser_type}] ⚠ Could not click link, skipping')
@@ -4933,7 +6101,7 @@ def browse():
                             time.sleep(realistic_delay(3.5, variance=0.4))
                             
                             # Check if link opened new tabs
-                            if len(driver.window_handles) > len(driver.window_handles):
+                            if len(driver.window_handles) > tabs_before_click:
                                 current_browsing_tab, switched_to_new = handle_new_tab_from_ad(driver, browser_type, current_browsing_tab)
                             
                             # Try to accept cookies on new page (but don't wait too long)
@@ -4949,24 +6117,30 @@ def browse():
                                 pass
                             
                             # Occasionally try to click ads (60% chance)
-                            if random.random() < 0.4:  # 40% of the time, try to click ads
+                            if rng.random() < 0.4:  # 40% of the time, try to click ads
                                 try:
                                     initial_tabs = len(driver.window_handles)
-                                    detect_and_click_ads(driver, browser_type, click_chance=0.6)
+                                    ad_clicked = detect_and_click_ads(driver, browser_type, click_chance=0.6)
                                     
                                     # Handle new tabs from ads
-                                    if len(driver.window_handles) > initial_tabs:
+                                    handles = driver.window_handles
+                                    if len(handles) > initial_tabs:
                                         current_browsing_tab, _ = handle_new_tab_from_ad(driver, browser_type, current_browsing_tab)
+                                    # Without a click nothing can open a tab later, so the next
+                                    # manage_tabs can reuse the list (switching doesn't change it);
+                                    # after a click an ad tab may still be opening
+                                    if not ad_clicked:
+                                        tab_handles = handles
                                 except:
                                     pass
                             
                             current_depth += 1
                             
                             # If we went to external site, break to count as new website
-                            if link_domain != start_domain:
+                            if get_registered_domain(link_domain) != start_registered:
                                 print(f'  [{browser_type}] 🔄 Moved to external site, counting as next website')
                                 websites_visited += 1
-                                start_domain = link_domain
+                                start_registered = get_registered_domain(link_domain)
                                 break
                                 
                         except Exception as click_error:
@@ -5001,36 +6175,16 @@ def browse():
             driver_is_dead = not is_driver_alive(driver)
             
             # Check if session is lost - needs recreation
-            if driver_is_dead or any(phrase in error_msg.lower() for phrase in [
-                'cannot find session',
-                'invalid session id',
-                'tried to run command without establishing',
-                'unable to connect to renderer',
-                'driver connection lost',
-                'session deleted',
-                'no such session'
-            ]):
+            if driver_is_dead or _DEAD_SESSION_RE.search(error_msg):
                 print(f'[{browser_type}] 💀 Session is dead! Creating new session...')
-                try:
-                    # Close CDP WebSocket if it exists
-                    if hasattr(driver, '_cdp_client') and driver._cdp_client:
-                        try:
-                            driver._cdp_client.close()
-                        except:
-                            pass
-                    try:
-                        driver.quit()
-                    except:
-                        pass
-                except:
-                    pass
+                quit_driver_in_background(driver)
                 
                 # Create new driver and reset state
                 try:
                     print(f'[{browser_type}] 🔄 Creating fresh driver session...')
                     driver = create_driver(browser_type)
                     current_browsing_tab = driver.current_window_handle
-                    max_tabs = random.randint(5, 10)
+                    max_tabs = rng.randint(5, 10)
                     print(f'[{browser_type}] ✅ New session created successfully')
                     print(f'[{browser_type}] 📍 New tab: {current_browsing_tab[:8]}... (max {max_tabs} tabs)')
                     websites_visited += 1  # Count this as a visited website
@@ -5050,13 +6204,9 @@ def browse():
     # Session complete, close browser
     print(f'\n[{browser_type}] ✅ Session complete! Visited {websites_visited} websites.')
     print(f'[{browser_type}] Closing browser and starting new session...')
-    try:
-        # Close CDP WebSocket if it exists
-        if hasattr(driver, '_cdp_client') and driver._cdp_client:
-            driver._cdp_client.close()
-        driver.quit()
-    except:
-        pass
+    # A new browser per session keeps fingerprints rotating; the old one is torn
+    # down while the next session starts
+    quit_driver_in_background(driver)
 
 if __name__ == '__main__':
     print("""
@@ -5067,6 +6217,10 @@ if __name__ == '__main__':
     """)
     
     print(f"Available browsers: {', '.join(browsers)}")
+    
+    # Warm up fingerprint pools while we wait
+    fingerprint_pool.prime(browsers)
+    
     print("\nStarting in 5 seconds...")
     time.sleep(5)
     